@@ -1,113 +1,62 @@
 """Programa que simula una cola de cajero de manera gráfica usando Pygame."""
 
-import sys, pygame, random, pandas
-import logic, view, params
+import sys, pygame, random
+import view, params, instrument, ingest
 
 if __name__ == '__main__':
-    pygame.init()
-
     # Declaración de variables de ejecución
-    screen = pygame.display.set_mode((params.SCREEN_WIDTH, params.SCREEN_HEIGHT))
-    pygame.display.set_caption('Proceso de colas')
+    screen = view.open_window('Proceso de colas')
     clock = pygame.time.Clock()
-    time = 0
 
-    # Declaración de los eventos para atención y si la ejecución es automática.
+    # Perfilador de las fases de cada cuadro.
+    profiler = instrument.Profiler(params.PROFILE)
+
+    # Declaración de los eventos para atención. El modo automático lo guarda la sesión.
     MANUAL_RESPOND = pygame.USEREVENT + 1
     AUTOMATIC_RESPOND = pygame.USEREVENT + 2
     pygame.time.set_timer(AUTOMATIC_RESPOND, params.AUTOMATIC_RESPOND_TIME, -1)
-    automatic = False
 
-    # Instanciación de la tabla y su representación gráfica.
-    table_data = pandas.DataFrame(columns=('Proceso', 'Estado', 'T. Llegada', 'Prioridad', 'Ráfaga', 'T. Comienzo', 'T. Final', 'T. Retorno', 'T. Espera'))
-    table = view.Table(table_data, 10, 10, 100, 20, 1, 7, 2, 'Comic Sans MS', 15)
+    # Instanciación de la sesión: cola, tabla, bloqueos y estadísticas, con su diario de entradas.
+    # Pandas, que session importa, se carga hasta ahora porque su carga domina el arranque y la ventana ya está abierta.
+    import session
+    seed = params.SEED if params.SEED is not None else random.randrange(1 << 32)
+    journal = session.new_journal(params.JOURNAL_DIRECTORY, seed, params.JOURNAL_KEEP) if params.JOURNAL_KEEP > 0 else None
 
     # Instanciación del diagrama de Grant.
     grant = view.Grant(400, 370, 480, 270, 'Comic Sans MS', 15)
 
-    # Instanciación de la cola.
-    if params.ENABLE_PRIORITY:
-        queue = logic.Priority_Server_Queue(params.SERVER_CAPACITY)
-    else:
-        queue = logic.SRTF_Server_Queue(params.SERVER_CAPACITY)
-
-    def create_new_client(id: str, n_requests: int, n_priority: int) -> None:
-        """Crea un nuevo cliente para uso del programa."""
-
-        if not params.ENABLE_PRIORITY:
-            n_priority = None
-
-        queue_client = logic.Queue_Client(id,n_requests, time, n_priority)
-        queue.enqueue(queue_client)
-        grant.add_tag(str(queue_client.get_id()))
-        new_table_line(queue_client)
-
-    def new_table_line(queue_client: logic.Queue_Client, arrival_time: int = None) -> None:
-        """Crea una nueva línea en la tabla con la información del cliente y el tiempo de llegada indicado."""
-        table_data.loc[len(table_data)] = (
-            str(queue_client.get_id()),                         # Id
-            'Esperando',                                        # Estado
-            time + 1 if arrival_time is None else arrival_time, # Tiempo de llegada
-            queue_client.get_priority(),                        # Prioridad
-            queue_client.get_number_of_requests(),              # Número de solicitudes.
-            None,
-            None,
-            None,
-            None
-        )
-
-    def expel_table_line(queue_client: logic.Queue_Client) -> pandas.Series:
-        """Devuelve una fila con la infomarción calculada tras la expulsión de un proceso."""
-
-        # Obtener todas las filas del proceso.
-        client_rows = table_data[table_data['Proceso'] == queue_client.get_id()].iloc
-
-        # Agregar el tiempo final en la última.
-        client_rows[-1, table_data.columns.get_loc('T. Final')] = time + 1
-
-        # Agregar el tiempo de retorno en la última.
-        client_rows[-1, table_data.columns.get_loc('T. Retorno')] =\
-            client_rows[-1]['T. Final'] - client_rows[-1]['T. Llegada']
-
-        # Para calcular el tiempo de espera se inicia con el tiempo de retorno actual.
-        client_rows[-1, table_data.columns.get_loc('T. Espera')] = client_rows[-1]['T. Retorno']
-        # Se le resta la ráfaga ejecutada de cada fila del proceso.
-        for client_row in client_rows:
-            # Sólo se restan los que tienen el mismo tiempo de llegada.
-            if client_row['T. Llegada'] != client_rows[-1]['T. Llegada']:
-                continue
-            
-            client_rows[-1, table_data.columns.get_loc('T. Espera')] -=\
-                client_row['T. Final'] - client_row['T. Comienzo']
-
-        # Cambiar estado a expulsado.
-        client_rows[-1, table_data.columns.get_loc('Estado')] = 'Expulsado'
+    state = session.Session(seed, journal, grant, profiler)
+    queue = state.queue
+    # Con plazos la tabla tiene dos columnas más, que caben en el mismo ancho con celdas más angostas.
+    table = view.Table(state.table_data, 10, 10, 82 if params.ENABLE_DEADLINES else 100, 20, 1, 7, 2, 'Comic Sans MS', 15, state.table_index, 17)
 
-        return client_rows[-1]
-
-    # Clientes iniciales.
-    for i in range(5):
-        id = chr(ord('A') + i)
-        create_new_client(id,random.randint(1,15),random.randint(1,5))
-
-    # Cliente bloqueado actualmente.
-    blocked_client: logic.Queue_Client = None
+    # Gráfica de la longitud de la cola, uso del cajero y clientes terminados debajo del diagrama.
+    chart = view.Series_Chart(10, 655, 880, 105, state.series, [
+        ('queue_length', 'Cola', '{:.1f}', None),
+        ('utilization', 'Uso', '{:.0%}', 1),
+        ('throughput', 'Salidas por tick', '{:.2f}', None)
+    ], 'Comic Sans MS', 12)
 
     # Instanciación de etiquetas
-    time_tag = view.Tag(20, 370, f'Tiempo: {time + 1}', 'Comic Sans MS', 15, 'Black')
+    time_tag = view.Tag(20, 370, f'Tiempo: {state.time + 1}', 'Comic Sans MS', 15, 'Black')
     critical_section_tag = view.Tag(20, 610, f'En sección crítica: -', 'Comic Sans MS', 15, 'Black')
-    waiting_tag = view.Tag(200, 610, f'Procesos en espera: {queue.get_size() - 1}', 'Comic Sans MS', 15, 'Black')
+    waiting_tag = view.Tag(200, 610, f'En espera: {queue.get_size() - 1} · Bloqueados: 0', 'Comic Sans MS', 15, 'Black')
+    stats_tag = view.Tag(20, 632, str(state.collector), 'Comic Sans MS', 11, 'Black')
     tag_list = [
         view.Tag(80, 450, 'Id:', 'Comic Sans MS', 15, 'Black'),
         view.Tag(20, 490, 'Solicitudes:', 'Comic Sans MS', 15, 'Black'),
         time_tag,
         critical_section_tag,
-        waiting_tag
+        waiting_tag,
+        stats_tag
     ]
 
     if params.ENABLE_PRIORITY:
         tag_list.append(view.Tag(30, 530, 'Prioridad:', 'Comic Sans MS', 15, 'Black'))
 
+    # Desglose del tiempo de cada cuadro.
+    profile_overlay = view.Profile_Overlay(700, 380, profiler, 'Arial', 11)
+
     # Instanciación de cajas de texto
     textbox_list = []
 
@@ -131,9 +80,12 @@ if __name__ == '__main__':
     manual_button = view.Button(120, 410, 200, 30, 2, 'Siguiente Paso', 'Comic Sans MS', 15)
     button_list.append(manual_button)
 
-    addclient_button = view.Button(230, 450, 90, 110, 2, 'Añadir', 'Comic Sans MS', 15)
+    addclient_button = view.Button(230, 450, 90, 70, 2, 'Añadir', 'Comic Sans MS', 15)
     button_list.append(addclient_button)
 
+    bulk_button = view.Button(230, 530, 90, 30, 2, 'Lote', 'Comic Sans MS', 15)
+    button_list.append(bulk_button)
+
     block_button = view.Button(120, 570, 200, 30, 2, 'Bloquear', 'Comic Sans MS', 15)
     button_list.append(block_button)
 
@@ -142,13 +94,11 @@ if __name__ == '__main__':
     def automatic_button_action() -> None:
         """Activa o desactiva el modo automático."""
 
-        global automatic
-        if not automatic:
-            automatic = True
+        state.set_automatic(not state.automatic)
+        if state.automatic:
             automatic_button.tag = 'Apagar Automático'
             automatic_button.box_color_idle = 'Green'
         else:
-            automatic = False
             automatic_button.tag = 'Encender Automático'
             automatic_button.box_color_idle = 'Red'
 
@@ -161,85 +111,48 @@ if __name__ == '__main__':
 
     manual_button.action = manual_button_action
 
-    def addclient_button_action() -> None:
-        """Añade un nuevo cliente a la cola y sale del estado HALT."""
+    # Caja de texto de cada campo que la sesión puede rechazar.
+    field_textboxes = {'id': id_textbox, 'requests': requests_textbox, 'priority': priority_textbox}
 
-        global id_textbox, requests_textbox
+    def submit_clients(add) -> None:
+        """Pasa los textos de las cajas a la acción de la sesión indicada y marca el campo inválido o, si se añadió, las vacía."""
 
-        if    id_textbox.text in [str(queue_client.get_id()) for queue_client in list(queue)[1:]]\
-           or (blocked_client and id_textbox.text == blocked_client.get_id())\
-           or id_textbox.text == '':
-            id_textbox.text = '¡ERROR!'
-            return
-
-        try:
-            requests = requests_textbox.text
-            if requests == '':
-                requests = random.randint(1, 15)
-            else:
-                requests = int(requests)
-                if requests <= 0:
-                    requests_textbox.text = '¡ERROR!'
-                    return
-        except ValueError:
-            requests_textbox.text = '¡ERROR!'
-            return
-        try:
-            priority = priority_textbox.text
-            if priority == '':
-                priority = random.randint(1, 5)
-            else:
-                priority = int(priority)
-                if priority <= 0 or priority > 5:
-                    priority_textbox.text = '¡ERROR!'
-                    return
-        except ValueError:
-            priority_textbox.text = '¡ERROR!'
+        error = add(id_textbox.text, requests_textbox.text, priority_textbox.text)
+        if error is not None:
+            field_textboxes[error].text = '¡ERROR!'
             return
 
-        past_service = queue.get_current_service()
-        try: front_client = queue.get(1)
-        except IndexError: front_client = None
-        create_new_client(id_textbox.text, int(requests), int(priority))
-        if queue.get_current_service() != past_service and front_client is not None:
-            client_row = expel_table_line(front_client)
-            table_data.loc[client_row.name] = client_row
-            new_table_line(queue_client, client_row['T. Llegada'])
-            table_data.iloc[-1, table_data.columns.get_loc('Estado')] = 'Esperando'
-
         id_textbox.text = ''
         requests_textbox.text = ''
         priority_textbox.text = ''
 
+    def addclient_button_action() -> None:
+        """Añade un nuevo cliente a la cola y sale del estado HALT."""
+
+        submit_clients(state.add_client)
+
     addclient_button.action = addclient_button_action
 
-    def block_button_action() -> None:
-        """Bloquea o desbloquea un cliente dado."""
-        
-        global blocked_client
-        if blocked_client:
-            new_state = 'Esperando'
-            block_button.tag = 'Bloquear'
-            queue_client = blocked_client
-            blocked_client = None
-            index = table_data[table_data['Proceso'] == queue_client.get_id()].iloc[-1].name
-            queue.enqueue(queue_client)
+    def bulk_button_action() -> None:
+        """Añade un lote de clientes con ids numéricos nuevos. La caja de id indica cuántos, la de solicitudes
+        una distribución de simulation.BURST_DISTRIBUTIONS o un número fijo, por defecto 'uniform',
+        y la de prioridad una prioridad fija, por defecto aleatoria."""
 
-        else:
-            new_state = 'Bloqueado'
-            block_button.tag = 'Desbloquear Bloqueado'
-            queue_client = queue.get(1)
-            blocked_client = queue_client
-            index = table_data[table_data['Proceso'] == queue_client.get_id()].iloc[-1].name
-            if queue.get_current_service() > 0:
-                client_row = expel_table_line(queue_client)
-                table_data.loc[client_row.name] = client_row
-                new_table_line(queue_client, client_row['T. Llegada'])
-                index = table_data.iloc[-1].name
+        submit_clients(state.add_bulk)
 
-            queue.remove(queue_client)
+    bulk_button.action = bulk_button_action
 
-        table_data.loc[index, 'Estado'] = new_state
+    # Servidor de llegadas externas.
+    if params.INGEST_ENABLED:
+        ingest_server = ingest.Ingest_Server(params.INGEST_ADDRESS, params.INGEST_CAPACITY)
+        ingest_server.start()
+
+    def block_button_action() -> None:
+        """Desbloquea al cliente bloqueado cuyo id está en la caja de texto.
+        Si no, bloquea al cliente con ese id o, si no hay, al que está en atención, por un tiempo aleatorio."""
+
+        state.toggle_block(id_textbox.text)
+        id_textbox.text = ''
 
     block_button.action = block_button_action
 
@@ -248,100 +161,93 @@ if __name__ == '__main__':
         for event in pygame.event.get():
             # Oprimir el botón de cerrar ventana.
             if event.type == pygame.QUIT:
+                if params.PROFILE:
+                    profiler.dump(params.PROFILE_OUTPUT)
+                state.close()
                 pygame.quit()
                 sys.exit()
 
             # Atención a la cola.
-            if event.type == MANUAL_RESPOND or event.type == AUTOMATIC_RESPOND and automatic:
-                time += 1
-                # Sólo si hay clientes en fila.
-                if queue.get_size() > 1:
-                    queue_client = queue.get(1)
-                    grant.add_line(
-                        current_tag=str(queue_client.get_id()),
-                        blocked_tag=str(blocked_client.get_id()) if blocked_client else None
-                    )
-                    queue.dequeue()
-
-                    # Dando tiempo de llegada a proceso actual.
-                    client_row = table_data[table_data['Proceso'] == str(queue_client.get_id())].iloc[-1]
-                    client_row['Estado'] = 'En Ejecución'
-                    if client_row['T. Comienzo'] is None:
-                        client_row['T. Comienzo'] = time
-
-                    # Actulizar la nueva fila en la tabla.
-                    table_data.loc[client_row.name] = client_row
-
-                    # Cuando se terminó de atender a un cliente.
-                    if queue.get_current_service() == 0 and queue.get_size() == 1 or queue.get(1) is not queue_client:
-                        client_row = expel_table_line(queue_client)
-                        if queue_client.is_done():
-                            grant.remove_tag(str(queue_client.get_id()))
-                            client_row['Estado'] = 'Terminado'
-                        else:
-                            new_table_line(queue_client, client_row['T. Llegada'])
-                                    
-                        # Actulizar la nueva fila en la tabla.
-                        table_data.loc[client_row.name] = client_row
-
-                # Cuando no hay clientes en fila.
-                else:
-                    grant.add_line(
-                        blocked_tag=str(blocked_client.get_id()) if blocked_client else None
-                    )
-
-            # Hacer click en una caja de texto.
+            if event.type == MANUAL_RESPOND or event.type == AUTOMATIC_RESPOND and state.automatic:
+                state.tick()
+
+            # Hacer click en una caja de texto o en el encabezado de la tabla.
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == pygame.BUTTON_LEFT:
                     for textbox in textbox_list:
                         textbox.check_active()
 
+                table.click(event.pos, event.button)
+
             # Escribir en las cajas de texto.
             if event.type == pygame.KEYDOWN:
                 for textbox in textbox_list:
                     textbox.add_text(event.unicode)
 
+        # Clientes recibidos por el socket, limitados por cuadro para no detener el dibujo.
+        if params.INGEST_ENABLED:
+            with profiler.phase('ingest'):
+                state.ingest(ingest_server.buffer.pop_due(state.time, params.INGEST_MAX_PER_FRAME))
+
         # Llenar la pantalla de blanco.
         screen.fill('White')
 
         # Actualizando elementos.
-        if automatic:
+        if state.automatic:
             manual_button.active = False
         else:
             manual_button.active = True
 
-        if blocked_client or queue.get_size() > 1:
+        if id_textbox.text in state.blocked:
+            block_button.tag = 'Desbloquear'
             block_button.active = True
         else:
-            block_button.active = False
+            block_button.tag = 'Bloquear'
+            block_button.active = queue.get_size() > 1
             
         for button in button_list:
             button.update()
 
         # Simulación Semáforo
-        time_tag.tag = f'Tiempo: {time}'
+        time_tag.tag = f'Tiempo: {state.time}'
         if queue.get_current_service() > 0 and queue.get_size() > 1:
             queue_client = queue.get(1)
             critical_section_tag.tag = f'En sección crítica: {queue_client.get_id()}'
-            waiting_tag.tag = f'Procesos en espera: {queue.get_size() - 2}'
+            waiting_tag.tag = f'En espera: {queue.get_size() - 2} · Bloqueados: {len(state.blocked)}'
 
         else:
             critical_section_tag.tag = f'En seccion crítica: -'
-            waiting_tag.tag = f'Procesos en espera: {queue.get_size() - 1}'
+            waiting_tag.tag = f'En espera: {queue.get_size() - 1} · Bloqueados: {len(state.blocked)}'
+
+        stats_tag.tag = str(state.collector)
 
         # Dibujando elementos.
-        for tag in tag_list:
-            tag.draw(screen)
+        with profiler.phase('draw.widgets'):
+            for tag in tag_list:
+                tag.draw(screen)
 
-        for textbox in textbox_list:
-            textbox.draw(screen)
+            for textbox in textbox_list:
+                textbox.draw(screen)
 
-        for button in button_list:
-            button.draw(screen)
+            for button in button_list:
+                button.draw(screen)
+
+        with profiler.phase('draw.table'):
+            # La sesión reemplaza table_data al agregar lotes de filas.
+            table.df = state.table_data
+            table.draw(screen)
+
+        with profiler.phase('draw.grant'):
+            grant.draw(screen)
+
+        with profiler.phase('draw.chart'):
+            chart.draw(screen)
 
-        table.draw(screen)
-        grant.draw(screen)
+        if params.PROFILE_OVERLAY:
+            profile_overlay.draw(screen)
 
         # Actualizar pantalla y esperar.
-        pygame.display.update()
+        with profiler.phase('display'):
+            screen.present()
+        profiler.frame()
         clock.tick()
@@ -0,0 +1,197 @@
+"""Modelos analíticos de colas para estimar tiempos sin simular: M/M/1, M/M/c, M/G/1 y M/G/1 con prioridades."""
+
+import argparse, functools, heapq, math, time
+import offline, simulation
+
+# Prioridades que asigna simulation.generate_clients, todas con la misma probabilidad. 1 se atiende primero.
+PRIORITY_LEVELS = 5
+
+# Probabilidad despreciable con la que se corta la cola de una distribución infinita.
+TAIL = 1e-16
+
+# Modelos que suponen servicio exponencial; sólo se comparan con la simulación de esa distribución.
+EXPONENTIAL_MODELS = ('mm1', 'mmc')
+
+def burst_pmf(distribution: str) -> dict[int, float]:
+    """Devuelve la probabilidad de cada ráfaga de una distribución de simulation.BURST_DISTRIBUTIONS."""
+
+    if distribution == 'uniform':
+        return {burst: 1 / 15 for burst in range(1, 16)}
+    if distribution == 'bimodal':
+        return {**{burst: 0.8 / 4 for burst in range(1, 5)}, **{burst: 0.2 / 21 for burst in range(20, 41)}}
+    if distribution == 'exponential':
+        # 1 + int(X) con X exponencial de media 7.5 es 1 más una geométrica.
+        q = math.exp(-1 / 7.5)
+        pmf = {}
+        k = 0
+        while q**k > TAIL:
+            pmf[1 + k] = (1 - q) * q**k
+            k += 1
+        return pmf
+
+    raise ValueError(distribution)
+
+@functools.cache
+def burst_moments(distribution: str) -> tuple[float, float]:
+    """Devuelve el primer y segundo momento de la ráfaga, E[S] y E[S²]."""
+
+    pmf = burst_pmf(distribution)
+    return sum(burst * p for burst, p in pmf.items()), sum(burst * burst * p for burst, p in pmf.items())
+
+def arrival_rate(load: float, servers: int = 1) -> float:
+    """Devuelve la tasa de llegadas por tick de simulation.generate_clients con el factor de carga indicado,
+    que para varios cajeros es por cajero, como en farm.py."""
+
+    return servers * load / simulation.BURST_MEAN
+
+def result(model: str, utilization: float, wait: float, service: float, **extra) -> dict:
+    """Arma el resultado de un modelo. Con utilización de 1 o más la cola crece sin límite y los tiempos son infinitos."""
+
+    if utilization >= 1:
+        wait = math.inf
+    return {'model': model, 'utilization': utilization, 'mean_wait': wait, 'mean_turnaround': wait + service, **extra}
+
+def mm1(load: float, distribution: str = 'exponential') -> dict:
+    """M/M/1: llegadas de Poisson y servicio exponencial con la media de la distribución, un cajero."""
+
+    mean, _ = burst_moments(distribution)
+    rate = arrival_rate(load)
+    rho = rate * mean
+    return result('mm1', rho, rho * mean / (1 - rho) if rho < 1 else math.inf, mean)
+
+def erlang_c(offered: float, servers: int) -> float:
+    """Devuelve la probabilidad de esperar en M/M/c con la carga ofrecida a = λ/μ, por la fórmula C de Erlang.
+    Se calcula con la recurrencia de Erlang B, que no desborda con muchos cajeros."""
+
+    blocking = 1.0
+    for k in range(1, servers + 1):
+        blocking = offered * blocking / (k + offered * blocking)
+
+    rho = offered / servers
+    return blocking / (1 - rho * (1 - blocking))
+
+def mmc(load: float, distribution: str = 'exponential', servers: int = 1) -> dict:
+    """M/M/c: llegadas de Poisson, servicio exponencial y una sola fila para varios cajeros.
+    load: Factor de carga por cajero."""
+
+    mean, _ = burst_moments(distribution)
+    offered = arrival_rate(load, servers) * mean
+    rho = offered / servers
+    if rho >= 1:
+        return result('mmc', rho, math.inf, mean, servers=servers)
+
+    probability = erlang_c(offered, servers)
+    return result('mmc', rho, probability * mean / (servers - offered), mean, servers=servers, probability_wait=probability)
+
+def mg1(load: float, distribution: str = 'uniform') -> dict:
+    """M/G/1 por la fórmula de Pollaczek-Khinchine, Wq = λ E[S²] / (2 (1 - ρ)). Corresponde a FIFO con capacidad 0."""
+
+    mean, second = burst_moments(distribution)
+    rate = arrival_rate(load)
+    rho = rate * mean
+    return result('mg1', rho, rate * second / (2 * (1 - rho)) if rho < 1 else math.inf, mean)
+
+def priority_mg1(load: float, distribution: str = 'uniform', levels: int = PRIORITY_LEVELS) -> dict:
+    """M/G/1 con prioridades sin expulsión por la fórmula de Cobham, Wq_k = W0 / ((1 - σ_{k-1}) (1 - σ_k)),
+    con W0 = λ E[S²] / 2 y σ_k la utilización de las clases 1 a k. Corresponde a Priority con capacidad 0,
+    con prioridades independientes de la ráfaga y repartidas por igual entre las clases."""
+
+    mean, second = burst_moments(distribution)
+    rate = arrival_rate(load)
+    rho = rate * mean
+    residual = rate * second / 2
+
+    waits = []
+    sigma = 0.0
+    for _ in range(levels):
+        previous = sigma
+        sigma += rho / levels
+        waits.append(residual / ((1 - previous) * (1 - sigma)) if sigma < 1 else math.inf)
+
+    return result('priority', rho, sum(waits) / levels, mean, class_waits=waits)
+
+MODELS = {
+    'mm1': lambda load, distribution, servers: mm1(load, distribution),
+    'mmc': mmc,
+    'mg1': lambda load, distribution, servers: mg1(load, distribution),
+    'priority': lambda load, distribution, servers: priority_mg1(load, distribution)
+}
+
+def predict(model: str, load: float, distribution: str = 'uniform', servers: int = 1) -> dict:
+    """Devuelve la utilización y la espera y el retorno medios en ticks que predice el modelo indicado."""
+
+    return MODELS[model](load, distribution, servers)
+
+def fcfs_servers(arrivals: list[int], bursts: list[int], servers: int) -> list[int]:
+    """Devuelve el comienzo de cada cliente en una sola fila FIFO con varios cajeros: cada cliente, en orden de llegada,
+    toma el cajero que se libera primero. Con un cajero es la recursión de Lindley de fastpath."""
+
+    free = [0] * servers
+    starts = []
+    for arrival, burst in zip(arrivals, bursts):
+        start = max(arrival, heapq.heappop(free))
+        starts.append(start)
+        heapq.heappush(free, start + burst)
+
+    return starts
+
+def validate(model: str, load: float, distribution: str = 'uniform', n_clients: int = 100000, servers: int = 1, seed: int = 0) -> dict:
+    """Compara la predicción del modelo con una simulación de los mismos clientes.
+    mm1 y mg1 se comparan con FIFO y priority con Priority, ambas con capacidad 0, por offline.Batch_Schedule;
+    mmc con una fila FIFO de varios cajeros. Devuelve la predicción, lo simulado y el error relativo de cada tiempo.
+    mm1 y mmc sólo se validan con la distribución 'exponential', pues con otra el error sería del supuesto del modelo."""
+
+    if model in EXPONENTIAL_MODELS and distribution != 'exponential':
+        raise ValueError(f'{model} supone servicio exponencial, no {distribution}')
+
+    clients = simulation.generate_clients(n_clients, load * servers, distribution, model == 'priority', seed)
+    if model == 'mmc':
+        arrivals = [client.get_arrival_time() for client in clients]
+        bursts = [client.get_number_of_requests() for client in clients]
+        starts = fcfs_servers(arrivals, bursts, servers)
+        waits = [start - arrival for start, arrival in zip(starts, arrivals)]
+        turnarounds = [wait + burst for wait, burst in zip(waits, bursts)]
+    else:
+        results = offline.Batch_Schedule('Priority' if model == 'priority' else 'FIFO', clients, 0).results()
+        waits = [result['waiting'] for result in results]
+        turnarounds = [result['turnaround'] for result in results]
+
+    predicted = predict(model, load, distribution, servers)
+    simulated = {'mean_wait': sum(waits) / len(waits), 'mean_turnaround': sum(turnarounds) / len(turnarounds)}
+    return {
+        'predicted': predicted,
+        'simulated': simulated,
+        'relative_error': {
+            key: (predicted[key] - value) / value if value else None
+            for key, value in simulated.items()
+        }
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', choices=tuple(MODELS), default='mg1')
+    parser.add_argument('--loads', nargs='+', type=float, default=[0.5, 0.7, 0.8, 0.9, 0.95])
+    parser.add_argument('--distribution', choices=tuple(simulation.BURST_DISTRIBUTIONS), default=None,
+                        help="Por defecto 'exponential' para mm1 y mmc y 'uniform' para los demás.")
+    parser.add_argument('--servers', type=int, default=1, help='Cajeros de mmc. El factor de carga es por cajero.')
+    parser.add_argument('--validate', type=int, default=0, help='Clientes para comparar con la simulación. 0 para omitir.')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if args.distribution is None:
+        args.distribution = 'exponential' if args.model in EXPONENTIAL_MODELS else 'uniform'
+    elif args.validate and args.model in EXPONENTIAL_MODELS and args.distribution != 'exponential':
+        parser.error(f'{args.model} supone servicio exponencial; valide con --distribution exponential')
+
+    start = time.perf_counter()
+    predictions = [predict(args.model, load, args.distribution, args.servers) for load in args.loads]
+    elapsed = (time.perf_counter() - start) / len(args.loads)
+    print(f'{args.model} · {args.distribution} · {elapsed * 1e6:.1f} µs por escenario')
+
+    print(f'{"carga":>8}{"uso":>8}{"espera":>12}{"retorno":>12}' + (f'{"simulada":>12}{"error":>10}' if args.validate else ''))
+    for load, prediction in zip(args.loads, predictions):
+        line = f'{load:>8.2f}{prediction["utilization"]:>8.1%}{prediction["mean_wait"]:>12.2f}{prediction["mean_turnaround"]:>12.2f}'
+        if args.validate:
+            comparison = validate(args.model, load, args.distribution, args.validate, args.servers, args.seed)
+            error = comparison['relative_error']['mean_wait']
+            line += f'{comparison["simulated"]["mean_wait"]:>12.2f}' + (f'{error:>10.1%}' if error is not None else f'{"-":>10}')
+        print(line)
@@ -0,0 +1,453 @@
+"""Pruebas de rendimiento de las colas y de las políticas de atención."""
+
+import argparse, json, os, platform, random, subprocess, sys, threading, time
+import logic, params, simulation, stats
+
+# Código medido en un intérprete nuevo para el arranque. La lógica no debe cargar módulos pesados.
+STARTUP_SNIPPETS = {
+    'startup.logic': 'import sys, logic, simulation, stats, instrument; assert not {"pygame", "pandas", "numpy"} & set(sys.modules)',
+    'startup.window': 'import view; view.open_window("bench")'
+}
+
+# Tamaños de las cargas. Los dos últimos tardan minutos por el recorrido lineal de la cola.
+SIZES = (10**3, 10**4, 10**5, 10**6)
+
+def timed(function, repeat: int, reset=None) -> float:
+    """Devuelve el mejor tiempo en segundos de varias ejecuciones de la función.
+    reset: Función sin medir que se ejecuta después de cada ejecución."""
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        if reset is not None:
+            reset()
+
+    return best
+
+def filled_queue(policy: str, size: int, seed: int) -> logic.FIFO_Server_Queue:
+    """Devuelve una cola de servidor con el número de clientes indicado.
+    Los clientes se insertan detrás del cajero en orden inverso para no recorrer la cola,
+    lo cual mantiene el orden que hubiera dado la política."""
+
+    clients = simulation.generate_clients(size, 1, 'uniform', policy == 'Priority', seed)
+    if policy == 'Priority':
+        clients.sort(key=logic.Queue_Client.get_priority)
+    elif policy == 'SRTF':
+        clients.sort(key=logic.Queue_Client.get_number_of_requests)
+
+    queue = simulation.create_queue(policy, 0)
+    for client in reversed(clients):
+        logic.Queue.enqueue(queue, client, 1)
+
+    return queue
+
+def bench_queue(size: int, ops: int, repeat: int, seed: int) -> list[dict]:
+    """Mide la cola base: agregar al final, sacar del frente y obtener por posición."""
+
+    rng = random.Random(seed)
+    positions = [rng.randrange(size) for _ in range(ops)]
+    queue = logic.Queue()
+    for i in range(size):
+        queue.enqueue(i, 0)
+
+    def enqueue_dequeue() -> None:
+        for i in range(ops):
+            queue.enqueue(i)
+            queue.dequeue()
+
+    def get() -> None:
+        for pos in positions:
+            queue.get(pos)
+
+    return [
+        {'benchmark': 'queue.enqueue_dequeue', 'policy': None, 'size': size, 'ops': ops, 'seconds': timed(enqueue_dequeue, repeat)},
+        {'benchmark': 'queue.get', 'policy': None, 'size': size, 'ops': ops, 'seconds': timed(get, repeat)}
+    ]
+
+def bench_server_queue(policy: str, size: int, ops: int, repeat: int, seed: int) -> list[dict]:
+    """Mide una política: agregar clientes uno por uno y en lote, atender, obtener por posición y eliminar."""
+
+    rng = random.Random(seed)
+    queue = filled_queue(policy, size, seed)
+    arrivals = simulation.generate_clients(ops, 1, 'uniform', policy == 'Priority', seed + 1)
+    positions = [1 + rng.randrange(size) for _ in range(ops)]
+
+    def enqueue() -> None:
+        for client in arrivals:
+            queue.enqueue(client)
+
+    def enqueue_many() -> None:
+        queue.enqueue_many(arrivals)
+
+    def unqueue() -> None:
+        for client in arrivals:
+            logic.Queue.dequeue(queue, queue.index(client))
+
+    def dequeue() -> None:
+        for _ in range(ops):
+            queue.dequeue()
+
+    def get() -> None:
+        for pos in positions:
+            queue.get(pos)
+
+    removed = list(dict.fromkeys(queue.get(pos) for pos in positions[:ops // 2]))
+
+    def remove() -> None:
+        for client in removed:
+            queue.remove(client)
+
+    def restore() -> None:
+        for client in removed:
+            logic.Queue.enqueue(queue, client, 1)
+
+    results = [
+        {'benchmark': 'server.enqueue', 'size': size, 'ops': ops, 'seconds': timed(enqueue, repeat, unqueue)},
+        {'benchmark': 'server.enqueue_many', 'size': size, 'ops': ops, 'seconds': timed(enqueue_many, repeat, unqueue)},
+        {'benchmark': 'server.get', 'size': size, 'ops': ops, 'seconds': timed(get, repeat)},
+        {'benchmark': 'server.remove', 'size': size, 'ops': len(removed), 'seconds': timed(remove, repeat, restore)},
+        # Al final porque atender modifica a los clientes.
+        {'benchmark': 'server.dequeue', 'size': size, 'ops': ops, 'seconds': timed(dequeue, 1)}
+    ]
+    for result in results:
+        result['policy'] = policy
+
+    return results
+
+def bench_run(policy: str, size: int, quantum: int, seed: int) -> list[dict]:
+    """Mide una simulación completa y el cálculo de sus métricas."""
+
+    clients = simulation.generate_clients(size, 0.9, 'uniform', policy == 'Priority', seed)
+    sim = simulation.Simulation(simulation.create_queue(policy, quantum), clients)
+
+    start = time.perf_counter()
+    sim.run()
+    run_seconds = time.perf_counter() - start
+
+    results = sim.results()
+    return [
+        {'benchmark': 'run.ticks', 'policy': policy, 'size': size, 'ops': sim.time, 'seconds': run_seconds},
+        {'benchmark': 'metrics.summarize', 'policy': policy, 'size': size, 'ops': len(results), 'seconds': timed(lambda: simulation.summarize(results), 3)}
+    ]
+
+def bench_table(size: int, ops: int, repeat: int) -> list[dict]:
+    """Mide el patrón de la tabla de la interfaz: agregar filas con loc y buscar la última fila de un proceso."""
+
+    try:
+        import pandas
+    except ImportError:
+        return []
+
+    columns = ('Proceso', 'Estado', 'T. Llegada', 'Prioridad', 'Ráfaga', 'T. Comienzo', 'T. Final', 'T. Retorno', 'T. Espera')
+    rows = min(size, ops)
+
+    def append() -> None:
+        table_data = pandas.DataFrame(columns=columns)
+        for i in range(rows):
+            table_data.loc[len(table_data)] = (str(i), 'Esperando', i, None, 1, None, None, None, None)
+
+    table_data = pandas.DataFrame([(str(i), 'Esperando', i, None, 1, None, None, None, None) for i in range(size)], columns=columns)
+
+    def lookup() -> None:
+        for i in range(0, size, max(1, size // ops)):
+            table_data[table_data['Proceso'] == str(i)].iloc[-1]
+
+    return [
+        {'benchmark': 'table.append', 'policy': None, 'size': rows, 'ops': rows, 'seconds': timed(append, repeat)},
+        {'benchmark': 'table.lookup', 'policy': None, 'size': size, 'ops': len(range(0, size, max(1, size // ops))), 'seconds': timed(lookup, repeat)}
+    ]
+
+def bench_table_index(size: int, ops: int, repeat: int, seed: int) -> list[dict]:
+    """Mide logic.Table_Index con size filas: actualizar filas como en cada tick y leer las 20 primeras
+    ordenadas por tiempo de espera, filtradas o no por estado."""
+
+    columns = ('Proceso', 'Estado', 'T. Llegada', 'Prioridad', 'Ráfaga', 'T. Comienzo', 'T. Final', 'T. Retorno', 'T. Espera')
+    rng = random.Random(seed)
+    index = logic.Table_Index(columns, 'Estado')
+    for i in range(size):
+        index.set_row(i, (str(i), 'Terminado', i, None, 1, i, i + 1, 1, rng.randrange(100)))
+
+    labels = [rng.randrange(size) for _ in range(ops)]
+
+    def update() -> None:
+        for label in labels:
+            row = index.rows[label]
+            index.set_row(label, (*row[:1], 'Esperando' if row[1] == 'Terminado' else 'Terminado', *row[2:8], rng.randrange(100)))
+
+    def top() -> None:
+        for i in range(ops):
+            index.top(20, 'T. Espera', True, 'Terminado' if i % 2 else None)
+
+    return [
+        {'benchmark': 'table_index.update', 'policy': None, 'size': size, 'ops': ops, 'seconds': timed(update, repeat)},
+        {'benchmark': 'table_index.top', 'policy': None, 'size': size, 'ops': ops, 'seconds': timed(top, repeat)}
+    ]
+
+def bench_concurrent(producers: int, size: int) -> list[dict]:
+    """Mide y comprueba Concurrent_FIFO_Server_Queue: varios hilos agregan size clientes en total
+    mientras el hilo servidor los atiende. Falla si algún cliente se pierde o se atiende dos veces."""
+
+    queue = logic.Concurrent_FIFO_Server_Queue(1)
+    start_barrier = threading.Barrier(producers + 1)
+
+    def produce(producer: int) -> None:
+        start_barrier.wait()
+        for i in range(producer, size, producers):
+            queue.enqueue(logic.Queue_Client(i, 1 + i % 3, 0))
+
+    threads = [threading.Thread(target=produce, args=(producer,)) for producer in range(producers)]
+    for thread in threads:
+        thread.start()
+
+    served = []
+    start_barrier.wait()
+    start = time.perf_counter()
+    while len(served) < size:
+        if queue.get_size() > 1:
+            client = queue.dequeue()
+            if client is not None:
+                served.append(client.get_id())
+        elif not any(thread.is_alive() for thread in threads) and queue.pending() == 0 and queue.get_size() <= 1:
+            break
+    seconds = time.perf_counter() - start
+
+    for thread in threads:
+        thread.join()
+
+    if len(served) != size or len(set(served)) != size:
+        raise AssertionError(f'{producers} productores: {size} clientes agregados, {len(served)} atendidos, {len(set(served))} distintos')
+
+    return [{'benchmark': 'concurrent.served', 'policy': f'{producers}p', 'size': size, 'ops': size, 'seconds': seconds}]
+
+def bench_timer_wheel(size: int, ops: int, repeat: int, seed: int) -> list[dict]:
+    """Mide la rueda de temporizadores con size clientes bloqueados: avanzar ticks y programar bloqueos."""
+
+    rng = random.Random(seed)
+    delays = [rng.randint(params.BLOCK_TIME_MIN, params.BLOCK_TIME_MAX * 100) for _ in range(size)]
+    wheel = logic.Timer_Wheel()
+
+    def schedule() -> None:
+        for i, delay in enumerate(delays):
+            wheel.schedule(i, delay)
+
+    def advance() -> None:
+        # Cada cliente que sale se vuelve a bloquear, así que siempre hay size bloqueados.
+        for _ in range(ops):
+            for i in wheel.advance():
+                wheel.schedule(i, delays[i])
+
+    timed(schedule, 1)
+    return [
+        {'benchmark': 'timer_wheel.advance', 'policy': None, 'size': size, 'ops': ops, 'seconds': timed(advance, repeat)}
+    ]
+
+def bench_series(size: int, repeat: int, seed: int) -> list[dict]:
+    """Mide stats.Tick_Series con size ticks: registrar cada tick y reducir una métrica a params.CHART_POINTS puntos.
+    La reducción debe costar casi lo mismo para cualquier size."""
+
+    rng = random.Random(seed)
+    lengths = [rng.randrange(50) for _ in range(size)]
+
+    def record() -> stats.Tick_Series:
+        series = stats.Tick_Series(('queue_length', 'utilization', 'throughput'), params.SERIES_CAPACITY)
+        for time, length in enumerate(lengths):
+            series.record(time, length, length > 0, length % 2)
+        return series
+
+    series = record()
+
+    def points() -> None:
+        for name in series.names:
+            series.points(name, params.CHART_POINTS)
+
+    return [
+        {'benchmark': 'series.record', 'policy': None, 'size': size, 'ops': size, 'seconds': timed(record, repeat)},
+        {'benchmark': 'series.points', 'policy': None, 'size': size, 'ops': len(series.names), 'seconds': timed(points, repeat)}
+    ]
+
+def bench_startup(repeat: int) -> list[dict]:
+    """Mide el arranque en frío, desde que inicia el intérprete, de la lógica y de la ventana.
+    Compara el tiempo de la ventana con params.STARTUP_TIME_TARGET."""
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+
+    results = []
+    for name, snippet in STARTUP_SNIPPETS.items():
+        failed = False
+
+        def start() -> None:
+            nonlocal failed
+            failed = failed or subprocess.run([sys.executable, '-c', snippet], cwd=directory, env=env, capture_output=True).returncode != 0
+
+        seconds = timed(start, repeat)
+        if failed:
+            print(f'{name}: falló', file=sys.stderr)
+            continue
+
+        results.append({'benchmark': name, 'policy': None, 'size': None, 'ops': 1, 'seconds': seconds})
+
+    for result in results:
+        if result['benchmark'] == 'startup.window':
+            result['target'] = params.STARTUP_TIME_TARGET
+            result['within_target'] = result['seconds'] <= params.STARTUP_TIME_TARGET
+
+    return results
+
+def bench_frame(backend: str, lanes: int, frames: int, seed: int) -> list[dict]:
+    """Mide el tiempo por cuadro de la ventana con el backend de dibujo indicado: botones, etiquetas,
+    cajas de texto y un diagrama de Grant con el número de carriles indicado, más la tabla si Pandas está instalado.
+    Se agrega una línea al diagrama cada 12 cuadros, como el modo automático a 60 cuadros por segundo.
+    Sin pantalla se usa el controlador dummy de SDL, que sólo ofrece el renderizador por software."""
+
+    try:
+        import pygame
+    except ImportError:
+        return []
+
+    import view
+    if 'DISPLAY' not in os.environ and 'WAYLAND_DISPLAY' not in os.environ:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+    try:
+        canvas = view.open_window('bench', backend)
+    except RuntimeError as error:
+        print(f'frame.{backend}: {error}', file=sys.stderr)
+        return []
+
+    rng = random.Random(seed)
+    widgets = [
+        view.Button(120, 370 + 40 * i, 200, 30, 2, f'Botón {i}', 'Comic Sans MS', 15) for i in range(4)
+    ] + [
+        view.Tag(20, 610, f'Etiqueta {i}', 'Comic Sans MS', 15, 'Black') for i in range(4)
+    ] + [
+        view.Textbox(120, 450 + 40 * i, 100, 30, 2, 'Comic Sans MS', 15) for i in range(3)
+    ]
+    for button in widgets[:4]:
+        button.hover = False
+
+    grant = view.Grant(400, 370, 480, 270, 'Comic Sans MS', 15)
+    tags = [str(i) for i in range(lanes)]
+    for tag in tags:
+        grant.add_tag(tag)
+    for _ in range(params.HISTORY_TICKS):
+        grant.add_line(rng.choice(tags))
+    widgets.append(grant)
+
+    try:
+        import pandas
+        columns = ('Proceso', 'Estado', 'T. Llegada', 'Prioridad', 'Ráfaga', 'T. Comienzo', 'T. Final', 'T. Retorno', 'T. Espera')
+        table_index = logic.Table_Index(columns, 'Estado')
+        for i in range(params.HISTORY_ROWS):
+            table_index.set_row(i, (str(i), 'Esperando', i, None, rng.randint(1, 15), None, None, None, None))
+        widgets.append(view.Table(pandas.DataFrame(columns=columns), 10, 10, 100, 20, 1, 7, 2, 'Comic Sans MS', 15, table_index, 17))
+    except ImportError:
+        pass
+
+    times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        if frame % 12 == 0:
+            grant.add_line(rng.choice(tags))
+        pygame.event.pump()
+        canvas.fill('White')
+        for widget in widgets:
+            widget.draw(canvas)
+        canvas.present()
+        times.append(time.perf_counter() - start)
+
+    pygame.display.quit()
+    times.sort()
+    return [{
+        'benchmark': f'frame.{canvas.name}',
+        'policy': None,
+        'size': lanes,
+        'ops': frames,
+        'seconds': sum(times),
+        'p50_frame': times[len(times) // 2],
+        'p95_frame': times[min(len(times) - 1, int(len(times) * 0.95))]
+    }]
+
+def commit() -> str:
+    """Devuelve el commit actual de git o None."""
+
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def key(result: dict) -> tuple:
+    """Identifica un resultado para compararlo entre ejecuciones."""
+
+    return (result['benchmark'], result['policy'], result['size'])
+
+def compare(old: dict, new: dict, threshold: float) -> bool:
+    """Imprime el cambio de rendimiento de cada resultado y devuelve verdadero si alguno empeoró más del umbral.
+    old: Resultados anteriores.
+    new: Resultados actuales.
+    threshold: Fracción de aumento en el tiempo por operación tolerada."""
+
+    old_results = {key(result): result for result in old['results']}
+    regression = False
+    for result in new['results']:
+        previous = old_results.get(key(result))
+        if previous is None:
+            continue
+
+        ratio = (result['seconds'] / result['ops']) / (previous['seconds'] / previous['ops'])
+        slower = ratio > 1 + threshold
+        regression = regression or slower
+        print(f'{result["benchmark"]:22} {str(result["policy"]):9} {str(result["size"]):>8} {ratio:7.2f}x{"  REGRESIÓN" if slower else ""}')
+
+    return regression
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(SIZES[:2]), help=f'Número de clientes de cada carga, por ejemplo {" ".join(map(str, SIZES))}.')
+    parser.add_argument('--ops', type=int, default=1000, help='Operaciones por medición de la cola.')
+    parser.add_argument('--quantum', type=int, default=0)
+    parser.add_argument('--producers', nargs='+', type=int, default=[1, 2, 4, 8], help='Hilos productores de la cola concurrente.')
+    parser.add_argument('--frames', type=int, default=300, help='Cuadros por medición de la ventana. 0 para omitir.')
+    parser.add_argument('--lanes', type=int, default=30, help='Carriles del diagrama de Grant en la medición de la ventana.')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench.json')
+    parser.add_argument('--compare', help='JSON de una ejecución anterior con el cual comparar.')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = bench_startup(args.repeat)
+    if args.frames:
+        for backend in ('software', 'renderer'):
+            results += bench_frame(backend, args.lanes, args.frames, args.seed)
+    for size in args.sizes:
+        results += bench_queue(size, args.ops, args.repeat, args.seed)
+        for policy in simulation.POLICIES:
+            results += bench_server_queue(policy, size, args.ops, args.repeat, args.seed)
+            results += bench_run(policy, size, args.quantum, args.seed)
+        for producers in args.producers:
+            results += bench_concurrent(producers, size)
+        results += bench_timer_wheel(size, args.ops, args.repeat, args.seed)
+        results += bench_series(size, args.repeat, args.seed)
+        results += bench_table(size, args.ops, args.repeat)
+        results += bench_table_index(size, args.ops, args.repeat, args.seed)
+
+    for result in results:
+        result['ops_per_second'] = result['ops'] / result['seconds'] if result['seconds'] else None
+
+    report = {
+        'commit': commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': args.seed,
+        'results': results
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            sys.exit(1 if compare(json.load(file), report, args.threshold) else 0)
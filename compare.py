@@ -0,0 +1,174 @@
+"""Comparación de políticas sobre un mismo flujo de llegadas, con números aleatorios comunes."""
+
+import argparse, array
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+import offline, simulation, stats
+
+class Shared_Trace:
+    """Flujo de llegadas y tiempos finales de cada variante en un bloque de memoria compartida.
+    Los procesos se conectan por nombre y leen las llegadas sin copiarlas ni serializarlas.
+    El bloque tiene, como enteros de 64 bits: llegadas, ráfagas, prioridades y un final por cliente y variante."""
+
+    def __init__(self, n_clients: int, n_variants: int, name: str = None) -> None:
+        """Crea el bloque o, si se indica su nombre, se conecta a uno existente.
+        n_clients: Número de clientes del flujo.
+        n_variants: Número de variantes a comparar.
+        name: Nombre de la memoria compartida de un bloque existente."""
+
+        self.n_clients = n_clients
+        self.n_variants = n_variants
+        self.memory = shared_memory.SharedMemory(name, name is None, max(1, 8 * n_clients * (3 + n_variants)))
+        values = self.memory.buf.cast('q')
+        self.views = [values[i * n_clients:(i + 1) * n_clients] for i in range(3 + n_variants)]
+        values.release()
+        self.arrivals, self.bursts, self.priorities = self.views[:3]
+
+    def finals(self, variant: int) -> memoryview:
+        """Devuelve los tiempos finales de los clientes con la variante indicada."""
+
+        return self.views[3 + variant]
+
+    def fill(self, clients: list) -> None:
+        """Copia al bloque las llegadas, ráfagas y prioridades de los clientes, ordenados por llegada."""
+
+        for i, client in enumerate(clients):
+            self.arrivals[i] = client.get_arrival_time()
+            self.bursts[i] = client.get_number_of_requests()
+            self.priorities[i] = client.get_priority()
+
+    def close(self, unlink: bool = False) -> None:
+        """Se desconecta del bloque y, si se indica, lo elimina."""
+
+        for view in self.views:
+            view.release()
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+def parse_variant(text: str) -> tuple[str, int]:
+    """Interpreta una variante como 'SRTF' o 'FIFO:3', es decir, política y capacidad por turno."""
+
+    policy, _, capacity = text.partition(':')
+    if policy not in simulation.POLICIES:
+        raise ValueError(text)
+
+    return policy, int(capacity or 0)
+
+def run_variant(name: str, n_clients: int, n_variants: int, variant: int, policy: str, capacity: int) -> None:
+    """Planifica el flujo compartido con una variante y escribe los tiempos finales en el bloque.
+    Se ejecuta en un proceso del grupo o en el proceso principal."""
+
+    trace = Shared_Trace(n_clients, n_variants, name)
+    try:
+        _, finals, _ = offline.schedule(policy, trace.arrivals, trace.bursts, trace.priorities, capacity)
+        trace.finals(variant)[:] = array.array('q', finals)
+    finally:
+        trace.close()
+
+def compare(variants: list[tuple[str, int]], n_clients: int, load: float, distribution: str = 'uniform', seeds: list[int] = (0,), workers: int = 0) -> dict:
+    """Compara las variantes con los mismos clientes en cada semilla.
+    Devuelve, por variante, su resumen y las diferencias pareadas contra la primera variante:
+    por cliente en la primera semilla y, con varias semillas, de las medias por semilla con su intervalo de confianza.
+    variants: Pares (política, capacidad). La primera es la referencia.
+    n_clients: Número de clientes por semilla.
+    load: Factor de carga.
+    distribution: Distribución de ráfagas.
+    seeds: Semillas de los flujos de llegadas.
+    workers: Número de procesos para planificar las variantes en paralelo. 0 para no crear procesos."""
+
+    # Diferencias de la media de espera por semilla contra la referencia. El retorno difiere lo mismo,
+    # porque llegada y ráfaga son comunes, así que sólo cambia el final.
+    mean_differences = [stats.Running_Stat() for _ in variants]
+    report = {'variants': [], 'seeds': list(seeds), 'n_clients': n_clients}
+    pool = ProcessPoolExecutor(workers) if workers > 0 else None
+
+    try:
+        for seed_index, seed in enumerate(seeds):
+            trace = Shared_Trace(n_clients, len(variants))
+            try:
+                # Las prioridades se generan siempre para que todas las variantes reciban los mismos números aleatorios.
+                trace.fill(simulation.generate_clients(n_clients, load, distribution, True, seed))
+                tasks = [(trace.memory.name, n_clients, len(variants), i, policy, capacity) for i, (policy, capacity) in enumerate(variants)]
+                if pool is not None:
+                    for future in [pool.submit(run_variant, *task) for task in tasks]:
+                        future.result()
+                else:
+                    for task in tasks:
+                        run_variant(*task)
+
+                arrivals, bursts = trace.arrivals.tolist(), trace.bursts.tolist()
+                finals = [trace.finals(i).tolist() for i in range(len(variants))]
+            finally:
+                trace.close(True)
+
+            means = []
+            for i, (policy, capacity) in enumerate(variants):
+                results = [
+                    {'waiting': final - arrival - burst, 'turnaround': final - arrival}
+                    for arrival, burst, final in zip(arrivals, bursts, finals[i])
+                ]
+                summary = simulation.summarize(results)
+                means.append(summary['mean_wait'])
+                if seed_index == 0:
+                    report['variants'].append({'policy': policy, 'capacity': capacity, **summary})
+
+            for i in range(len(variants)):
+                mean_differences[i].add(means[i] - means[0])
+
+            if seed_index == 0:
+                for i, variant in enumerate(report['variants']):
+                    # Llegada y ráfaga son las mismas en todas las variantes, así que la diferencia del final
+                    # de cada cliente es a la vez la de su espera y la de su retorno.
+                    differences = sorted(final - base for final, base in zip(finals[i], finals[0]))
+                    variant['paired'] = {
+                        'mean_diff': sum(differences) / len(differences) if differences else None,
+                        'p05_diff': simulation.percentile(differences, 5),
+                        'p50_diff': simulation.percentile(differences, 50),
+                        'p95_diff': simulation.percentile(differences, 95),
+                        'better': sum(1 for difference in differences if difference < 0) / len(differences) if differences else None,
+                        'worse': sum(1 for difference in differences if difference > 0) / len(differences) if differences else None
+                    }
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    for variant, difference in zip(report['variants'], mean_differences):
+        variant['mean_diff_across_seeds'] = difference.mean if difference.count else None
+        variant['ci95_across_seeds'] = stats.confidence_interval(difference)
+
+    return report
+
+def print_report(report: dict) -> None:
+    """Imprime el reporte de compare como tabla."""
+
+    def number(value) -> str:
+        return '-' if value is None else f'{value:.3f}'
+
+    base = report['variants'][0]
+    print(f'{report["n_clients"]} clientes · semillas {report["seeds"]} · referencia {base["policy"]}:{base["capacity"]}')
+    print(f'{"variante":<12}{"espera":>10}{"p95":>10}{"p99":>10}{"retorno":>10}{"Δ espera/retorno":>18}{"mejor":>8}{"peor":>8}{"Δ semillas":>20}')
+    for variant in report['variants']:
+        paired = variant['paired']
+        across = number(variant['mean_diff_across_seeds'])
+        if variant['ci95_across_seeds'] is not None:
+            across += f' ± {variant["ci95_across_seeds"]:.3f}'
+        print(
+            f'{variant["policy"] + ":" + str(variant["capacity"]):<12}'
+            f'{number(variant["mean_wait"]):>10}{number(variant["p95_wait"]):>10}{number(variant["p99_wait"]):>10}'
+            f'{number(variant["mean_turnaround"]):>10}'
+            f'{number(paired["mean_diff"]):>18}'
+            f'{paired["better"]:>8.1%}{paired["worse"]:>8.1%}{across:>20}'
+        )
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--variants', nargs='+', type=parse_variant, default=[('FIFO', 0), ('Priority', 0), ('SRTF', 0)], help='Políticas con capacidad opcional, por ejemplo FIFO SRTF FIFO:3.')
+    parser.add_argument('--clients', type=int, default=100000)
+    parser.add_argument('--load', type=float, default=0.9)
+    parser.add_argument('--distribution', choices=tuple(simulation.BURST_DISTRIBUTIONS), default='uniform')
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0])
+    parser.add_argument('--workers', type=int, default=0)
+    args = parser.parse_args()
+
+    print_report(compare(args.variants, args.clients, args.load, args.distribution, args.seeds, args.workers))
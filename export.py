@@ -0,0 +1,243 @@
+"""Exportación sin ventana de diagramas de Gantt y tablas de procesos a PNG y SVG."""
+
+import argparse, bisect, os
+from xml.sax.saxutils import escape
+
+# Dimensiones en píxeles.
+TICK_WIDTH = 2
+LANE_HEIGHT = 12
+LABEL_WIDTH = 60
+AXIS_HEIGHT = 16
+ROW_HEIGHT = 16
+CELL_WIDTH = 80
+TILE_SIZE = 4096
+# Cada cuántos ticks se marca el eje de tiempo.
+AXIS_STEP = 50
+
+class Run_Data:
+    """Datos de una ejecución: secciones de ejecución, lapsos de cada cliente y su tabla."""
+
+    def __init__(self, slices: list[tuple], columns: tuple[str, ...], rows: list[tuple], spans: dict = None) -> None:
+        """slices: Secciones (id, inicio, fin) ordenadas por inicio.
+        columns: Columnas de la tabla.
+        rows: Filas de la tabla.
+        spans: Por id, (llegada, final) del cliente para dibujar su espera. Opcional."""
+
+        self.slices = slices
+        self.columns = columns
+        self.rows = rows
+        self.spans = spans or {}
+
+        # Un carril por cliente en orden de primera aparición.
+        self.lanes: dict = {}
+        for id_client in spans or ():
+            self.lanes.setdefault(id_client, len(self.lanes))
+        for id_client, _, _ in slices:
+            self.lanes.setdefault(id_client, len(self.lanes))
+
+        self.starts = [start for _, start, _ in slices]
+        self.end = max((end for _, _, end in slices), default=1)
+
+    def slices_between(self, start: int, end: int):
+        """Devuelve las secciones que se cruzan con los ticks [start, end)."""
+
+        # Las secciones no se traslapan, así que sólo la anterior a start puede cruzar el inicio.
+        i = max(0, bisect.bisect_right(self.starts, start) - 1)
+        while i < len(self.slices) and self.slices[i][1] < end:
+            if self.slices[i][2] > start:
+                yield self.slices[i]
+            i += 1
+
+def from_simulation(sim) -> Run_Data:
+    """Devuelve los datos de una simulación.Simulation que guardó sus secciones en memoria
+    o de una planificación offline.Batch_Schedule."""
+
+    results = sim.results()
+    columns = ('id', 'arrival', 'burst', 'priority', 'start', 'final', 'turnaround', 'waiting')
+    return Run_Data(
+        [tuple(section) for section in sim.slices],
+        columns,
+        [tuple(result[column] for column in columns) for result in results],
+        {result['id']: (result['arrival'], result['final']) for result in results}
+    )
+
+def from_history(directory: str) -> Run_Data:
+    """Devuelve los datos de un historial escrito por history.History."""
+
+    import history
+
+    arrays, categories = history.load(os.path.join(directory, 'slices'))
+    labels = categories['Proceso']
+    slices = list(zip(
+        (labels[code] for code in arrays['Proceso'].tolist()),
+        arrays['Inicio'].tolist(),
+        arrays['Fin'].tolist()
+    ))
+
+    arrays, categories = history.load(os.path.join(directory, 'clients'))
+    columns = tuple(arrays)
+    values = []
+    for column in columns:
+        if column in categories:
+            values.append([categories[column][code] if code >= 0 else None for code in arrays[column].tolist()])
+        else:
+            values.append([None if value == history.NULL else value for value in arrays[column].tolist()])
+
+    return Run_Data(slices, columns, list(zip(*values)))
+
+def export_svg(data: Run_Data, path: str) -> None:
+    """Escribe el diagrama y la tabla en un archivo SVG, elemento por elemento.
+    data: Datos de la ejecución.
+    path: Archivo a escribir."""
+
+    chart_width = LABEL_WIDTH + data.end * TICK_WIDTH
+    chart_height = AXIS_HEIGHT + len(data.lanes) * LANE_HEIGHT
+    table_width = len(data.columns) * CELL_WIDTH
+    width = max(chart_width, table_width)
+    height = chart_height + ROW_HEIGHT * (len(data.rows) + 2)
+
+    with open(path, 'w', encoding='utf-8') as file:
+        write = file.write
+        write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="Arial" font-size="10">\n')
+        write(f'<rect width="{width}" height="{height}" fill="white"/>\n')
+
+        # Eje de tiempo.
+        for tick in range(0, data.end + 1, AXIS_STEP):
+            x = LABEL_WIDTH + tick * TICK_WIDTH
+            write(f'<line x1="{x}" y1="{AXIS_HEIGHT - 4}" x2="{x}" y2="{chart_height}" stroke="#ddd"/>'
+                  f'<text x="{x}" y="{AXIS_HEIGHT - 6}">{tick}</text>\n')
+
+        # Etiquetas y espera de cada carril.
+        for id_client, lane in data.lanes.items():
+            y = AXIS_HEIGHT + lane * LANE_HEIGHT
+            write(f'<text x="2" y="{y + LANE_HEIGHT - 2}">{escape(str(id_client))}</text>')
+            span = data.spans.get(id_client)
+            if span is not None:
+                write(f'<rect x="{LABEL_WIDTH + span[0] * TICK_WIDTH}" y="{y + LANE_HEIGHT // 2 - 1}" '
+                      f'width="{(span[1] - span[0]) * TICK_WIDTH}" height="2" fill="black"/>')
+            write('\n')
+
+        # Secciones de ejecución.
+        for id_client, start, end in data.slices:
+            write(f'<rect x="{LABEL_WIDTH + start * TICK_WIDTH}" y="{AXIS_HEIGHT + data.lanes[id_client] * LANE_HEIGHT + 1}" '
+                  f'width="{(end - start) * TICK_WIDTH}" height="{LANE_HEIGHT - 2}" fill="red"/>\n')
+
+        # Tabla de procesos.
+        y = chart_height + ROW_HEIGHT
+        for row in [data.columns, *data.rows]:
+            y += ROW_HEIGHT
+            write('<g>')
+            for i, value in enumerate(row):
+                write(f'<text x="{i * CELL_WIDTH + 2}" y="{y}">{"" if value is None else escape(str(value))}</text>')
+            write('</g>\n')
+
+        write('</svg>\n')
+
+def export_png(data: Run_Data, prefix: str) -> list[str]:
+    """Dibuja el diagrama y la tabla en mosaicos PNG de a lo más TILE_SIZE píxeles por lado,
+    guardando cada uno en cuanto se termina. Devuelve las rutas escritas.
+    data: Datos de la ejecución.
+    prefix: Inicio de la ruta de cada archivo, que termina en _gantt_<fila>_<columna>.png o _table_<fila>.png."""
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+
+    pygame.font.init()
+    font = pygame.font.SysFont('Arial', 10)
+    label_surfaces = {}
+
+    def text(value) -> pygame.Surface:
+        """Devuelve el texto renderizado, creando cada uno una sola vez."""
+
+        value = '' if value is None else str(value)
+        surface = label_surfaces.get(value)
+        if surface is None:
+            surface = label_surfaces[value] = font.render(value, True, 'Black')
+        return surface
+
+    paths = []
+    ticks_per_tile = (TILE_SIZE - LABEL_WIDTH) // TICK_WIDTH
+    lanes_per_tile = (TILE_SIZE - AXIS_HEIGHT) // LANE_HEIGHT
+    lanes = list(data.lanes)
+
+    for tile_row in range(max(1, -(-len(lanes) // lanes_per_tile))):
+        first_lane = tile_row * lanes_per_tile
+        tile_lanes = lanes[first_lane:first_lane + lanes_per_tile]
+
+        for tile_col in range(-(-data.end // ticks_per_tile)):
+            first_tick = tile_col * ticks_per_tile
+            last_tick = min(data.end, first_tick + ticks_per_tile)
+            surface = pygame.Surface((LABEL_WIDTH + (last_tick - first_tick) * TICK_WIDTH, AXIS_HEIGHT + len(tile_lanes) * LANE_HEIGHT))
+            surface.fill('White')
+
+            def x_of(tick: int) -> int:
+                return LABEL_WIDTH + (max(tick, first_tick) - first_tick) * TICK_WIDTH
+
+            for tick in range(-(-first_tick // AXIS_STEP) * AXIS_STEP, last_tick, AXIS_STEP):
+                pygame.draw.line(surface, 'Grey', (x_of(tick), AXIS_HEIGHT - 4), (x_of(tick), surface.get_height()))
+                surface.blit(text(tick), (x_of(tick) + 2, 0))
+
+            for lane, id_client in enumerate(tile_lanes):
+                y = AXIS_HEIGHT + lane * LANE_HEIGHT
+                surface.blit(text(id_client), (2, y))
+                span = data.spans.get(id_client)
+                if span is not None and span[0] < last_tick and span[1] > first_tick:
+                    pygame.draw.rect(surface, 'Black', (x_of(span[0]), y + LANE_HEIGHT // 2 - 1, x_of(min(span[1], last_tick)) - x_of(span[0]), 2))
+
+            for id_client, start, end in data.slices_between(first_tick, last_tick):
+                lane = data.lanes[id_client] - first_lane
+                if 0 <= lane < len(tile_lanes):
+                    pygame.draw.rect(surface, 'Red', (x_of(start), AXIS_HEIGHT + lane * LANE_HEIGHT + 1, x_of(min(end, last_tick)) - x_of(start), LANE_HEIGHT - 2))
+
+            path = f'{prefix}_gantt_{tile_row}_{tile_col}.png'
+            pygame.image.save(surface, path)
+            paths.append(path)
+
+    rows_per_tile = TILE_SIZE // ROW_HEIGHT - 1
+    for tile_row in range(max(1, -(-len(data.rows) // rows_per_tile))):
+        rows = data.rows[tile_row * rows_per_tile:(tile_row + 1) * rows_per_tile]
+        surface = pygame.Surface((len(data.columns) * CELL_WIDTH, (len(rows) + 1) * ROW_HEIGHT))
+        surface.fill('White')
+        for y, row in enumerate([data.columns, *rows]):
+            for x, value in enumerate(row):
+                rect = pygame.Rect(x * CELL_WIDTH, y * ROW_HEIGHT, CELL_WIDTH + 1, ROW_HEIGHT + 1)
+                pygame.draw.rect(surface, 'Black', rect, 1)
+                surface.blit(text(value), (rect.x + 2, rect.y + 2))
+
+        path = f'{prefix}_table_{tile_row}.png'
+        pygame.image.save(surface, path)
+        paths.append(path)
+
+    return paths
+
+if __name__ == '__main__':
+    import simulation
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--history', help='Carpeta de un historial. Si no se indica, se simula una ejecución.')
+    parser.add_argument('--policy', choices=simulation.POLICIES, default='SRTF')
+    parser.add_argument('--quantum', type=int, default=0)
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--load', type=float, default=0.9)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--offline', action='store_true', help='Calcular la ejecución con offline.Batch_Schedule en lugar de tick por tick.')
+    parser.add_argument('--format', choices=('png', 'svg', 'both'), default='both')
+    parser.add_argument('--output', default='run')
+    args = parser.parse_args()
+
+    if args.history:
+        data = from_history(args.history)
+    else:
+        clients = simulation.generate_clients(args.clients, args.load, 'uniform', args.policy == 'Priority', args.seed)
+        if args.offline:
+            import offline
+            sim = offline.Batch_Schedule(args.policy, clients, args.quantum)
+        else:
+            sim = simulation.Simulation(simulation.create_queue(args.policy, args.quantum), clients)
+            sim.run()
+        data = from_simulation(sim)
+
+    if args.format in ('svg', 'both'):
+        export_svg(data, f'{args.output}.svg')
+    if args.format in ('png', 'both'):
+        export_png(data, args.output)
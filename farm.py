@@ -0,0 +1,338 @@
+"""Granja de cajeros repartida en varios procesos con robo de trabajo entre ellos."""
+
+import argparse, struct, time
+import multiprocessing
+from multiprocessing import shared_memory
+import logic, simulation, stats
+
+# Ticks que avanza cada cajero entre sincronizaciones.
+EPOCH = 64
+# Clientes en espera a partir de los cuales un cajero cede clientes a uno desocupado.
+STEAL_THRESHOLD = 2
+RING_CAPACITY = 1 << 16
+
+# Tipos de registro en los búferes.
+ARRIVAL = 0
+MIGRATION = 1
+COMPLETION = 2
+
+NULL = -2**63
+
+class Ring_Buffer:
+    """Búfer circular de un productor y un consumidor en memoria compartida.
+    Cada registro son FIELDS enteros de 64 bits: (tipo, id, restantes, ráfaga, llegada, prioridad, comienzo, final)."""
+
+    FIELDS = 8
+    RECORD = struct.Struct(f'{FIELDS}q')
+
+    def __init__(self, capacity: int = RING_CAPACITY, name: str = None) -> None:
+        """Crea el búfer o, si se indica su nombre, se conecta al búfer existente.
+        capacity: Número de registros que caben.
+        name: Nombre de la memoria compartida de un búfer existente."""
+
+        self.capacity = capacity
+        self.memory = shared_memory.SharedMemory(name, name is None, 16 + capacity * Ring_Buffer.RECORD.size)
+        # Las posiciones de lectura y escritura sólo crecen; el índice en el búfer es su módulo.
+        self.positions = self.memory.buf[:16].cast('q')
+        if name is None:
+            self.positions[0] = 0
+            self.positions[1] = 0
+
+    def push(self, record: tuple) -> bool:
+        """Escribe un registro al final. Devuelve falso si el búfer está lleno."""
+
+        tail = self.positions[1]
+        if tail - self.positions[0] >= self.capacity:
+            return False
+
+        Ring_Buffer.RECORD.pack_into(self.memory.buf, 16 + (tail % self.capacity) * Ring_Buffer.RECORD.size, *record)
+        # La posición se publica después de escribir el registro.
+        self.positions[1] = tail + 1
+        return True
+
+    def free(self) -> int:
+        """Devuelve el número de registros que caben sin que el consumidor lea."""
+
+        return self.capacity - (self.positions[1] - self.positions[0])
+
+    def pop_all(self) -> list[tuple]:
+        """Lee y saca todos los registros disponibles."""
+
+        head = self.positions[0]
+        tail = self.positions[1]
+        records = [
+            Ring_Buffer.RECORD.unpack_from(self.memory.buf, 16 + (position % self.capacity) * Ring_Buffer.RECORD.size)
+            for position in range(head, tail)
+        ]
+        self.positions[0] = tail
+        return records
+
+    def close(self, unlink: bool = False) -> None:
+        """Se desconecta de la memoria compartida y, si se indica, la elimina."""
+
+        self.positions.release()
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+def encode(value) -> int:
+    return NULL if value is None else value
+
+def decode(value: int):
+    return None if value == NULL else value
+
+class Shard:
+    """Un cajero con su cola, alimentado y vaciado por búferes circulares."""
+
+    def __init__(self, policy: str, quantum: int, inbound: Ring_Buffer, outbound: Ring_Buffer) -> None:
+        """policy: Política de la cola del cajero.
+        quantum: Capacidad del cajero por turno.
+        inbound: Búfer con llegadas y clientes robados que envía el despachador.
+        outbound: Búfer con clientes terminados y cedidos para el despachador."""
+
+        self.sim = simulation.Simulation(simulation.create_queue(policy, quantum))
+        self.inbound = inbound
+        self.outbound = outbound
+
+    def give(self, n_clients: int) -> None:
+        """Cede hasta n_clients clientes en espera al despachador para otro cajero, sin pasar del espacio libre
+        del búfer de salida: el despachador no lo lee mientras espera en la barrera."""
+
+        for client, arrival, burst, start in self.sim.migrate_out(min(n_clients, self.outbound.free())):
+            self.push((MIGRATION, client.get_id(), client.get_number_of_requests(), burst, arrival,
+                                     encode(client.get_priority()), encode(start), NULL))
+
+    def run_epoch(self, horizon: int) -> tuple[int, bool]:
+        """Recibe los registros del despachador y avanza hasta el tick horizon.
+        Devuelve el número de clientes en espera y si el cajero quedó atendiendo."""
+
+        sim = self.sim
+        for kind, id_client, remaining, burst, arrival, priority, start, _ in self.inbound.pop_all():
+            client = logic.Queue_Client(id_client, remaining, arrival, decode(priority))
+            if kind == ARRIVAL:
+                sim.pending.append(client)
+                sim.pending_ids.add(id_client)
+            else:
+                sim.migrate_in(client, arrival, burst, decode(start))
+
+        while sim.time < horizon:
+            client = sim.step()
+            if client is not None:
+                arrival, burst, priority, start, final = sim.records.pop(client.get_id())
+                self.push((COMPLETION, client.get_id(), 0, burst, arrival, encode(priority), start, final))
+
+        size = sim.queue.get_size()
+        return max(0, size - 2), size > 1
+
+    def push(self, record: tuple) -> None:
+        """Escribe un registro al búfer de salida, que no debe estar lleno.
+        El despachador lo vacía antes de cada fase y en una época terminan a lo sumo epoch clientes."""
+
+        if not self.outbound.push(record):
+            raise OverflowError('Búfer de salida lleno; aumente RING_CAPACITY o reduzca la época.')
+
+def worker(shard_ids: list[int], policy: str, quantum: int, ring_names: list[tuple], control_name: str, barrier) -> None:
+    """Proceso que avanza los cajeros indicados al ritmo del despachador.
+    Cada época tiene dos fases separadas por la barrera: ceder clientes y avanzar hasta el horizonte.
+    El control compartido guarda el horizonte y, por cajero, los clientes a ceder, los que esperan y si atiende."""
+
+    rings = [(Ring_Buffer(name=inbound), Ring_Buffer(name=outbound)) for inbound, outbound in ring_names]
+    shards = {shard_id: Shard(policy, quantum, *ring) for shard_id, ring in zip(shard_ids, rings)}
+    control_memory = shared_memory.SharedMemory(control_name)
+    control = control_memory.buf.cast('q')
+
+    while True:
+        barrier.wait()
+        horizon = control[0]
+        if horizon < 0:
+            break
+
+        for shard_id, shard in shards.items():
+            shard.give(control[1 + 3 * shard_id])
+        barrier.wait()
+
+        barrier.wait()
+        for shard_id, shard in shards.items():
+            control[2 + 3 * shard_id], control[3 + 3 * shard_id] = shard.run_epoch(horizon)
+        barrier.wait()
+
+    control.release()
+    control_memory.close()
+    for inbound, outbound in rings:
+        inbound.close()
+        outbound.close()
+
+class Farm:
+    """Despachador que reparte clientes entre cajeros y sincroniza su avance por épocas.
+    El reparto y el robo se deciden sólo con el estado al final de cada época, así que el resultado
+    no depende del número de procesos: con processes=0 se obtiene exactamente lo mismo en un solo proceso."""
+
+    def __init__(self, n_shards: int, policy: str, quantum: int, processes: int = None, epoch: int = EPOCH) -> None:
+        """n_shards: Número de cajeros.
+        policy: Política de la cola de cada cajero.
+        quantum: Capacidad de cada cajero por turno.
+        processes: Número de procesos entre los que se reparten los cajeros. 0 para no crear procesos.
+        epoch: Ticks entre sincronizaciones."""
+
+        self.n_shards = n_shards
+        self.policy = policy
+        self.quantum = quantum
+        self.processes = min(n_shards, multiprocessing.cpu_count() if processes is None else processes)
+        # Cada cajero termina a lo sumo un cliente por tick, y sus terminados de una época deben caber en su búfer de salida.
+        if not 0 < epoch <= RING_CAPACITY:
+            raise ValueError(epoch)
+        self.epoch = epoch
+        self.rings = [(Ring_Buffer(), Ring_Buffer()) for _ in range(n_shards)]
+
+    def run(self, clients: list[logic.Queue_Client], collector: stats.Stats_Collector = None) -> list[dict]:
+        """Atiende a todos los clientes y devuelve sus resultados como simulation.Simulation.results.
+        clients: Clientes a repartir, con su tiempo de llegada.
+        collector: Recolector de estadísticas en línea. Opcional."""
+
+        # Control: horizonte y, por cajero, (clientes a ceder, en espera, atendiendo).
+        control_memory = shared_memory.SharedMemory(create=True, size=8 * (1 + 3 * self.n_shards))
+        control = control_memory.buf.cast('q')
+        for i in range(len(control)):
+            control[i] = 0
+
+        processes = []
+        if self.processes > 0:
+            barrier = multiprocessing.Barrier(self.processes + 1)
+            for worker_index in range(self.processes):
+                shard_ids = list(range(worker_index, self.n_shards, self.processes))
+                names = [(self.rings[i][0].memory.name, self.rings[i][1].memory.name) for i in shard_ids]
+                process = multiprocessing.Process(target=worker, args=(shard_ids, self.policy, self.quantum, names, control_memory.name, barrier))
+                process.start()
+                processes.append(process)
+        else:
+            shards = [Shard(self.policy, self.quantum, *ring) for ring in self.rings]
+
+        pending = sorted(clients, key=logic.Queue_Client.get_arrival_time)
+        next_client = 0
+        results = []
+        horizon = 0
+
+        finished = False
+        try:
+            while len(results) < len(pending):
+                horizon += self.epoch
+                waiting = [control[2 + 3 * i] + control[3 + 3 * i] for i in range(self.n_shards)]
+
+                # Los cajeros desocupados roban la mitad de la espera del más cargado.
+                steals = []
+                for thief in range(self.n_shards):
+                    victim = max(range(self.n_shards), key=waiting.__getitem__)
+                    if waiting[thief] == 0 and waiting[victim] > STEAL_THRESHOLD:
+                        n_clients = waiting[victim] // 2
+                        steals.append((victim, thief, n_clients))
+                        waiting[victim] -= n_clients
+                        waiting[thief] += n_clients
+
+                for i in range(self.n_shards):
+                    control[1 + 3 * i] = sum(n_clients for victim, _, n_clients in steals if victim == i)
+                control[0] = horizon
+
+                if processes:
+                    barrier.wait()
+                    barrier.wait()
+                else:
+                    for i, shard in enumerate(shards):
+                        shard.give(control[1 + 3 * i])
+
+                # Los clientes cedidos pasan a los cajeros que los robaron antes de avanzar.
+                migrations = {victim: outbound.pop_all() for victim, (_, outbound) in enumerate(self.rings)}
+                for victim, thief, n_clients in steals:
+                    for record in migrations[victim][:n_clients]:
+                        self.__push(thief, record)
+                    migrations[victim] = migrations[victim][n_clients:]
+
+                # Cada llegada de la época va al cajero con menos clientes.
+                while next_client < len(pending) and pending[next_client].get_arrival_time() <= horizon:
+                    client = pending[next_client]
+                    shard = min(range(self.n_shards), key=waiting.__getitem__)
+                    self.__push(shard, (ARRIVAL, client.get_id(), client.get_number_of_requests(), client.get_number_of_requests(),
+                                        client.get_arrival_time(), encode(client.get_priority()), NULL, NULL))
+                    waiting[shard] += 1
+                    next_client += 1
+
+                if processes:
+                    barrier.wait()
+                    barrier.wait()
+                else:
+                    for i, shard in enumerate(shards):
+                        control[2 + 3 * i], control[3 + 3 * i] = shard.run_epoch(horizon)
+
+                for _, outbound in self.rings:
+                    for record in outbound.pop_all():
+                        results.append(self.__result(record, collector))
+            finished = True
+        finally:
+            if processes and finished:
+                control[0] = -1
+                barrier.wait()
+            for process in processes:
+                if not finished:
+                    process.terminate()
+                process.join()
+
+            control.release()
+            control_memory.close()
+            control_memory.unlink()
+
+        return sorted(results, key=lambda result: result['id'])
+
+    def __push(self, shard: int, record: tuple) -> None:
+        """Escribe un registro al búfer de entrada de un cajero, que no debe estar lleno."""
+
+        if not self.rings[shard][0].push(record):
+            raise OverflowError('Búfer de entrada lleno; aumente RING_CAPACITY o reduzca la época.')
+
+    @staticmethod
+    def __result(record: tuple, collector: stats.Stats_Collector) -> dict:
+        """Convierte un registro de cliente terminado en su resultado."""
+
+        _, id_client, _, burst, arrival, priority, start, final = record
+        if collector is not None:
+            collector.add_client(final - arrival - burst, final - arrival, start - arrival)
+
+        return {
+            'id': id_client,
+            'arrival': arrival,
+            'burst': burst,
+            'priority': decode(priority),
+            'start': start,
+            'final': final,
+            'turnaround': final - arrival,
+            'waiting': final - arrival - burst,
+            'response': start - arrival
+        }
+
+    def close(self) -> None:
+        """Elimina los búferes compartidos."""
+
+        for inbound, outbound in self.rings:
+            inbound.close(True)
+            outbound.close(True)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--shards', type=int, default=8)
+    parser.add_argument('--processes', type=int, default=None, help='0 para correr todos los cajeros en este proceso.')
+    parser.add_argument('--policy', choices=simulation.POLICIES, default='SRTF')
+    parser.add_argument('--quantum', type=int, default=0)
+    parser.add_argument('--clients', type=int, default=100000)
+    parser.add_argument('--load', type=float, default=0.9, help='Factor de carga por cajero.')
+    parser.add_argument('--epoch', type=int, default=EPOCH)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    clients = simulation.generate_clients(args.clients, args.load * args.shards, 'uniform', args.policy == 'Priority', args.seed)
+    farm = Farm(args.shards, args.policy, args.quantum, args.processes, args.epoch)
+    start = time.perf_counter()
+    try:
+        results = farm.run(clients)
+    finally:
+        farm.close()
+
+    print(f'{len(results)} clientes en {time.perf_counter() - start:.2f} s')
+    print(simulation.summarize(results))
@@ -0,0 +1,134 @@
+"""Camino rápido vectorizado con NumPy para colas FIFO que atienden a cada cliente hasta terminar."""
+
+import argparse, time
+import numpy
+import logic, simulation
+
+# Mismas distribuciones que simulation.BURST_DISTRIBUTIONS, muestreadas en bloque.
+BURST_SAMPLERS = {
+    'uniform': lambda rng, n: rng.integers(1, 16, n),
+    'exponential': lambda rng, n: 1 + numpy.floor(rng.exponential(7.5, n)).astype(numpy.int64),
+    'bimodal': lambda rng, n: numpy.where(rng.random(n) < 0.8, rng.integers(1, 5, n), rng.integers(20, 41, n)),
+}
+
+def lindley(arrivals, bursts) -> dict:
+    """Devuelve el comienzo, final, retorno y espera de cada cliente de una cola FIFO con capacidad 0.
+    Por la recursión de Lindley, final_i = max(llegada_i, final_{i-1}) + ráfaga_i, que desenrollada es
+    final_i = C_i + max_{j <= i}(llegada_j - C_{j-1}), donde C es la suma acumulada de las ráfagas.
+    Los clientes con la misma llegada se atienden en el orden dado, igual que en simulation.Simulation.
+    arrivals: Ticks de llegada de cada cliente.
+    bursts: Ráfaga de cada cliente."""
+
+    arrivals = numpy.asarray(arrivals, numpy.int64)
+    bursts = numpy.asarray(bursts, numpy.int64)
+
+    # Ordenar por llegada sólo si hace falta; las trazas suelen venir ordenadas.
+    order = None
+    if arrivals.size and numpy.any(arrivals[1:] < arrivals[:-1]):
+        order = numpy.argsort(arrivals, kind='stable')
+        arrivals = arrivals[order]
+        bursts = bursts[order]
+
+    served = numpy.cumsum(bursts)
+    final = served + numpy.maximum.accumulate(arrivals - (served - bursts))
+    start = final - bursts
+    times = {'start': start, 'final': final, 'turnaround': final - arrivals, 'waiting': start - arrivals}
+
+    if order is not None:
+        for key, values in times.items():
+            unsorted = numpy.empty_like(values)
+            unsorted[order] = values
+            times[key] = unsorted
+
+    return times
+
+def summarize(times: dict) -> dict:
+    """Devuelve el mismo resumen que simulation.summarize a partir de los arreglos de lindley."""
+
+    summary = {'clients': int(times['waiting'].size)}
+    for key, name in (('waiting', 'wait'), ('turnaround', 'turnaround')):
+        values = times[key]
+        if values.size:
+            summary[f'mean_{name}'] = float(values.mean())
+            summary[f'p95_{name}'], summary[f'p99_{name}'] = (float(value) for value in numpy.percentile(values, (95, 99)))
+        else:
+            summary[f'mean_{name}'] = summary[f'p95_{name}'] = summary[f'p99_{name}'] = None
+
+    return summary
+
+def results(clients: list[logic.Queue_Client]) -> list[dict]:
+    """Devuelve los tiempos de cada cliente en el formato de simulation.Simulation.results.
+    clients: Clientes sin prioridad con su tiempo de llegada."""
+
+    arrivals = numpy.fromiter((client.get_arrival_time() for client in clients), numpy.int64, len(clients))
+    bursts = numpy.fromiter((client.get_number_of_requests() for client in clients), numpy.int64, len(clients))
+    times = lindley(arrivals, bursts)
+
+    return [
+        {
+            'id': client.get_id(),
+            'arrival': arrival,
+            'burst': burst,
+            'priority': None,
+            'start': start,
+            'final': final,
+            'turnaround': final - arrival,
+            'waiting': start - arrival,
+            'response': start - arrival
+        }
+        for client, arrival, burst, start, final in zip(
+            clients, arrivals.tolist(), bursts.tolist(), times['start'].tolist(), times['final'].tolist()
+        )
+    ]
+
+def generate(n_clients: int, load: float, distribution: str = 'uniform', seed: int = None) -> tuple:
+    """Genera arreglos de llegadas de Poisson y ráfagas como simulation.generate_clients, sin crear clientes.
+    Devuelve (llegadas, ráfagas)."""
+
+    if load <= 0:
+        raise ValueError
+
+    rng = numpy.random.default_rng(seed)
+    arrivals = 1 + numpy.floor(numpy.cumsum(rng.exponential(simulation.BURST_MEAN / load, n_clients))).astype(numpy.int64)
+    return arrivals, BURST_SAMPLERS[distribution](rng, n_clients).astype(numpy.int64)
+
+def validate(n_clients: int, load: float, distribution: str = 'uniform', seed: int = None) -> None:
+    """Compara el camino rápido con la simulación tick por tick y lanza AssertionError si difieren."""
+
+    clients = simulation.generate_clients(n_clients, load, distribution, False, seed)
+    sim = simulation.Simulation(simulation.create_queue('FIFO', 0), clients)
+    sim.run()
+
+    expected = sorted(sim.results(), key=lambda result: result['id'])
+    # Queue_Client cambia al atenderse, así que se generan de nuevo.
+    actual = results(simulation.generate_clients(n_clients, load, distribution, False, seed))
+    for old, new in zip(expected, actual):
+        if old != new:
+            raise AssertionError(f'{old} != {new}')
+
+    if len(expected) != len(actual):
+        raise AssertionError(f'{len(expected)} != {len(actual)} clientes')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=10**7)
+    parser.add_argument('--load', type=float, default=0.9)
+    parser.add_argument('--distribution', choices=tuple(BURST_SAMPLERS), default='uniform')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--validate', type=int, default=10**4, help='Clientes para comparar con la simulación tick por tick. 0 para omitir.')
+    args = parser.parse_args()
+
+    if args.validate:
+        start = time.perf_counter()
+        validate(args.validate, args.load, args.distribution, args.seed)
+        per_client = (time.perf_counter() - start) / args.validate
+        print(f'Validado contra la simulación con {args.validate} clientes ({per_client * 1e6:.1f} µs por cliente)')
+
+    arrivals, bursts = generate(args.clients, args.load, args.distribution, args.seed)
+    start = time.perf_counter()
+    times = lindley(arrivals, bursts)
+    elapsed = time.perf_counter() - start
+    print(f'{args.clients} clientes en {elapsed:.3f} s ({elapsed / args.clients * 1e9:.1f} ns por cliente)')
+    if args.validate:
+        print(f'Aceleración estimada: {per_client * args.clients / elapsed:.0f}x')
+    print(summarize(times))
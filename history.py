@@ -0,0 +1,191 @@
+"""Historial de la simulación guardado en archivos columnares mapeados en memoria."""
+
+import json, mmap, os
+
+# Valor guardado en lugar de None en las columnas enteras. Las categóricas guardan -1.
+NULL = -2**63
+
+class Column_File:
+    """Tabla de solo agregado guardada en una carpeta, con un archivo de enteros de 64 bits por columna.
+    Las columnas categóricas guardan el código de cada valor y sus etiquetas en meta.json."""
+
+    def __init__(self, directory: str, columns: tuple[str, ...], categorical: tuple[str, ...] = (), chunk_rows: int = 65536) -> None:
+        """Crea la tabla en la carpeta indicada, reemplazando la que hubiera.
+        directory: Carpeta de la tabla.
+        columns: Nombres de las columnas.
+        categorical: Columnas cuyos valores no son enteros, como cadenas.
+        chunk_rows: Número de filas en que crecen los archivos cada vez que se llenan."""
+
+        self.directory = directory
+        self.columns = tuple(columns)
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self.capacity = 0
+        self.categories = {column: [] for column in categorical}
+        self.codes = {column: {} for column in categorical}
+
+        os.makedirs(directory, exist_ok=True)
+        self.files = [open(os.path.join(directory, f'{i}.i8'), 'w+b') for i in range(len(self.columns))]
+        self.maps: list[mmap.mmap] = []
+        self.views: list[memoryview] = []
+        self.__grow()
+        self.flush()
+
+    def __grow(self) -> None:
+        """Agranda los archivos y los vuelve a mapear."""
+
+        self.__unmap()
+        self.capacity += self.chunk_rows
+        for file in self.files:
+            file.truncate(self.capacity * 8)
+            self.maps.append(mmap.mmap(file.fileno(), self.capacity * 8))
+            self.views.append(memoryview(self.maps[-1]).cast('q'))
+
+    def __unmap(self) -> None:
+        """Libera los mapas de memoria."""
+
+        for view in self.views:
+            view.release()
+        for memory_map in self.maps:
+            memory_map.close()
+
+        self.views = []
+        self.maps = []
+
+    def __encode(self, column: str, value) -> int:
+        """Devuelve el entero que se guarda para el valor en la columna indicada."""
+
+        codes = self.codes.get(column)
+        # Pandas puede convertir None en NaN, que es distinto de sí mismo.
+        if value is None or value != value:
+            return NULL if codes is None else -1
+
+        if codes is None:
+            return int(value)
+
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.categories[column])
+            self.categories[column].append(value)
+
+        return code
+
+    def append(self, row: tuple) -> None:
+        """Agrega una fila al final de la tabla.
+        row: Un valor por columna."""
+
+        if self.rows == self.capacity:
+            self.__grow()
+
+        for view, column, value in zip(self.views, self.columns, row):
+            view[self.rows] = self.__encode(column, value)
+
+        self.rows += 1
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def flush(self) -> None:
+        """Escribe a disco las filas y metadatos para que puedan leerse con load."""
+
+        for memory_map in self.maps:
+            memory_map.flush()
+
+        with open(os.path.join(self.directory, 'meta.json'), 'w') as file:
+            json.dump({'columns': self.columns, 'rows': self.rows, 'categories': self.categories}, file)
+
+    def close(self) -> None:
+        """Escribe la tabla y recorta los archivos al número de filas."""
+
+        self.flush()
+        self.__unmap()
+        for file in self.files:
+            file.truncate(self.rows * 8)
+            file.close()
+
+class History:
+    """Historial de una simulación: filas de clientes terminados y secciones de ejecución."""
+
+    SLICE_COLUMNS = ('Proceso', 'Inicio', 'Fin')
+
+    def __init__(self, directory: str, client_columns: tuple[str, ...], categorical: tuple[str, ...] = ()) -> None:
+        """directory: Carpeta del historial.
+        client_columns: Columnas de las filas de clientes.
+        categorical: Columnas de clientes cuyos valores no son enteros."""
+
+        self.clients = Column_File(os.path.join(directory, 'clients'), client_columns, categorical)
+        self.slices = Column_File(os.path.join(directory, 'slices'), History.SLICE_COLUMNS, ('Proceso',))
+        # Sección abierta: [id, inicio, fin).
+        self.current_slice: list = None
+
+    def add_client(self, row: tuple) -> None:
+        """Guarda la fila de un cliente."""
+
+        self.clients.append(row)
+
+    def add_tick(self, id_client: str, time: int) -> None:
+        """Registra que el cliente indicado se atendió en el tick indicado.
+        Los ticks seguidos del mismo cliente se unen en una sección."""
+
+        current = self.current_slice
+        if current is not None and current[0] == id_client and current[2] == time:
+            current[2] += 1
+            return
+
+        if current is not None:
+            self.slices.append(current)
+
+        self.current_slice = [id_client, time, time + 1]
+
+    def flush(self) -> None:
+        """Escribe a disco lo guardado hasta ahora, sin la sección abierta."""
+
+        self.clients.flush()
+        self.slices.flush()
+
+    def close(self) -> None:
+        """Guarda la sección abierta y cierra los archivos."""
+
+        if self.current_slice is not None:
+            self.slices.append(self.current_slice)
+            self.current_slice = None
+
+        self.clients.close()
+        self.slices.close()
+
+def load(directory: str) -> tuple[dict, dict]:
+    """Devuelve las columnas de una tabla como arreglos de NumPy mapeados en memoria, sin copiarlos,
+    y las etiquetas de las columnas categóricas.
+    directory: Carpeta de una tabla escrita por Column_File."""
+
+    import numpy
+
+    with open(os.path.join(directory, 'meta.json')) as file:
+        meta = json.load(file)
+
+    arrays = {}
+    for i, column in enumerate(meta['columns']):
+        if meta['rows'] == 0:
+            arrays[column] = numpy.empty(0, numpy.int64)
+        else:
+            arrays[column] = numpy.memmap(os.path.join(directory, f'{i}.i8'), numpy.int64, 'r', shape=(meta['rows'],))
+
+    return arrays, meta['categories']
+
+def load_dataframe(directory: str):
+    """Devuelve una tabla escrita por Column_File como DataFrame de Pandas.
+    Las columnas enteras usan los arreglos mapeados con una máscara para los valores nulos
+    y las categóricas se reconstruyen a partir de sus códigos.
+    directory: Carpeta de la tabla."""
+
+    import pandas
+
+    arrays, categories = load(directory)
+    data = {}
+    for column, values in arrays.items():
+        if column in categories:
+            data[column] = pandas.Categorical.from_codes(values, categories[column])
+        else:
+            data[column] = pandas.arrays.IntegerArray(values, values == NULL)
+
+    return pandas.DataFrame(data, copy=False)
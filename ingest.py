@@ -0,0 +1,218 @@
+"""Servidor asyncio que recibe llegadas de clientes por un socket local."""
+
+import argparse, asyncio, heapq, itertools, json, math, random, threading
+import logic
+
+class Arrival_Buffer:
+    """Búfer acotado entre el hilo de asyncio, que agrega llegadas, y el hilo de la simulación, que las saca.
+    Cuando está lleno, el lector del socket espera, así que el emisor se frena por el control de flujo de TCP."""
+
+    def __init__(self, capacity: int) -> None:
+        """capacity: Número máximo de clientes recibidos que aún no entran a la cola."""
+
+        self.capacity = capacity
+        self.size = 0
+        self.lock = threading.Lock()
+        self.incoming: list[tuple] = []
+        # Clientes con tiempo de llegada futuro: (tiempo, orden, cliente).
+        self.scheduled: list[tuple] = []
+        self.order = itertools.count()
+        self.loop: asyncio.AbstractEventLoop = None
+        self.space: asyncio.Event = None
+
+    async def put(self, time: int, clients: list[tuple]) -> None:
+        """Agrega un lote de clientes, esperando mientras el búfer esté lleno.
+        Un lote mayor que la capacidad entra en cuanto el búfer se vacía.
+        time: Tiempo simulado de llegada o None para llegar en cuanto se saquen.
+        clients: Clientes (id, solicitudes, prioridad)."""
+
+        if self.space is None:
+            self.loop = asyncio.get_running_loop()
+            self.space = asyncio.Event()
+
+        while True:
+            with self.lock:
+                if self.size == 0 or self.size + len(clients) <= self.capacity:
+                    self.incoming.append((time, clients))
+                    self.size += len(clients)
+                    return
+
+                self.space.clear()
+
+            await self.space.wait()
+
+    def pop_due(self, time: int, limit: int) -> list[tuple]:
+        """Saca hasta limit clientes cuyo tiempo de llegada ya pasó. Se llama desde el hilo de la simulación.
+        Como en la interfaz, un cliente agregado en el tiempo t llega en el tick t + 1.
+        time: Tiempo simulado actual.
+        limit: Número máximo de clientes a sacar."""
+
+        with self.lock:
+            incoming = self.incoming
+            self.incoming = []
+
+        for arrival, clients in incoming:
+            for client in clients:
+                heapq.heappush(self.scheduled, (time if arrival is None else arrival, next(self.order), client))
+
+        due = []
+        while self.scheduled and len(due) < limit and self.scheduled[0][0] <= time:
+            due.append(heapq.heappop(self.scheduled)[2])
+
+        if due:
+            with self.lock:
+                self.size -= len(due)
+            if self.loop is not None:
+                self.loop.call_soon_threadsafe(self.space.set)
+
+        return due
+
+def parse_batch(line: bytes) -> tuple[int, list[tuple]]:
+    """Interpreta una línea JSON con un lote de llegadas.
+    La línea es {"time": <tick o null>, "clients": [...]}, donde cada cliente es [id, solicitudes, prioridad]
+    o {"id": ..., "requests": ..., "priority": ...}. La prioridad es opcional."""
+
+    message = json.loads(line)
+    clients = []
+    for client in message['clients']:
+        if isinstance(client, dict):
+            client = (client['id'], client['requests'], client.get('priority'))
+        elif len(client) == 2:
+            client = (client[0], client[1], None)
+
+        if int(client[1]) <= 0:
+            raise ValueError(client)
+
+        clients.append((str(client[0]), int(client[1]), None if client[2] is None else int(client[2])))
+
+    return message.get('time'), clients
+
+class Ingest_Server:
+    """Servidor en un hilo propio que escucha en TCP o en un socket Unix y llena un Arrival_Buffer."""
+
+    def __init__(self, address, capacity: int) -> None:
+        """address: (host, puerto) para TCP o una ruta para un socket Unix.
+        capacity: Capacidad del búfer de llegadas."""
+
+        self.address = address
+        self.buffer = Arrival_Buffer(capacity)
+        self.received = 0
+        self.rejected = 0
+        # Llegadas omitidas por tener el id de un cliente que la simulación ya tiene.
+        self.duplicates = 0
+        self.ready = threading.Event()
+        # Error del hilo del servidor, por ejemplo si la dirección ya está en uso.
+        self.error: Exception = None
+        self.thread = threading.Thread(target=self.__run, daemon=True)
+
+    def start(self) -> None:
+        """Inicia el servidor y espera a que esté escuchando. Lanza el error del hilo si no pudo escuchar."""
+
+        self.thread.start()
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    def admit(self, sim, policy: str, rng: random.Random, max_clients: int, slack: float = None) -> int:
+        """Agrega a una simulation.Simulation las llegadas que tocan en su tiempo actual.
+        Con Priority, las llegadas sin prioridad reciben una al azar entre 1 y 5, como en session.Session.ingest;
+        con las demás políticas la prioridad se descarta. Con slack, cada cliente recibe un plazo como en
+        simulation.generate_clients. Las llegadas con el id de un cliente que la simulación ya tiene, o repetido
+        en el lote, se omiten y se cuentan en duplicates, pues sobrescribirían su registro.
+        sim: Simulación a la que se agregan los clientes.
+        policy: Política de la cola de la simulación.
+        rng: Generador de las prioridades que faltan.
+        max_clients: Número máximo de llegadas a sacar del búfer.
+        slack: Plazo en veces la ráfaga, para las políticas por plazo. None para clientes sin plazo.
+        Devuelve el número de llegadas sacadas del búfer, incluidas las omitidas."""
+
+        due = self.buffer.pop_due(sim.time, max_clients)
+        clients = []
+        ids = set()
+        for id_client, n_requests, priority in due:
+            if sim.has_client(id_client) or id_client in ids:
+                self.duplicates += 1
+                continue
+
+            ids.add(id_client)
+            if policy != 'Priority':
+                priority = None
+            elif priority is None:
+                priority = rng.randint(1, 5)
+            # La simulación registra la llegada en el siguiente tick.
+            deadline = sim.time + 1 + math.ceil(slack * n_requests) if slack is not None else None
+            clients.append(logic.Queue_Client(id_client, n_requests, sim.time, priority, deadline))
+
+        if clients:
+            sim.add_clients(clients)
+        return len(due)
+
+    def __run(self) -> None:
+        try:
+            asyncio.run(self.__serve())
+        except Exception as error:
+            self.error = error
+        finally:
+            # Para que start no espere para siempre si el servidor no llegó a escuchar.
+            self.ready.set()
+
+    async def __serve(self) -> None:
+        if isinstance(self.address, str):
+            server = await asyncio.start_unix_server(self.__handle, self.address)
+        else:
+            server = await asyncio.start_server(self.__handle, *self.address)
+
+        self.ready.set()
+        async with server:
+            await server.serve_forever()
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Lee lotes de una conexión hasta que se cierre."""
+
+        try:
+            while line := await reader.readline():
+                try:
+                    time, clients = parse_batch(line)
+                except (ValueError, KeyError, TypeError, IndexError):
+                    self.rejected += 1
+                    continue
+
+                self.received += len(clients)
+                await self.buffer.put(time, clients)
+        finally:
+            writer.close()
+
+if __name__ == '__main__':
+    import time as clock
+    import params, simulation, stats
+
+    parser = argparse.ArgumentParser(description='Simula sin interfaz gráfica con llegadas recibidas por el socket.')
+    parser.add_argument('--policy', choices=simulation.POLICIES, default='SRTF')
+    parser.add_argument('--quantum', type=int, default=0)
+    parser.add_argument('--unix', help='Ruta de un socket Unix en lugar de TCP.')
+    parser.add_argument('--ticks-per-second', type=float, default=None, help='Por defecto, tan rápido como sea posible.')
+    parser.add_argument('--seed', type=int, default=None, help='Semilla de las prioridades que faltan en las llegadas.')
+    args = parser.parse_args()
+
+    server = Ingest_Server(args.unix or params.INGEST_ADDRESS, params.INGEST_CAPACITY)
+    server.start()
+
+    collector = stats.Stats_Collector()
+    sim = simulation.Simulation(simulation.create_queue(args.policy, args.quantum), collector=collector)
+    rng = random.Random(args.seed)
+    last_report = clock.monotonic()
+    while True:
+        due = server.admit(sim, args.policy, rng, params.INGEST_MAX_PER_TICK)
+
+        # Sin clientes el tiempo no avanza, salvo que haya llegadas programadas.
+        if not due and sim.queue.get_size() <= 1 and not server.buffer.scheduled:
+            clock.sleep(0.001)
+            continue
+
+        sim.step()
+        if args.ticks_per_second:
+            clock.sleep(1 / args.ticks_per_second)
+
+        if clock.monotonic() - last_report >= 1:
+            last_report = clock.monotonic()
+            print(f'Tiempo {sim.time} · Recibidos {server.received} · Repetidos {server.duplicates} · En cola {sim.queue.get_size() - 1} · {collector}', flush=True)
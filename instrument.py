@@ -0,0 +1,144 @@
+"""Instrumentación de las fases de cada tick y cuadro de la simulación."""
+
+import argparse, contextlib, json, os, time
+from collections import deque
+
+class Profiler:
+    """Mide el tiempo de fases con nombre y lleva contadores.
+    Si está desactivado, sus métodos no hacen nada para costar casi cero."""
+
+    _NULL_PHASE = contextlib.nullcontext()
+
+    class __Phase:
+        """Contexto que mide el tiempo de una fase."""
+
+        __slots__ = ('profiler', 'name', 'start')
+
+        def __init__(self, profiler, name: str) -> None:
+            self.profiler = profiler
+            self.name = name
+
+        def __enter__(self) -> None:
+            self.start = time.perf_counter()
+
+        def __exit__(self, *exc) -> None:
+            self.profiler.add_time(self.name, self.start, time.perf_counter())
+
+    def __init__(self, enabled: bool = True, max_events: int = 100000) -> None:
+        """enabled: Si es falso, no se mide nada.
+        max_events: Número de eventos más recientes guardados para el volcado."""
+
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        # Por fase: [llamadas, segundos].
+        self.totals: dict[str, list] = {}
+        self.counters: dict[str, int] = {}
+        # Eventos (nombre, inicio, duración) en segundos desde el origen.
+        self.events: deque[tuple] = deque(maxlen=max_events)
+        self.counter_events: deque[tuple] = deque(maxlen=max_events)
+
+        self.frame_start = self.origin
+        self.frame_phases: dict[str, float] = {}
+        self.last_frame: dict[str, float] = {}
+        self.last_frame_time = 0.0
+
+    def phase(self, name: str):
+        """Devuelve un contexto que mide el tiempo de la fase indicada.
+        name: Nombre de la fase."""
+
+        if not self.enabled:
+            return Profiler._NULL_PHASE
+
+        return Profiler.__Phase(self, name)
+
+    def add_time(self, name: str, start: float, end: float) -> None:
+        """Registra una medición de la fase indicada.
+        start: Tiempo de inicio según time.perf_counter.
+        end: Tiempo de fin según time.perf_counter."""
+
+        elapsed = end - start
+        total = self.totals.get(name)
+        if total is None:
+            self.totals[name] = [1, elapsed]
+        else:
+            total[0] += 1
+            total[1] += elapsed
+
+        self.frame_phases[name] = self.frame_phases.get(name, 0.0) + elapsed
+        self.events.append((name, start - self.origin, elapsed))
+
+    def count(self, name: str, quantity: int = 1) -> None:
+        """Aumenta el contador indicado.
+        name: Nombre del contador.
+        quantity: Cantidad a sumar."""
+
+        if not self.enabled:
+            return
+
+        self.counters[name] = self.counters.get(name, 0) + quantity
+        self.counter_events.append((name, time.perf_counter() - self.origin, self.counters[name]))
+
+    def frame(self) -> None:
+        """Marca el final de un cuadro y guarda el desglose de sus fases."""
+
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        self.last_frame = self.frame_phases
+        self.last_frame_time = now - self.frame_start
+        self.frame_phases = {}
+        self.frame_start = now
+
+    def summary(self) -> dict:
+        """Devuelve los totales por fase y los contadores."""
+
+        return {
+            'phases': {name: {'calls': calls, 'seconds': seconds} for name, (calls, seconds) in self.totals.items()},
+            'counters': dict(self.counters)
+        }
+
+    def dump(self, path: str) -> None:
+        """Escribe los eventos en formato Trace Event de Chrome, legible en chrome://tracing o Perfetto.
+        path: Archivo JSON a escribir."""
+
+        pid = os.getpid()
+        trace_events = [
+            {'name': name, 'ph': 'X', 'ts': start * 1e6, 'dur': elapsed * 1e6, 'pid': pid, 'tid': 0}
+            for name, start, elapsed in self.events
+        ]
+        trace_events += [
+            {'name': name, 'ph': 'C', 'ts': instant * 1e6, 'pid': pid, 'args': {name: value}}
+            for name, instant, value in self.counter_events
+        ]
+
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms', 'otherData': self.summary()}, file)
+
+# Perfilador compartido por defecto, desactivado.
+DISABLED = Profiler(False)
+
+if __name__ == '__main__':
+    import simulation
+
+    parser = argparse.ArgumentParser(description='Simula sin interfaz gráfica y vuelca el perfil de cada fase.')
+    parser.add_argument('--policy', choices=simulation.POLICIES, default='SRTF')
+    parser.add_argument('--quantum', type=int, default=0)
+    parser.add_argument('--clients', type=int, default=10000)
+    parser.add_argument('--load', type=float, default=0.9)
+    parser.add_argument('--distribution', choices=tuple(simulation.BURST_DISTRIBUTIONS), default='uniform')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='trace.json')
+    args = parser.parse_args()
+
+    profiler = Profiler()
+    clients = simulation.generate_clients(args.clients, args.load, args.distribution, args.policy == 'Priority', args.seed)
+    sim = simulation.Simulation(simulation.create_queue(args.policy, args.quantum), clients, profiler)
+    with profiler.phase('run'):
+        sim.run()
+
+    profiler.dump(args.output)
+    for name, total in sorted(profiler.summary()['phases'].items(), key=lambda item: -item[1]['seconds']):
+        print(f'{name:12} {total["calls"]:>10} {total["seconds"] * 1000:12.3f} ms')
+    for name, value in profiler.counters.items():
+        print(f'{name:12} {value:>10}')
@@ -0,0 +1,63 @@
+"""Generador local de llegadas que las envía al servidor de ingest.py."""
+
+import argparse, asyncio, json, random, time
+import params
+
+async def generate(reader_writer, rate: float, batch: int, count: int, priorities: bool, start_time: int, seed: int) -> None:
+    """Envía count clientes en lotes de batch, a rate clientes por segundo o tan rápido como lo permita el servidor.
+    reader_writer: Conexión abierta con el servidor.
+    rate: Clientes por segundo. 0 para no limitar.
+    batch: Clientes por mensaje.
+    count: Número total de clientes.
+    priorities: Si es verdadero, cada cliente lleva una prioridad entre 1 y 5.
+    start_time: Si no es None, los lotes llevan tiempos simulados crecientes desde este.
+    seed: Semilla de las ráfagas y prioridades."""
+
+    _, writer = reader_writer
+    rng = random.Random(seed)
+    started = time.monotonic()
+    sent = 0
+    sim_time = start_time
+
+    while sent < count:
+        size = min(batch, count - sent)
+        clients = [[f'L{sent + i}', rng.randint(1, 15), rng.randint(1, 5) if priorities else None] for i in range(size)]
+        writer.write(json.dumps({'time': sim_time, 'clients': clients}).encode() + b'\n')
+        # Si el servidor está lleno, drain espera: ésta es la contrapresión.
+        await writer.drain()
+        sent += size
+        if sim_time is not None:
+            sim_time += 1
+
+        if rate:
+            delay = started + sent / rate - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    writer.close()
+    await writer.wait_closed()
+    elapsed = time.monotonic() - started
+    print(f'{sent} clientes en {elapsed:.2f} s ({sent / elapsed:.0f} clientes/s)')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default=params.INGEST_ADDRESS[0])
+    parser.add_argument('--port', type=int, default=params.INGEST_ADDRESS[1])
+    parser.add_argument('--unix', help='Ruta de un socket Unix en lugar de TCP.')
+    parser.add_argument('--rate', type=float, default=0, help='Clientes por segundo. 0 para no limitar.')
+    parser.add_argument('--batch', type=int, default=500)
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--priorities', action='store_true')
+    parser.add_argument('--start-time', type=int, default=None, help='Tiempo simulado del primer lote; cada lote llega un tick después.')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    async def main() -> None:
+        if args.unix:
+            connection = await asyncio.open_unix_connection(args.unix)
+        else:
+            connection = await asyncio.open_connection(args.host, args.port)
+
+        await generate(connection, args.rate, args.batch, args.count, args.priorities, args.start_time, args.seed)
+
+    asyncio.run(main())
@@ -1,5 +1,7 @@
 """Módulo con las estructuras de datos para la simulación de una cola de cajero."""
 
+import argparse, bisect, heapq, threading
+from collections import deque
 from typing import TypeVar, Generic
 
 T = TypeVar('T')
@@ -42,17 +44,27 @@ class Queue(Generic[T]):
 
         return self.__back.data
 
+    def __node_at(self, pos: int):
+        """Devuelve el nodo en la posición indicada recorriendo la cola por el lado más cercano.
+        Como la cola es circular, la posición igual al tamaño es el frente."""
+
+        aux_node = self.__front
+        if pos <= self.__size // 2:
+            for _ in range(pos):
+                aux_node = aux_node.next
+        else:
+            for _ in range(self.__size - pos):
+                aux_node = aux_node.prev
+
+        return aux_node
+
     def get(self, pos: int) -> T:
         """Devuelve el elemento de la cola en la posición indicada."""
 
         if not 0 <= pos < self.__size:
             raise IndexError
 
-        aux_node = self.__front
-        for _ in range(pos):
-            aux_node = aux_node.next
-
-        return aux_node.data
+        return self.__node_at(pos).data
 
     def get_size(self) -> int:
         """Devuelve número de elementos en la cola."""
@@ -104,18 +116,16 @@ class Queue(Generic[T]):
         if pos is None:
             pos = self.__size
 
-        self.__size += 1
-
         if self.__front is None:
+            self.__size += 1
             self.__front = Queue.__Node(data)
             self.__front.prev = self.__front
             self.__front.next = self.__front
             self.__back = self.__front
             return
 
-        aux_node = self.__front
-        for _ in range(pos):
-            aux_node = aux_node.next
+        aux_node = self.__node_at(pos)
+        self.__size += 1
 
         new_node = Queue.__Node(data, aux_node.prev, aux_node)
         aux_node.prev.next = new_node
@@ -133,9 +143,8 @@ class Queue(Generic[T]):
         if not 0 <= pos < self.__size:
             raise IndexError
 
-        self.__size -= 1
-
         if pos == 0:
+            self.__size -= 1
             out = self.__front.data
             if self.__size == 0:
                 self.__front = self.__back = None
@@ -146,10 +155,8 @@ class Queue(Generic[T]):
 
             return out
 
-        aux_node = self.__front
-        for _ in range(pos):
-            aux_node = aux_node.next
-
+        aux_node = self.__node_at(pos)
+        self.__size -= 1
         out = aux_node.data
         if aux_node is self.__back:
             self.__back = aux_node.prev
@@ -180,12 +187,13 @@ class Queue(Generic[T]):
 class Queue_Client:
     """Representa un cliente que espera en una cola de cajero."""
     
-    def __init__(self, id_client: str, n_requests: int, arrival_time: int, priority: int = None):
+    def __init__(self, id_client: str, n_requests: int, arrival_time: int, priority: int = None, deadline: int = None):
         """Crea el cliente con la información correspondiente.
         id_client: Id del cliente.
         n_requests: Número de solicitudes del cliente.
         arrival_time: Momento en el que llega el cliente.
-        priority: Prioridad del cliente."""
+        priority: Prioridad del cliente.
+        deadline: Tick en el que el cliente debe haber terminado, como el tiempo final de la tabla."""
 
         if n_requests < 0:
             raise ValueError
@@ -195,6 +203,7 @@ class Queue_Client:
         self.__arrival_time = arrival_time
         self.__current_time = arrival_time
         self.__priority = priority
+        self.__deadline = deadline
 
     def get_id(self) -> str:
         """Devuelve el id del cliente."""
@@ -233,6 +242,11 @@ class Queue_Client:
         """Devuelve la prioridad del cliente."""
 
         return self.__priority
+
+    def get_deadline(self):
+        """Devuelve el tick en el que el cliente debe haber terminado o None si no tiene plazo."""
+
+        return self.__deadline
     
     def get_final_time(self):
         """Devuelve el tiempo en el que el cliente terminó o -1 si no ha terminado."""
@@ -282,6 +296,13 @@ class FIFO_Server_Queue(Queue[Queue_Client]):
         
         super().enqueue(client)
 
+    def enqueue_many(self, clients: list[Queue_Client]) -> None:
+        """Agrega varios clientes en el mismo orden en que los dejaría enqueue llamado con cada uno.
+        clients: Clientes a agregar a la cola."""
+
+        for client in clients:
+            self.enqueue(client)
+
     def dequeue(self) -> Queue_Client:
         """Atiende al cliente en la segunda posición de la cola.
         Si el cliente ha terminado todas sus solicitudes, lo saca de la cola y lo devuelve. Si no, devuelve None."""
@@ -308,6 +329,12 @@ class FIFO_Server_Queue(Queue[Queue_Client]):
 
         return self.__current_service
 
+    def set_time(self, time: int) -> None:
+        """Indica el tick en que se atiende al siguiente cliente, que con r solicitudes restantes terminaría en time + r.
+        Sólo lo usan las políticas que dependen del tiempo, como EDF_Server_Queue."""
+
+        pass
+
     def remove(self, queue_client: Queue_Client) -> None:
         """Elimina el cliente indicado de la lista."""
 
@@ -317,9 +344,217 @@ class FIFO_Server_Queue(Queue[Queue_Client]):
 
         super().dequeue(index)
 
+    def remove_last(self, n_clients: int) -> list[Queue_Client]:
+        """Saca de una vez hasta n_clients clientes en espera desde el final de la cola, sin sacar al que está en atención.
+        Cuesta O(n_clients), pues sólo desengancha la cola de la lista. Devuelve los clientes del último al primero."""
+
+        n_clients = max(0, min(n_clients, self._Queue__size - 2))
+        removed = []
+        aux_node = self._Queue__back
+        for _ in range(n_clients):
+            removed.append(aux_node.data)
+            aux_node = aux_node.prev
+
+        if removed:
+            aux_node.next = self._Queue__front
+            self._Queue__front.prev = aux_node
+            self._Queue__back = aux_node
+            self._Queue__size -= n_clients
+
+        return removed
+
     def __repr__(self) -> str:
         return f'{type(self).__name__}({str(list(self))[1:-1]})'
 
+class Concurrent_FIFO_Server_Queue(FIFO_Server_Queue):
+    """Representa una cola donde al frente hay un cajero y varios hilos productores agregan clientes
+    mientras un hilo servidor atiende.
+    Cada productor agrega a un búfer propio sin bloquear a los demás, y el servidor une los búferes
+    a la cola antes de leerla o atenderla. Unir, atender, leer y recorrer la lista toman un candado,
+    así que otros hilos pueden leer la cola mientras se atiende; enqueue nunca lo toma.
+    El recorrido devuelve una copia, sin el cursor compartido de Queue."""
+
+    def __init__(self, capacity: int, *args: Queue_Client):
+        """capacity: Número de solicitudes que el cajero puede atender por turno.
+                     Si es exactamente 0, se atenderá hasta terminar.
+        args: Clientes en la cola."""
+
+        self.__local = threading.local()
+        self.__buffers: list[deque] = []
+        self.__register_lock = threading.Lock()
+        # Protege la lista enlazada. Reentrante, pues dequeue y remove vuelven a entrar por enqueue y __iter__.
+        self.__lock = threading.RLock()
+        self.__serving_thread = None
+
+        super().__init__(capacity)
+        for arg in args:
+            super().enqueue(arg)
+
+    def enqueue(self, client: Queue_Client) -> None:
+        """Agrega un cliente al búfer del hilo que llama. Entra a la cola en la siguiente unión.
+        client: Cliente a agregar a la cola."""
+
+        if type(client) is not Queue_Client:
+            raise ValueError
+
+        if client.get_priority() is not None:
+            raise ValueError
+
+        # Al atender, FIFO_Server_Queue regresa al cliente al final de la cola directamente.
+        if self.__serving_thread == threading.get_ident():
+            super().enqueue(client)
+            return
+
+        try:
+            buffer = self.__local.buffer
+        except AttributeError:
+            buffer = self.__local.buffer = deque()
+            with self.__register_lock:
+                self.__buffers.append(buffer)
+
+        # deque.append es atómico, así que los productores no comparten candados.
+        buffer.append(client)
+
+    def merge(self) -> int:
+        """Une a la cola los clientes de los búferes de los productores. Devuelve cuántos unió."""
+
+        with self.__lock:
+            return self.__merge()
+
+    def __merge(self) -> int:
+        """Une los búferes con el candado ya tomado."""
+
+        merged = 0
+        for buffer in list(self.__buffers):
+            while buffer:
+                super().enqueue(buffer.popleft())
+                merged += 1
+
+        return merged
+
+    def pending(self) -> int:
+        """Devuelve el número aproximado de clientes en los búferes que aún no se unen."""
+
+        return sum(len(buffer) for buffer in list(self.__buffers))
+
+    def dequeue(self) -> Queue_Client:
+        """Une los búferes y atiende al cliente en la segunda posición de la cola.
+        Si el cliente ha terminado todas sus solicitudes, lo saca de la cola y lo devuelve. Si no, devuelve None."""
+
+        with self.__lock:
+            self.__merge()
+            self.__serving_thread = threading.get_ident()
+            try:
+                return super().dequeue()
+            finally:
+                self.__serving_thread = None
+
+    def get(self, pos: int) -> Queue_Client:
+        """Une los búferes y devuelve el elemento de la cola en la posición indicada."""
+
+        with self.__lock:
+            self.__merge()
+            return super().get(pos)
+
+    def get_size(self) -> int:
+        """Une los búferes y devuelve el número de elementos en la cola."""
+
+        with self.__lock:
+            self.__merge()
+            return super().get_size()
+
+    def remove(self, queue_client: Queue_Client) -> None:
+        """Une los búferes y elimina el cliente indicado de la lista."""
+
+        with self.__lock:
+            self.__merge()
+            super().remove(queue_client)
+
+    def remove_last(self, n_clients: int) -> list[Queue_Client]:
+        """Une los búferes y saca hasta n_clients clientes en espera desde el final de la cola."""
+
+        with self.__lock:
+            self.__merge()
+            return super().remove_last(n_clients)
+
+    def __iter__(self):
+        with self.__lock:
+            self.__merge()
+            snapshot = []
+            aux_node = self._Queue__front
+            for _ in range(self._Queue__size):
+                snapshot.append(aux_node.data)
+                aux_node = aux_node.next
+
+        return iter(snapshot)
+
+def validate_concurrent(producers: int = 4, readers: int = 2, size: int = 20000, capacity: int = 3) -> None:
+    """Prueba de estrés de Concurrent_FIFO_Server_Queue. Lanza AssertionError si algún cliente se pierde o se duplica.
+    Varios hilos agregan size clientes mientras otros leen la cola con get_size, get y su recorrido, y el hilo
+    que llama atiende. Con capacity mayor a 1 los clientes de varias solicitudes vuelven a la cola al final del turno.
+    producers: Número de hilos que agregan clientes.
+    readers: Número de hilos que sólo leen la cola.
+    size: Número total de clientes.
+    capacity: Capacidad del cajero por turno."""
+
+    queue = Concurrent_FIFO_Server_Queue(capacity)
+    start_barrier = threading.Barrier(producers + readers + 1)
+    producing = threading.Event()
+    producing.set()
+    errors = []
+
+    def produce(producer: int) -> None:
+        start_barrier.wait()
+        for i in range(producer, size, producers):
+            queue.enqueue(Queue_Client(i, 1 + i % 7, 0))
+
+    def read() -> None:
+        start_barrier.wait()
+        try:
+            while producing.is_set():
+                snapshot = list(queue)
+                ids = [client.get_id() for client in snapshot[1:]]
+                if snapshot[:1] != ['Servidor'] or len(ids) != len(set(ids)):
+                    raise AssertionError(f'recorrido inconsistente: {len(ids)} clientes, {len(set(ids))} distintos')
+                if queue.get_size() > 1:
+                    try:
+                        queue.get(1)
+                    except IndexError:
+                        # El servidor pudo sacar al último cliente entre las dos llamadas.
+                        pass
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=produce, args=(producer,)) for producer in range(producers)]
+    threads += [threading.Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+
+    served = []
+    responses = 0
+    start_barrier.wait()
+    try:
+        while not errors:
+            if queue.get_size() > 1:
+                client = queue.dequeue()
+                responses += 1
+                if client is not None:
+                    served.append(client.get_id())
+            elif not any(thread.is_alive() for thread in threads[:producers]) and queue.pending() == 0 and queue.get_size() <= 1:
+                break
+    finally:
+        producing.clear()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+    if len(served) != size or len(set(served)) != size:
+        raise AssertionError(f'{size} clientes agregados, {len(served)} atendidos, {len(set(served))} distintos')
+    # Cada solicitud se atiende exactamente una vez.
+    if responses != sum(1 + i % 7 for i in range(size)):
+        raise AssertionError(f'{responses} solicitudes atendidas de {sum(1 + i % 7 for i in range(size))}')
+
 class Priority_Server_Queue(FIFO_Server_Queue):
     """Representa una cola donde al frente hay un cajero,
     pero los clientes son atendidos según su prioridad más baja."""
@@ -357,6 +592,50 @@ class Priority_Server_Queue(FIFO_Server_Queue):
             self._Queue__back = new_node
 
         return
+
+    def enqueue_many(self, clients: list[Queue_Client]) -> None:
+        """Añade varios clientes en una sola pasada por la cola, en el mismo orden en que los dejaría enqueue
+        llamado con cada uno. Los clientes se ordenan por prioridad de forma estable y, como ninguno va antes
+        que el primer nodo de prioridad mayor a la del anterior, cada búsqueda sigue donde terminó la anterior."""
+
+        for client in clients:
+            if type(client) is not Queue_Client:
+                raise ValueError
+
+            if client.get_priority() is None:
+                raise ValueError
+
+        aux_node = self._Queue__front.next
+        if self.get_current_service() > 0 and aux_node is not self._Queue__front:
+            # Los que irían antes del cliente en atención quedan justo detrás de él, así que con enqueue
+            # el último en agregarse queda primero.
+            behind = [client for client in clients if client.get_priority() < aux_node.data.get_priority()]
+            for client in behind:
+                self._Queue__size += 1
+                new_node = Queue._Queue__Node(client, aux_node, aux_node.next)
+                aux_node.next.prev = new_node
+                aux_node.next = new_node
+
+                if new_node.next is self._Queue__front:
+                    self._Queue__back = new_node
+
+            if behind:
+                clients = [client for client in clients if client.get_priority() >= aux_node.data.get_priority()]
+
+        for client in sorted(clients, key=Queue_Client.get_priority):
+            while aux_node is not self._Queue__front:
+                if  client.get_priority() < aux_node.data.get_priority():
+                    break
+
+                aux_node = aux_node.next
+
+            self._Queue__size += 1
+            new_node = Queue._Queue__Node(client, aux_node.prev, aux_node)
+            aux_node.prev.next = new_node
+            aux_node.prev = new_node
+
+            if aux_node is self._Queue__front:
+                self._Queue__back = new_node
         
 class SRTF_Server_Queue(FIFO_Server_Queue):
     """Representa una cola donde al frente hay un cajero,
@@ -395,4 +674,575 @@ class SRTF_Server_Queue(FIFO_Server_Queue):
             self._Queue__back = new_node
 
         return
-        
\ No newline at end of file
+
+    def enqueue_many(self, clients: list[Queue_Client]) -> None:
+        """Añade varios clientes en una sola pasada por la cola, en el mismo orden en que los dejaría enqueue
+        llamado con cada uno. Los clientes se ordenan por ráfaga restante de forma estable y, como ninguno va antes
+        que el primer nodo de ráfaga mayor a la del anterior, cada búsqueda sigue donde terminó la anterior."""
+
+        for client in clients:
+            if type(client) is not Queue_Client:
+                raise ValueError
+
+            if client.get_priority() is not None:
+                raise ValueError
+
+        aux_node = self._Queue__front.next
+        for client in sorted(clients, key=Queue_Client.get_number_of_requests):
+            while aux_node is not self._Queue__front:
+                if  client.get_number_of_requests() < aux_node.data.get_number_of_requests():
+                    break
+
+                aux_node = aux_node.next
+
+            if self.get_current_service() > 0 and aux_node is self._Queue__front.next:
+                self._FIFO_Server_Queue__current_service = 0
+
+            self._Queue__size += 1
+            new_node = Queue._Queue__Node(client, aux_node.prev, aux_node)
+            aux_node.prev.next = new_node
+            aux_node.prev = new_node
+
+            if aux_node is self._Queue__front:
+                self._Queue__back = new_node
+        
+class EDF_Server_Queue(FIFO_Server_Queue):
+    """Representa una cola donde al frente hay un cajero,
+    pero los clientes son atendidos según su plazo más cercano (earliest deadline first).
+    Los clientes en espera están en un montículo por (plazo, orden de llegada a la cola), así que agregar
+    y pasar al siguiente cliente cuestan O(log n). Sólo el cliente al frente se guarda aparte;
+    recorrer la cola o pedir otra posición ordena el montículo, y se usa sólo para mostrarla.
+    Con skip_late, los clientes que ya no pueden terminar a tiempo pasan a una fila de retrasados
+    que sólo se atiende cuando no hay clientes a tiempo, para que un retraso no provoque otros en cadena."""
+
+    def __init__(self, capacity: int, preemptive: bool = True, skip_late: bool = False, *args: Queue_Client):
+        """capacity: Número de solicitudes que el cajero puede atender por turno.
+                     Si es exactamente 0, se atenderá hasta terminar.
+        preemptive: Si es verdadero, un cliente con plazo más cercano expulsa al que está en atención.
+        skip_late: Si es verdadero, los clientes que ya no pueden terminar a tiempo se atienden al final.
+        args: Clientes en la cola."""
+
+        self.__preemptive = preemptive
+        self.__skip_late = skip_late
+        # Cliente en la posición 1 y si salió de la fila de retrasados.
+        self.__head: Queue_Client = None
+        self.__head_late = False
+        # Entradas [plazo, orden, cliente, activa]. Las eliminadas se descartan al salir del montículo.
+        self.__heap: list[list] = []
+        self.__entries: dict[Queue_Client, list] = {}
+        self.__late: deque[Queue_Client] = deque()
+        self.__order = 0
+        self.__time = 0
+        super().__init__(capacity, *args)
+
+    def __is_late(self, client: Queue_Client) -> bool:
+        """Verdadero si el cliente ya no termina a tiempo aunque se atienda sin interrupción desde el siguiente tick."""
+
+        return self.__skip_late and self.__time + client.get_number_of_requests() > client.get_deadline()
+
+    def __push(self, client: Queue_Client) -> None:
+        self.__order += 1
+        entry = [client.get_deadline(), self.__order, client, True]
+        self.__entries[client] = entry
+        heapq.heappush(self.__heap, entry)
+
+    def __demote(self, client: Queue_Client, late: bool) -> None:
+        """Regresa a la espera al cliente al frente: al principio de los retrasados si era uno de ellos."""
+
+        if late:
+            self.__late.appendleft(client)
+        else:
+            self.__push(client)
+
+    def __advance(self) -> None:
+        """Pasa al frente al cliente a tiempo con el plazo más cercano o, si no hay, al primer retrasado."""
+
+        while self.__heap:
+            deadline, _, client, active = heapq.heappop(self.__heap)
+            if not active:
+                continue
+
+            del self.__entries[client]
+            if self.__is_late(client):
+                self.__late.append(client)
+                continue
+
+            self.__head = client
+            self.__head_late = False
+            return
+
+        if self.__late:
+            self.__head = self.__late.popleft()
+            self.__head_late = True
+        else:
+            self.__head = None
+
+    def enqueue(self, client: Queue_Client) -> None:
+        """Añade al cliente a la espera o, si su plazo es más cercano que el del cliente al frente
+        y éste no ha empezado o la cola expulsa, lo coloca al frente."""
+
+        if type(client) is not Queue_Client:
+            raise ValueError
+
+        if client.get_priority() is not None or client.get_deadline() is None:
+            raise ValueError
+
+        self._Queue__size += 1
+        head = self.__head
+        if head is None:
+            self.__head = client
+            self.__head_late = self.__is_late(client)
+            return
+
+        late = self.__is_late(client)
+        earlier = not late and (self.__head_late or client.get_deadline() < head.get_deadline())
+        if earlier and (self.__preemptive or self.get_current_service() == 0):
+            self.__demote(head, self.__head_late)
+            self.__head = client
+            self.__head_late = False
+            self._FIFO_Server_Queue__current_service = 0
+            return
+
+        self.__push(client)
+
+    def enqueue_many(self, clients: list[Queue_Client]) -> None:
+        """Agrega varios clientes, cada uno en O(log n).
+        clients: Clientes a agregar a la cola."""
+
+        for client in clients:
+            self.enqueue(client)
+
+    def dequeue(self) -> Queue_Client:
+        """Atiende al cliente al frente.
+        Si el cliente ha terminado todas sus solicitudes, lo saca de la cola y lo devuelve. Si no, devuelve None."""
+
+        client = self.__head
+        if client is None:
+            raise IndexError
+
+        self.__time += 1
+        client.respond_requests(1)
+        self._FIFO_Server_Queue__current_service += 1
+        capacity = self._FIFO_Server_Queue__capacity
+        if (self.get_current_service() < capacity or capacity == 0) and not client.is_done():
+            return None
+
+        self._FIFO_Server_Queue__current_service = 0
+        late = self.__head_late
+        self.__head = None
+        if client.is_done():
+            self._Queue__size -= 1
+            self.__advance()
+            return client
+
+        # Fin del turno: regresa a la espera según su plazo, o al final de los retrasados.
+        if late:
+            self.__late.append(client)
+        else:
+            self.__push(client)
+        self.__advance()
+        return None
+
+    def set_time(self, time: int) -> None:
+        """Indica el tick en que se atiende al siguiente cliente, que con r solicitudes restantes terminaría en time + r."""
+
+        self.__time = time
+
+    def remove(self, queue_client: Queue_Client) -> None:
+        """Elimina el cliente indicado de la cola."""
+
+        if queue_client is self.__head:
+            self._FIFO_Server_Queue__current_service = 0
+            self.__head = None
+            self.__advance()
+        elif queue_client in self.__entries:
+            self.__entries.pop(queue_client)[3] = False
+        else:
+            self.__late.remove(queue_client)
+
+        self._Queue__size -= 1
+
+    def remove_last(self, n_clients: int) -> list[Queue_Client]:
+        """Saca hasta n_clients clientes en espera desde el final de la cola, sin sacar al que está en atención:
+        primero los últimos retrasados y después los de plazo más lejano, con una sola pasada por el montículo.
+        Devuelve los clientes del último al primero."""
+
+        removed = []
+        while len(removed) < n_clients and self.__late:
+            removed.append(self.__late.pop())
+
+        if len(removed) < n_clients:
+            for entry in heapq.nlargest(n_clients - len(removed), (entry for entry in self.__heap if entry[3])):
+                entry[3] = False
+                del self.__entries[entry[2]]
+                removed.append(entry[2])
+
+        self._Queue__size -= len(removed)
+        return removed
+
+    def get(self, pos: int) -> Queue_Client:
+        """Devuelve el elemento de la cola en la posición indicada. La posición 1 cuesta O(1)."""
+
+        if not 0 <= pos < self._Queue__size:
+            raise IndexError
+
+        if pos == 0:
+            return 'Servidor'
+        if pos == 1:
+            return self.__head
+
+        return list(self)[pos]
+
+    def late_count(self) -> int:
+        """Devuelve el número de clientes en la fila de retrasados, sin contar al que está al frente."""
+
+        return len(self.__late)
+
+    def __iter__(self):
+        waiting = [entry[2] for entry in sorted(entry for entry in self.__heap if entry[3])]
+        head = [self.__head] if self.__head is not None else []
+        return iter(['Servidor', *head, *waiting, *self.__late])
+
+class Timer_Wheel:
+    """Rueda de temporizadores jerárquica. Programa elementos para salir en un tick futuro.
+    Cada nivel tiene SLOTS casillas y cubre SLOTS veces más ticks que el anterior; los elementos bajan
+    de nivel cuando su casilla se alcanza, así que agregar, cancelar y avanzar un tick cuestan O(1) amortizado
+    sin importar cuántos elementos haya."""
+
+    BITS = 6
+    SLOTS = 1 << BITS
+    LEVELS = 4
+
+    def __init__(self) -> None:
+        self.time = 0
+        self.size = 0
+        self.levels = [[[] for _ in range(Timer_Wheel.SLOTS)] for _ in range(Timer_Wheel.LEVELS)]
+
+    def schedule(self, item, delay: int) -> list:
+        """Programa el elemento para salir dentro de delay ticks. Devuelve la entrada para cancelarlo.
+        item: Elemento a programar.
+        delay: Número de ticks, al menos 1."""
+
+        if delay < 1:
+            raise ValueError
+
+        # Entrada: [tick de salida, elemento, activa].
+        entry = [self.time + delay, item, True]
+        self.__insert(entry)
+        self.size += 1
+        return entry
+
+    def cancel(self, entry: list) -> None:
+        """Cancela una entrada programada. La entrada se descarta cuando su casilla se alcanza."""
+
+        if entry[2]:
+            entry[2] = False
+            self.size -= 1
+
+    def remaining(self, entry: list) -> int:
+        """Devuelve el número de ticks que faltan para que la entrada salga."""
+
+        return entry[0] - self.time
+
+    def __insert(self, entry: list) -> None:
+        """Coloca la entrada en el nivel más bajo que alcanza su tick de salida."""
+
+        delta = entry[0] - self.time
+        level = 0
+        while level < Timer_Wheel.LEVELS - 1 and delta >= 1 << Timer_Wheel.BITS * (level + 1):
+            level += 1
+
+        self.levels[level][(entry[0] >> Timer_Wheel.BITS * level) & (Timer_Wheel.SLOTS - 1)].append(entry)
+
+    def advance(self) -> list:
+        """Avanza un tick y devuelve los elementos que salen en él."""
+
+        self.time += 1
+
+        # Bajar de nivel las casillas que se alcanzan, empezando por el nivel más alto.
+        for level in range(Timer_Wheel.LEVELS - 1, 0, -1):
+            if self.time & ((1 << Timer_Wheel.BITS * level) - 1) == 0:
+                slots = self.levels[level]
+                index = (self.time >> Timer_Wheel.BITS * level) & (Timer_Wheel.SLOTS - 1)
+                entries = slots[index]
+                slots[index] = []
+                for entry in entries:
+                    if entry[2]:
+                        self.__insert(entry)
+
+        slots = self.levels[0]
+        index = self.time & (Timer_Wheel.SLOTS - 1)
+        entries = slots[index]
+        slots[index] = []
+
+        expired = []
+        for entry in entries:
+            if entry[2]:
+                entry[2] = False
+                expired.append(entry[1])
+
+        self.size -= len(expired)
+        return expired
+
+    def __len__(self) -> int:
+        return self.size
+
+class Sorted_Index:
+    """Índice ordenado de pares (valor, etiqueta) mantenido con búsqueda binaria.
+    Los valores None van al final en ambos sentidos. Agregar y quitar buscan en O(log n)
+    y los primeros k elementos se obtienen en O(k) sin volver a ordenar."""
+
+    def __init__(self) -> None:
+        self.keys: list[tuple] = []
+        # Número de claves con valor None, que están al final.
+        self.nulls = 0
+
+    @staticmethod
+    def key(value, label) -> tuple:
+        return (True, 0, label) if value is None else (False, value, label)
+
+    def add(self, value, label) -> None:
+        """Agrega el valor de la fila con la etiqueta indicada."""
+
+        bisect.insort(self.keys, Sorted_Index.key(value, label))
+        if value is None:
+            self.nulls += 1
+
+    def extend(self, pairs: list[tuple]) -> None:
+        """Agrega varios pares (valor, etiqueta) y ordena una sola vez."""
+
+        keys = [Sorted_Index.key(value, label) for value, label in pairs]
+        self.keys += keys
+        self.keys.sort()
+        self.nulls += sum(1 for key in keys if key[0])
+
+    def remove(self, value, label) -> None:
+        """Quita el valor de la fila con la etiqueta indicada, que debe estar en el índice."""
+
+        key = Sorted_Index.key(value, label)
+        position = bisect.bisect_left(self.keys, key)
+        if position == len(self.keys) or self.keys[position] != key:
+            raise KeyError(label)
+
+        del self.keys[position]
+        if value is None:
+            self.nulls -= 1
+
+    def top(self, k: int, descending: bool = False) -> list:
+        """Devuelve las etiquetas de los primeros k valores, de menor a mayor o de mayor a menor."""
+
+        if not descending:
+            return [key[2] for key in self.keys[:k]]
+
+        valued = len(self.keys) - self.nulls
+        labels = [self.keys[i][2] for i in range(valued - 1, max(-1, valued - 1 - k), -1)]
+        return labels + [key[2] for key in self.keys[valued:valued + k - len(labels)]]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+class Table_Index:
+    """Filas de una tabla con un índice ordenado por columna, para todas las filas y por estado,
+    y el número de filas en cada estado. Se actualiza fila por fila cuando cambian, así que mostrar
+    las primeras k filas ordenadas o filtradas no requiere volver a ordenar la tabla."""
+
+    def __init__(self, columns: tuple[str, ...], state_column: str) -> None:
+        """columns: Nombres de las columnas.
+        state_column: Columna con el estado de cada fila, por la que se puede filtrar."""
+
+        self.columns = tuple(columns)
+        self.state_position = self.columns.index(state_column)
+        self.rows: dict = {}
+        self.counts: dict[str, int] = {}
+        # Por (columna, estado) un índice ordenado. El estado None incluye todas las filas
+        # y la columna None ordena por etiqueta, es decir, por orden de inserción.
+        self.indexes: dict[tuple, Sorted_Index] = {}
+
+    def __index(self, column: str, state: str) -> Sorted_Index:
+        index = self.indexes.get((column, state))
+        if index is None:
+            index = self.indexes[(column, state)] = Sorted_Index()
+
+        return index
+
+    @staticmethod
+    def clean(values: tuple) -> tuple:
+        # Pandas puede convertir None en NaN, que es distinto de sí mismo.
+        return tuple(None if value is None or value != value else value for value in values)
+
+    def set_row(self, label, values: tuple) -> None:
+        """Agrega o actualiza una fila, moviendo en los índices sólo los valores que cambiaron.
+        label: Etiqueta de la fila, que se compara con las de las demás filas.
+        values: Un valor por columna."""
+
+        values = Table_Index.clean(values)
+        state = values[self.state_position]
+        old = self.rows.get(label)
+        self.rows[label] = values
+
+        if old is None:
+            self.__index(None, None).add(label, label)
+            self.__index(None, state).add(label, label)
+            for column, value in zip(self.columns, values):
+                self.__index(column, None).add(value, label)
+                self.__index(column, state).add(value, label)
+            self.counts[state] = self.counts.get(state, 0) + 1
+            return
+
+        old_state = old[self.state_position]
+        if old_state != state:
+            self.__index(None, old_state).remove(label, label)
+            self.__index(None, state).add(label, label)
+            self.counts[old_state] -= 1
+            self.counts[state] = self.counts.get(state, 0) + 1
+
+        for column, old_value, value in zip(self.columns, old, values):
+            if old_value != value:
+                self.__index(column, None).remove(old_value, label)
+                self.__index(column, None).add(value, label)
+            if old_value != value or old_state != state:
+                self.__index(column, old_state).remove(old_value, label)
+                self.__index(column, state).add(value, label)
+
+    def add_rows(self, rows: list[tuple]) -> None:
+        """Agrega varias filas nuevas juntando sus valores por índice y ordenando cada índice una sola vez.
+        rows: Pares (etiqueta, valores) con etiquetas que no están en la tabla."""
+
+        pairs: dict[tuple, list] = {}
+        for label, values in rows:
+            if label in self.rows:
+                raise KeyError(label)
+
+            values = Table_Index.clean(values)
+            state = values[self.state_position]
+            self.rows[label] = values
+            self.counts[state] = self.counts.get(state, 0) + 1
+
+            pairs.setdefault((None, None), []).append((label, label))
+            pairs.setdefault((None, state), []).append((label, label))
+            for column, value in zip(self.columns, values):
+                pairs.setdefault((column, None), []).append((value, label))
+                pairs.setdefault((column, state), []).append((value, label))
+
+        for (column, state), index_pairs in pairs.items():
+            self.__index(column, state).extend(index_pairs)
+
+    def remove_row(self, label) -> None:
+        """Quita una fila de la tabla y de los índices."""
+
+        values = self.rows.pop(label)
+        state = values[self.state_position]
+        self.__index(None, None).remove(label, label)
+        self.__index(None, state).remove(label, label)
+        for column, value in zip(self.columns, values):
+            self.__index(column, None).remove(value, label)
+            self.__index(column, state).remove(value, label)
+        self.counts[state] -= 1
+
+    def top(self, k: int, column: str = None, descending: bool = False, state: str = None) -> list[tuple]:
+        """Devuelve los valores de las primeras k filas.
+        k: Número de filas.
+        column: Columna por la cual ordenar. None para el orden de inserción.
+        descending: Si es verdadero, de mayor a menor.
+        state: Estado de las filas a mostrar. None para todas."""
+
+        index = self.indexes.get((column, state))
+        if index is None:
+            return []
+
+        return [self.rows[label] for label in index.top(k, descending)]
+
+    def count(self, state: str = None) -> int:
+        """Devuelve el número de filas en el estado indicado o de todas si es None."""
+
+        return len(self.rows) if state is None else self.counts.get(state, 0)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+class Client_Registry:
+    """Registro de los clientes por id con su estado: en la cola, bloqueado o terminado.
+    Saber si un id existe y consultar o cambiar su estado cuesta O(1), sin recorrer la cola.
+    Los clientes terminados se conservan para que sus ids no se repitan."""
+
+    ACTIVE = 'active'
+    BLOCKED = 'blocked'
+    FINISHED = 'finished'
+
+    def __init__(self) -> None:
+        # Por id: [cliente, estado].
+        self.clients: dict[str, list] = {}
+        self.counts = {Client_Registry.ACTIVE: 0, Client_Registry.BLOCKED: 0, Client_Registry.FINISHED: 0}
+        # Siguiente número a probar para los ids generados.
+        self.next_number = 1
+
+    def add(self, client: Queue_Client, state: str = ACTIVE) -> None:
+        """Registra un cliente nuevo. Lanza ValueError si su id ya está registrado."""
+
+        if client.get_id() in self.clients:
+            raise ValueError(client.get_id())
+
+        self.clients[client.get_id()] = [client, state]
+        self.counts[state] += 1
+
+    def add_many(self, clients: list[Queue_Client], state: str = ACTIVE) -> None:
+        """Registra varios clientes nuevos. Si algún id ya está registrado o se repite, lanza ValueError sin registrar ninguno."""
+
+        ids = {client.get_id() for client in clients}
+        if len(ids) != len(clients) or not ids.isdisjoint(self.clients):
+            raise ValueError(ids)
+
+        for client in clients:
+            self.clients[client.get_id()] = [client, state]
+        self.counts[state] += len(clients)
+
+    def get(self, id_client: str) -> Queue_Client:
+        """Devuelve el cliente con el id indicado o None."""
+
+        entry = self.clients.get(id_client)
+        return None if entry is None else entry[0]
+
+    def state(self, id_client: str) -> str:
+        """Devuelve el estado del cliente con el id indicado o None."""
+
+        entry = self.clients.get(id_client)
+        return None if entry is None else entry[1]
+
+    def set_state(self, id_client: str, state: str) -> None:
+        """Cambia el estado de un cliente registrado."""
+
+        entry = self.clients[id_client]
+        self.counts[entry[1]] -= 1
+        self.counts[state] += 1
+        entry[1] = state
+
+    def new_ids(self, n_ids: int) -> list[str]:
+        """Devuelve n_ids ids numéricos que no están registrados ni se repiten entre sí."""
+
+        ids = []
+        while len(ids) < n_ids:
+            id_client = str(self.next_number)
+            self.next_number += 1
+            if id_client not in self.clients:
+                ids.append(id_client)
+
+        return ids
+
+    def __contains__(self, id_client: str) -> bool:
+        return id_client in self.clients
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Prueba de estrés de Concurrent_FIFO_Server_Queue.')
+    parser.add_argument('--producers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=2)
+    parser.add_argument('--clients', type=int, default=20000)
+    parser.add_argument('--capacity', type=int, default=3)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    for _ in range(args.rounds):
+        validate_concurrent(args.producers, args.readers, args.clients, args.capacity)
+    print(f'{args.rounds} rondas sin clientes perdidos ni duplicados')
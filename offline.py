@@ -0,0 +1,194 @@
+"""Planificación por lotes de una traza de llegadas conocida, por eventos en lugar de tick por tick."""
+
+import argparse, heapq
+import time as clock
+from collections import deque
+import logic, simulation
+
+def schedule(policy: str, arrivals: list[int], bursts: list[int], priorities: list[int] = None, capacity: int = 0) -> tuple[list, list, list]:
+    """Calcula la planificación completa que darían las colas de servidor de logic para la política indicada.
+    El tiempo sólo se detiene en llegadas, terminaciones y fines de turno, así que cuesta O(n log n)
+    en lugar de un paso por tick. Devuelve (comienzos, finales, secciones), donde las secciones son
+    [índice, inicio, fin) en orden y los tiempos siguen las convenciones de simulation.Simulation.
+    policy: Una de las políticas en simulation.POLICIES.
+    arrivals: Tick de llegada de cada cliente, ordenados de menor a mayor.
+    bursts: Ráfaga de cada cliente.
+    priorities: Prioridad de cada cliente. Sólo para 'Priority'.
+    capacity: Número de solicitudes que el cajero atiende por turno. 0 atiende hasta terminar."""
+
+    if policy not in simulation.POLICIES:
+        raise ValueError(policy)
+
+    n_clients = len(arrivals)
+    remaining = list(bursts)
+    starts = [None] * n_clients
+    finals = [None] * n_clients
+    slices = []
+
+    # La cola es el prefijo prefix seguido de heap ordenado por (clave, orden de llegada a la cola).
+    # El prefijo guarda, en orden, a los clientes que Priority_Server_Queue coloca detrás del cliente
+    # en atención sin importar su prioridad; en SRTF y FIFO siempre está vacío.
+    prefix: deque[list] = deque()
+    heap: list[list] = []
+    order = 0
+    # Número de servicios del cliente al frente, como FIFO_Server_Queue.get_current_service.
+    service = 0
+
+    def enqueue(index: int) -> None:
+        """Agrega un cliente con las mismas reglas de desempate que el enqueue de la política."""
+
+        nonlocal order, service, prefix
+        order += 1
+        if policy == 'FIFO':
+            heapq.heappush(heap, [0, order, index])
+            return
+
+        key = priorities[index] if policy == 'Priority' else remaining[index]
+        entry = [key, order, index]
+
+        # El cliente se inserta antes del primero con clave mayor.
+        for position, other in enumerate(prefix):
+            if key < other[0]:
+                # Priority no expulsa al cliente en atención: se coloca detrás de él.
+                if position == 0 and service > 0:
+                    position = 1
+                prefix.insert(position, entry)
+                return
+
+        if not prefix and heap and key < heap[0][0] and service > 0:
+            if policy == 'SRTF':
+                # Expulsa al cliente en atención.
+                service = 0
+            else:
+                prefix = deque((heapq.heappop(heap), entry))
+                return
+
+        heapq.heappush(heap, entry)
+
+    time = 1
+    next_client = 0
+    while next_client < n_clients or prefix or heap:
+        if not prefix and not heap:
+            time = max(time, arrivals[next_client])
+
+        # Las llegadas entran a la cola antes de atender el tick, como en Simulation.step.
+        while next_client < n_clients and arrivals[next_client] <= time:
+            enqueue(next_client)
+            next_client += 1
+
+        front = prefix[0] if prefix else heap[0]
+        index = front[2]
+
+        # Atender hasta que termine, acabe su turno o llegue otro cliente.
+        run = remaining[index]
+        if capacity:
+            run = min(run, capacity - service)
+        if next_client < n_clients:
+            run = min(run, arrivals[next_client] - time)
+
+        if starts[index] is None:
+            starts[index] = time
+        if slices and slices[-1][0] == index and slices[-1][2] == time:
+            slices[-1][2] += run
+        else:
+            slices.append([index, time, time + run])
+
+        time += run
+        remaining[index] -= run
+        service += run
+        if policy == 'SRTF':
+            # La clave del frente sólo disminuye, así que sigue al frente del montículo.
+            front[0] = remaining[index]
+
+        if remaining[index] == 0 or capacity and service == capacity:
+            service = 0
+            if prefix:
+                prefix.popleft()
+            else:
+                heapq.heappop(heap)
+
+            if remaining[index] == 0:
+                finals[index] = time
+            else:
+                # Fin del turno: regresa a la cola según la política.
+                enqueue(index)
+
+    return starts, finals, slices
+
+class Batch_Schedule:
+    """Planificación de una lista de clientes calculada con schedule.
+    Ofrece slices y results igual que simulation.Simulation, así que sirve para simulation.summarize,
+    export.from_simulation y las tablas de resultados."""
+
+    def __init__(self, policy: str, clients: list[logic.Queue_Client], capacity: int = 0) -> None:
+        """policy: Una de las políticas en simulation.POLICIES.
+        clients: Clientes con su tiempo de llegada.
+        capacity: Número de solicitudes que el cajero atiende por turno. 0 atiende hasta terminar."""
+
+        # Mismo orden de llegada que Simulation, que también ordena de forma estable.
+        self.clients = sorted(clients, key=logic.Queue_Client.get_arrival_time)
+        # Simulation registra como llegada el tick en que el cliente entra a la cola, que es al menos 1.
+        self.arrivals = [max(1, client.get_arrival_time()) for client in self.clients]
+        self.bursts = [client.get_number_of_requests() for client in self.clients]
+        self.priorities = [client.get_priority() for client in self.clients]
+        self.starts, self.finals, slices = schedule(policy, self.arrivals, self.bursts, self.priorities, capacity)
+
+        # Secciones de ejecución: [id, inicio, fin).
+        self.slices = [[self.clients[index].get_id(), start, end] for index, start, end in slices]
+
+    def results(self) -> list[dict]:
+        """Devuelve los tiempos de cada cliente en el formato de simulation.Simulation.results."""
+
+        return [
+            {
+                'id': client.get_id(),
+                'arrival': arrival,
+                'burst': burst,
+                'priority': priority,
+                'start': start,
+                'final': final,
+                'turnaround': final - arrival,
+                'waiting': final - arrival - burst,
+                'response': start - arrival
+            }
+            for client, arrival, burst, priority, start, final in zip(
+                self.clients, self.arrivals, self.bursts, self.priorities, self.starts, self.finals
+            )
+        ]
+
+def validate(policy: str, n_clients: int, load: float, capacity: int = 0, distribution: str = 'uniform', seed: int = None) -> None:
+    """Compara la planificación por lotes con la simulación tick por tick y lanza AssertionError si difieren."""
+
+    def clients() -> list[logic.Queue_Client]:
+        return simulation.generate_clients(n_clients, load, distribution, policy == 'Priority', seed)
+
+    sim = simulation.Simulation(simulation.create_queue(policy, capacity), clients())
+    sim.run()
+    batch = Batch_Schedule(policy, clients(), capacity)
+
+    if sim.slices != batch.slices:
+        raise AssertionError(f'{policy}: las secciones de ejecución difieren')
+    if sim.results() != batch.results():
+        raise AssertionError(f'{policy}: los tiempos de los clientes difieren')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--policy', choices=simulation.POLICIES, default='SRTF')
+    parser.add_argument('--quantum', type=int, default=0)
+    parser.add_argument('--clients', type=int, default=10**6)
+    parser.add_argument('--load', type=float, default=0.9)
+    parser.add_argument('--distribution', choices=tuple(simulation.BURST_DISTRIBUTIONS), default='uniform')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--validate', type=int, default=10**4, help='Clientes para comparar con la simulación tick por tick. 0 para omitir.')
+    args = parser.parse_args()
+
+    if args.validate:
+        validate(args.policy, args.validate, args.load, args.quantum, args.distribution, args.seed)
+        print(f'Validado contra la simulación con {args.validate} clientes')
+
+    clients = simulation.generate_clients(args.clients, args.load, args.distribution, args.policy == 'Priority', args.seed)
+    start = clock.perf_counter()
+    batch = Batch_Schedule(args.policy, clients, args.quantum)
+    elapsed = clock.perf_counter() - start
+    print(f'{args.clients} clientes y {len(batch.slices)} secciones en {elapsed:.2f} s')
+    print(simulation.summarize(batch.results()))
@@ -1,11 +1,72 @@
 """Parámetros para la simulación gráfica de una cola de cajero."""
 
 SCREEN_WIDTH = 900
-SCREEN_HEIGHT = 650
+SCREEN_HEIGHT = 770
 SERVER_CAPACITY = 0
 AUTOMATIC_RESPOND_TIME = 200
 ENABLE_PRIORITY = False
 
+# Atender por plazo más cercano (EDF) en lugar de por prioridad o por menor restante. El plazo de cada cliente es
+# su llegada más DEADLINE_SLACK veces su número de solicitudes. Con DEADLINE_SKIP_LATE, los clientes que ya no
+# pueden terminar a tiempo se atienden al final, para que un plazo vencido no haga vencer otros en cadena.
+ENABLE_DEADLINES = False
+DEADLINE_PREEMPTIVE = True
+DEADLINE_SKIP_LATE = True
+DEADLINE_SLACK = 3
+
 TEXTBOX_PADDING = 5
 GRANT_PADDING = 5
 GRANT_TIME_WIDTH = 20
+
+# Rango de ticks que dura bloqueado un cliente antes de regresar a la cola.
+BLOCK_TIME_MIN = 5
+BLOCK_TIME_MAX = 30
+
+# Segundos desde el inicio del intérprete hasta que la ventana se muestra.
+STARTUP_TIME_TARGET = 0.5
+
+# Retención del historial: filas de la tabla y columnas del diagrama en memoria.
+# Las filas de procesos terminados que sobran se mueven en lotes a HISTORY_DIRECTORY.
+HISTORY_ROWS = 200
+HISTORY_SPILL_BATCH = 50
+HISTORY_TICKS = 500
+HISTORY_INACTIVE_LANES = 20
+HISTORY_DIRECTORY = 'history'
+
+# Servidor de llegadas por socket: (host, puerto) o la ruta de un socket Unix.
+INGEST_ENABLED = False
+INGEST_ADDRESS = ('127.0.0.1', 8765)
+INGEST_CAPACITY = 100000
+INGEST_MAX_PER_FRAME = 200
+INGEST_MAX_PER_TICK = 10000
+
+# Clientes máximos de un lote agregado desde la interfaz. En lotes de más de BULK_GRANT_LANES clientes,
+# el carril de cada uno en el diagrama de Grant se crea cuando se atiende por primera vez.
+BULK_MAX_CLIENTS = 100000
+BULK_GRANT_LANES = 20
+
+# Ticks conservados de la longitud de la cola, uso y salidas, y puntos dibujados por curva.
+SERIES_CAPACITY = 1 << 20
+CHART_POINTS = 200
+
+# Backend de dibujo de la ventana: 'software' dibuja sobre la superficie de pygame.display y 'renderer'
+# compone texturas con el Renderer de SDL2, con respaldo en 'software' si no está disponible.
+RENDER_BACKEND = 'software'
+# Textos dibujados recientes y superficies convertidas o texturas guardadas por el lienzo.
+TEXT_CACHE_SIZE = 512
+CANVAS_CACHE_SIZE = 1024
+
+# Semilla de los números aleatorios de la interfaz, None para una nueva en cada ejecución, y diarios de
+# sus entradas para reproducirla sin pantalla con session.py. Cada sesión escribe el suyo en
+# JOURNAL_DIRECTORY/journal-<semilla>-<fecha>.jsonl y se conservan los JOURNAL_KEEP más recientes; 0 para no guardarlos.
+# El diario crece con las acciones y las llegadas por el socket, no con los ticks.
+SEED = None
+JOURNAL_DIRECTORY = HISTORY_DIRECTORY
+JOURNAL_KEEP = 10
+
+# Segundos entre dibujos de la vista de terminal.
+TUI_REFRESH_TIME = 0.25
+
+PROFILE = False
+PROFILE_OVERLAY = False
+PROFILE_OUTPUT = 'trace.json'
@@ -0,0 +1,140 @@
+"""Control adaptativo de réplicas con truncamiento del periodo de calentamiento."""
+
+import argparse, json, time
+from concurrent.futures import ProcessPoolExecutor
+import offline, simulation, stats
+
+# Tamaño de los lotes de MSER-5.
+MSER_BATCH = 5
+
+def mser(series: list[float], batch: int = MSER_BATCH) -> int:
+    """Devuelve cuántas observaciones iniciales descartar según la regla MSER.
+    Agrupa la serie en lotes y elige el truncamiento d que minimiza la varianza de la media restante,
+    sum((y_i - media)^2) / (n - d)^2, buscando sólo en la primera mitad como recomienda la regla.
+    series: Serie en orden, por ejemplo la espera de cada cliente por orden de llegada.
+    batch: Número de observaciones por lote."""
+
+    means = [sum(series[i:i + batch]) / batch for i in range(0, len(series) - batch + 1, batch)]
+    n = len(means)
+    if n < 2:
+        return 0
+
+    # Sumas de los lotes desde cada posición hasta el final.
+    total = 0.0
+    squares = 0.0
+    suffix = [None] * n
+    for i in range(n - 1, -1, -1):
+        total += means[i]
+        squares += means[i] * means[i]
+        suffix[i] = (total, squares)
+
+    best = None
+    best_d = 0
+    for d in range(n // 2):
+        total, squares = suffix[d]
+        count = n - d
+        statistic = (squares - total * total / count) / count**2
+        if best is None or statistic < best:
+            best = statistic
+            best_d = d
+
+    return best_d * batch
+
+# Métricas por cliente que se pueden estimar.
+METRICS = ('waiting', 'turnaround', 'response')
+
+def replicate(config: dict, seed: int) -> dict:
+    """Ejecuta una réplica y devuelve la media de la métrica sin el calentamiento y cuántos clientes se descartaron.
+    El truncamiento se calcula siempre sobre la espera de cada cliente por orden de llegada.
+    Usa offline.Batch_Schedule, que da los mismos tiempos que simulation.Simulation sin avanzar tick por tick.
+    config: Política, capacidad, carga, distribución, número de clientes por réplica y métrica.
+    seed: Semilla de los clientes de la réplica."""
+
+    clients = simulation.generate_clients(config['n_clients'], config['load'], config['distribution'], config['policy'] == 'Priority', seed)
+    batch = offline.Batch_Schedule(config['policy'], clients, config['quantum'])
+    results = batch.results()
+
+    truncated = mser([result['waiting'] for result in results])
+    kept = [result[config['metric']] for result in results[truncated:]]
+    return {'seed': seed, 'truncated': truncated, 'mean': sum(kept) / len(kept) if kept else None}
+
+def control(config: dict, relative_width: float = 0.05, confidence: float = 0.95, batch_size: int = 4,
+            min_replications: int = 4, max_replications: int = 1000, seed: int = 0, workers: int = 0) -> dict:
+    """Lanza réplicas en lotes hasta que el intervalo de confianza de la media de la métrica sea
+    a lo más relative_width veces la media, a cada lado, o se llegue a max_replications.
+    El resultado no depende del número de procesos: las semillas son seed, seed + 1, ... y los lotes son fijos.
+    config: Configuración de cada réplica, como para replicate.
+    relative_width: Mitad del ancho del intervalo entre la media que se quiere alcanzar.
+    confidence: Nivel de confianza del intervalo.
+    batch_size: Réplicas por lote.
+    min_replications: Réplicas mínimas antes de evaluar el intervalo.
+    max_replications: Réplicas máximas.
+    seed: Semilla de la primera réplica.
+    workers: Número de procesos para las réplicas de cada lote. 0 para no crear procesos."""
+
+    means = stats.Running_Stat()
+    replications = []
+    pool = ProcessPoolExecutor(workers) if workers > 0 else None
+    half_width = None
+
+    try:
+        while len(replications) < max_replications:
+            seeds = range(seed + len(replications), seed + min(len(replications) + batch_size, max_replications))
+            batch = pool.map(replicate, [config] * len(seeds), seeds) if pool is not None else map(replicate, [config] * len(seeds), seeds)
+            for result in batch:
+                replications.append(result)
+                if result['mean'] is not None:
+                    means.add(result['mean'])
+
+            half_width = stats.confidence_interval(means, confidence)
+            if     len(replications) >= min_replications and half_width is not None\
+               and half_width <= relative_width * abs(means.mean):
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return {
+        **config,
+        'replications': len(replications),
+        'mean': means.mean if means.count else None,
+        'half_width': half_width,
+        'relative_half_width': half_width / abs(means.mean) if half_width is not None and means.mean else None,
+        'converged': half_width is not None and half_width <= relative_width * abs(means.mean),
+        'mean_truncated': sum(result['truncated'] for result in replications) / len(replications) if replications else None,
+        'runs': replications
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--policy', choices=simulation.POLICIES, default='SRTF')
+    parser.add_argument('--quantum', type=int, default=0)
+    parser.add_argument('--load', type=float, default=0.9)
+    parser.add_argument('--distribution', choices=tuple(simulation.BURST_DISTRIBUTIONS), default='uniform')
+    parser.add_argument('--clients', type=int, default=5000, help='Clientes por réplica.')
+    parser.add_argument('--metric', choices=METRICS, default='waiting')
+    parser.add_argument('--width', type=float, default=0.05, help='Mitad del ancho relativo del intervalo a alcanzar.')
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--batch', type=int, default=None, help='Réplicas por lote. Por defecto, el número de procesos o 4.')
+    parser.add_argument('--max-replications', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--output', help='Archivo JSON con el resultado de cada réplica.')
+    args = parser.parse_args()
+
+    config = {'policy': args.policy, 'quantum': args.quantum, 'load': args.load, 'distribution': args.distribution, 'n_clients': args.clients, 'metric': args.metric}
+    start = time.perf_counter()
+    result = control(config, args.width, args.confidence, args.batch or args.workers or 4, max_replications=args.max_replications, seed=args.seed, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    # Con menos de dos réplicas no hay intervalo.
+    def number(value, spec: str = '.3f') -> str:
+        return '-' if value is None else format(value, spec)
+
+    print(f'{result["replications"]} réplicas en {elapsed:.1f} s · {"convergió" if result["converged"] else "no convergió"}')
+    print(f'Media de {args.metric} {number(result["mean"])} ± {number(result["half_width"])} ({number(result["relative_half_width"], ".1%")})'
+          f' · calentamiento medio descartado {number(result["mean_truncated"], ".0f")} clientes')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(result, file, indent=2)
@@ -0,0 +1,578 @@
+"""Estado de una sesión de la interfaz gráfica y su diario de entradas, para reproducirla sin pantalla.
+
+El diario guarda la semilla de los números aleatorios y cada acción con el tick simulado en que ocurrió.
+Los ticks no se guardan: al reproducir se avanza el tiempo hasta el tick de cada acción, sin eventos
+de pygame ni el temporizador de AUTOMATIC_RESPOND, así que se repite exactamente la misma table_data."""
+
+import argparse, glob, hashlib, json, math, os, random, tempfile
+import time as clock
+import pandas
+import logic, params, instrument, stats, history, simulation
+
+# Parámetros que cambian el resultado de una sesión y se guardan en el diario.
+JOURNAL_PARAMS = ('SERVER_CAPACITY', 'ENABLE_PRIORITY', 'ENABLE_DEADLINES', 'DEADLINE_PREEMPTIVE', 'DEADLINE_SKIP_LATE', 'DEADLINE_SLACK', 'BLOCK_TIME_MIN', 'BLOCK_TIME_MAX', 'HISTORY_ROWS', 'HISTORY_SPILL_BATCH', 'BULK_MAX_CLIENTS')
+
+TABLE_COLUMNS = ('Proceso', 'Estado', 'T. Llegada', 'Prioridad', 'Ráfaga', 'T. Comienzo', 'T. Final', 'T. Retorno', 'T. Espera')
+# Columnas que se agregan con params.ENABLE_DEADLINES: el plazo y, al terminar, el final menos el plazo.
+DEADLINE_COLUMNS = ('T. Límite', 'Retraso')
+
+class Journal:
+    """Diario de una sesión en líneas JSON: un encabezado con la semilla y los parámetros,
+    una lista [tick, acción, argumentos...] por acción y un cierre con el último tick y el resumen de la tabla."""
+
+    def __init__(self, path: str, seed: int) -> None:
+        """path: Archivo del diario.
+        seed: Semilla de los números aleatorios de la sesión."""
+
+        # Por líneas, para que el diario de una sesión interrumpida se pueda reproducir hasta su última acción.
+        # En modo exclusivo, para nunca sobrescribir el diario de otra sesión.
+        self.file = open(path, 'x', encoding='utf-8', buffering=1)
+        self.write({'seed': seed, 'params': {name: getattr(params, name) for name in JOURNAL_PARAMS}})
+
+    def write(self, entry) -> None:
+        self.file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    def record(self, time: int, action: str, *args) -> None:
+        """Guarda una acción en el tick indicado."""
+
+        self.write([time, action, *args])
+
+    def close(self, time: int, digest: str) -> None:
+        """Guarda el cierre de la sesión y cierra el archivo."""
+
+        self.write({'end': time, 'digest': digest})
+        self.file.close()
+
+def new_journal(directory: str, seed: int, keep: int) -> Journal:
+    """Crea el diario de una sesión nueva en directory/journal-<semilla>-<fecha>.jsonl y borra los más viejos
+    para conservar a lo sumo keep diarios, contando el nuevo."""
+
+    os.makedirs(directory, exist_ok=True)
+    # El nombre empieza igual en todos, así que el orden por fecha de modificación es el de las sesiones.
+    journals = sorted(glob.glob(os.path.join(directory, 'journal-*.jsonl')), key=os.path.getmtime)
+    for path in journals[:max(0, len(journals) - keep + 1)]:
+        os.remove(path)
+
+    return Journal(os.path.join(directory, f'journal-{seed}-{clock.strftime("%Y%m%d-%H%M%S")}.jsonl'), seed)
+
+def read_journal(path: str) -> tuple[dict, list, dict]:
+    """Devuelve el encabezado, las acciones y el cierre de un diario. El cierre es None si la sesión no terminó."""
+
+    with open(path, encoding='utf-8') as file:
+        entries = [json.loads(line) for line in file if line.strip()]
+
+    end = entries.pop() if len(entries) > 1 and isinstance(entries[-1], dict) else None
+    return entries[0], entries[1:], end
+
+class Session:
+    """Cola, tabla de procesos, bloqueos y estadísticas de la interfaz gráfica.
+    Todas las entradas que cambian el estado pasan por sus métodos, que las guardan en el diario,
+    y todos los números aleatorios salen de su propio generador con la semilla de la sesión."""
+
+    def __init__(self, seed: int, journal: Journal = None, grant=None, profiler: instrument.Profiler = None, history_directory: str = params.HISTORY_DIRECTORY) -> None:
+        """seed: Semilla de los números aleatorios.
+        journal: Diario donde guardar las acciones. None para no guardarlas.
+        grant: Diagrama de Grant de la vista, o None sin pantalla.
+        profiler: Perfilador de las fases. Por defecto uno desactivado.
+        history_directory: Carpeta del historial de filas viejas y secciones de ejecución."""
+
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.journal = journal
+        self.grant = grant
+        self.profiler = profiler if profiler is not None else instrument.Profiler(False)
+        self.time = 0
+        self.automatic = False
+
+        # Estadísticas en línea de los clientes terminados y el tiempo de su primera atención.
+        self.collector = stats.Stats_Collector()
+        self.first_service_times: dict[str, int] = {}
+
+        # Longitud de la cola, uso del cajero y clientes terminados en cada tick.
+        self.series = stats.Tick_Series(('queue_length', 'utilization', 'throughput'), params.SERIES_CAPACITY)
+
+        self.columns = TABLE_COLUMNS + DEADLINE_COLUMNS if params.ENABLE_DEADLINES else TABLE_COLUMNS
+        self.table_data = pandas.DataFrame(columns=self.columns)
+        # Índices ordenados y conteos por estado de las filas, para ordenar y filtrar la tabla sin recorrerla.
+        self.table_index = logic.Table_Index(self.columns, 'Estado')
+        # Etiqueta de la siguiente fila. No se usa len(table_data) porque las filas viejas se mueven al historial.
+        self.next_row = 0
+
+        # Historial en disco de las filas viejas y de las secciones de ejecución.
+        self.history_log = history.History(history_directory, self.columns, ('Proceso', 'Estado'))
+
+        if params.ENABLE_DEADLINES:
+            self.queue = logic.EDF_Server_Queue(params.SERVER_CAPACITY, params.DEADLINE_PREEMPTIVE, params.DEADLINE_SKIP_LATE)
+            # Los clientes creados entre ticks se empiezan a atender en el siguiente.
+            self.queue.set_time(self.time + 1)
+        elif params.ENABLE_PRIORITY:
+            self.queue = logic.Priority_Server_Queue(params.SERVER_CAPACITY)
+        else:
+            self.queue = logic.SRTF_Server_Queue(params.SERVER_CAPACITY)
+
+        # Clientes por id con su estado, para validar ids y encontrar clientes sin recorrer la cola.
+        self.registry = logic.Client_Registry()
+
+        # Clientes bloqueados por id: (cliente, entrada en la rueda de temporizadores que lo desbloquea).
+        self.blocked: dict[str, tuple[logic.Queue_Client, list]] = {}
+        self.block_wheel = logic.Timer_Wheel()
+
+        # Clientes iniciales.
+        for i in range(5):
+            self.create_new_clients([(chr(ord('A') + i), self.rng.randint(1, 15), self.rng.randint(1, 5))])
+
+    def record(self, action: str, *args) -> None:
+        if self.journal is not None:
+            self.journal.record(self.time, action, *args)
+
+    def digest(self) -> str:
+        """Devuelve un resumen de table_data para comparar una reproducción con la sesión original."""
+
+        return hashlib.sha256(self.table_data.to_csv().encode()).hexdigest()
+
+    def close(self) -> None:
+        """Cierra el historial y el diario."""
+
+        self.history_log.close()
+        if self.journal is not None:
+            self.journal.close(self.time, self.digest())
+            self.journal = None
+
+    # Entradas de la sesión.
+
+    def set_automatic(self, automatic: bool) -> None:
+        """Activa o desactiva el modo automático. Sólo cambia cuándo llegan los ticks, no el resultado."""
+
+        self.record('automatic', automatic)
+        self.automatic = automatic
+
+    def add_client(self, id: str, requests: str, priority: str) -> str:
+        """Añade un cliente con los textos de la interfaz. Las solicitudes y la prioridad vacías son aleatorias.
+        Devuelve el campo inválido, 'id', 'requests' o 'priority', o None si se añadió."""
+
+        self.record('add', id, requests, priority)
+        if id in self.registry or id == '':
+            return 'id'
+
+        try:
+            if requests == '':
+                n_requests = self.rng.randint(1, 15)
+            else:
+                n_requests = int(requests)
+                if n_requests <= 0:
+                    return 'requests'
+        except ValueError:
+            return 'requests'
+        try:
+            if priority == '':
+                n_priority = self.rng.randint(1, 5)
+            else:
+                n_priority = int(priority)
+                if n_priority <= 0 or n_priority > 5:
+                    return 'priority'
+        except ValueError:
+            return 'priority'
+
+        self.create_new_clients([(id, n_requests, n_priority)])
+        return None
+
+    def add_bulk(self, count: str, requests: str, priority: str) -> str:
+        """Añade un lote de clientes con ids numéricos nuevos. count indica cuántos, requests
+        una distribución de simulation.BURST_DISTRIBUTIONS o un número fijo, por defecto 'uniform',
+        y priority una prioridad fija, por defecto aleatoria.
+        Devuelve el campo inválido, 'id', 'requests' o 'priority', o None si se añadió."""
+
+        self.record('bulk', count, requests, priority)
+        try:
+            n_clients = int(count)
+            if not 0 < n_clients <= params.BULK_MAX_CLIENTS:
+                raise ValueError
+        except ValueError:
+            return 'id'
+
+        requests = requests or 'uniform'
+        if requests in simulation.BURST_DISTRIBUTIONS:
+            burst = simulation.BURST_DISTRIBUTIONS[requests]
+        else:
+            try:
+                n_requests = int(requests)
+                if n_requests <= 0:
+                    raise ValueError
+            except ValueError:
+                return 'requests'
+            burst = lambda rng: n_requests
+
+        try:
+            n_priority = int(priority) if priority else None
+            if n_priority is not None and not 0 < n_priority <= 5:
+                raise ValueError
+        except ValueError:
+            return 'priority'
+
+        self.create_new_clients([
+            (id, burst(self.rng), n_priority if n_priority is not None else self.rng.randint(1, 5))
+            for id in self.registry.new_ids(n_clients)
+        ])
+        return None
+
+    def ingest(self, specs: list[tuple]) -> None:
+        """Añade los clientes recibidos por el socket. Las prioridades None son aleatorias.
+        specs: Tuplas (id, solicitudes, prioridad)."""
+
+        if not specs:
+            return
+
+        self.record('ingest', [list(spec) for spec in specs])
+        self.create_new_clients([
+            (id, n_requests, n_priority if n_priority is not None else self.rng.randint(1, 5))
+            for id, n_requests, n_priority in specs
+        ])
+
+    def toggle_block(self, id: str) -> None:
+        """Desbloquea al cliente bloqueado con el id indicado.
+        Si no, bloquea al cliente con ese id o, si no hay, al que está en atención, por un tiempo aleatorio."""
+
+        self.record('block', id)
+        if id in self.blocked:
+            queue_client, entry = self.blocked[id]
+            self.block_wheel.cancel(entry)
+            self.unblock_client(queue_client)
+            return
+
+        if self.queue.get_size() <= 1:
+            return
+
+        if self.registry.state(id) == logic.Client_Registry.ACTIVE:
+            queue_client = self.registry.get(id)
+        else:
+            queue_client = self.queue.get(1)
+        self.block_client(queue_client, self.rng.randint(params.BLOCK_TIME_MIN, params.BLOCK_TIME_MAX))
+
+    def tick(self) -> None:
+        """Avanza un tick: desbloquea a los clientes que toca y atiende al cliente al frente de la cola."""
+
+        queue, grant, profiler = self.queue, self.grant, self.profiler
+        self.time += 1
+        time = self.time
+        profiler.count('ticks')
+        self.collector.observe(time, max(0, queue.get_size() - 2), queue.get_size() > 1)
+
+        # Los clientes cuyo bloqueo terminó regresan a la cola antes de atender.
+        with profiler.phase('unblock'):
+            for queue_client in self.block_wheel.advance():
+                self.unblock_client(queue_client)
+
+        table_data = self.table_data
+
+        # Sólo si hay clientes en fila.
+        busy = queue.get_size() > 1
+        completed = 0
+        if busy:
+            queue_client = queue.get(1)
+            self.first_service_times.setdefault(str(queue_client.get_id()), time)
+            self.history_log.add_tick(str(queue_client.get_id()), time)
+            if grant is not None:
+                with profiler.phase('grant.add_line'):
+                    # Los clientes de lotes grandes reciben su carril al atenderse por primera vez.
+                    if str(queue_client.get_id()) not in grant.tags:
+                        grant.add_tag(str(queue_client.get_id()))
+                    grant.add_line(
+                        current_tag=str(queue_client.get_id()),
+                        blocked_tags=self.blocked
+                    )
+
+            with profiler.phase('dequeue'):
+                queue.dequeue()
+
+            # Dando tiempo de llegada a proceso actual.
+            with profiler.phase('table.loc'):
+                client_row = table_data[table_data['Proceso'] == str(queue_client.get_id())].iloc[-1]
+                client_row['Estado'] = 'En Ejecución'
+                if client_row['T. Comienzo'] is None:
+                    client_row['T. Comienzo'] = time
+
+                # Actulizar la nueva fila en la tabla.
+                table_data.loc[client_row.name] = client_row
+                self.sync_row(client_row.name)
+
+            # Cuando se terminó de atender a un cliente.
+            if queue.get_current_service() == 0 and queue.get_size() == 1 or queue.get(1) is not queue_client:
+                client_row = self.expel_table_line(queue_client)
+                if queue_client.is_done():
+                    if grant is not None:
+                        grant.remove_tag(str(queue_client.get_id()))
+                    self.registry.set_state(queue_client.get_id(), logic.Client_Registry.FINISHED)
+                    completed = 1
+                    client_row['Estado'] = 'Terminado'
+                    self.collector.add_client(
+                        client_row['T. Espera'],
+                        client_row['T. Retorno'],
+                        self.first_service_times.pop(str(queue_client.get_id())) - client_row['T. Llegada']
+                    )
+                    if params.ENABLE_DEADLINES:
+                        client_row['Retraso'] = client_row['T. Final'] - client_row['T. Límite']
+                        self.collector.add_deadline(client_row['Retraso'])
+                else:
+                    profiler.count('preemptions')
+                    self.new_table_line(queue_client, client_row['T. Llegada'])
+
+                # Actulizar la nueva fila en la tabla.
+                with profiler.phase('table.loc'):
+                    table_data.loc[client_row.name] = client_row
+                self.sync_row(client_row.name)
+
+                with profiler.phase('table.spill'):
+                    self.spill_table()
+
+        # Cuando no hay clientes en fila.
+        elif grant is not None:
+            with profiler.phase('grant.add_line'):
+                grant.add_line(
+                    blocked_tags=self.blocked
+                )
+
+        self.series.record(time, max(0, queue.get_size() - 2), busy, completed)
+        queue.set_time(time + 1)
+
+    # Operaciones sobre la cola y la tabla.
+
+    def create_new_clients(self, specs: list[tuple]) -> int:
+        """Crea varios clientes de una vez: los registra, los agrega a la cola en un solo lote y agrega sus filas
+        a la tabla en una sola operación. Se ignoran los ids ya registrados o repetidos en el lote.
+        specs: Tuplas (id, solicitudes, prioridad).
+        Devuelve el número de clientes creados."""
+
+        queue_clients = []
+        ids = set()
+        for id, n_requests, n_priority in specs:
+            if id in self.registry or id in ids:
+                self.profiler.count('rejected')
+                continue
+
+            ids.add(id)
+            if params.ENABLE_DEADLINES:
+                # El plazo cuenta desde la llegada en la tabla, que es el siguiente tick.
+                queue_clients.append(logic.Queue_Client(id, n_requests, self.time, None, self.time + 1 + math.ceil(params.DEADLINE_SLACK * n_requests)))
+            else:
+                queue_clients.append(logic.Queue_Client(id, n_requests, self.time, n_priority if params.ENABLE_PRIORITY else None))
+
+        if not queue_clients:
+            return 0
+
+        self.registry.add_many(queue_clients)
+        self.enqueue_clients(queue_clients)
+        # En lotes grandes los carriles se crean al atender, para no dibujar miles de carriles vacíos.
+        if self.grant is not None and len(queue_clients) <= params.BULK_GRANT_LANES:
+            for queue_client in queue_clients:
+                self.grant.add_tag(str(queue_client.get_id()))
+        self.new_table_lines(queue_clients)
+        return len(queue_clients)
+
+    def enqueue_clients(self, queue_clients: list[logic.Queue_Client]) -> None:
+        """Agrega los clientes en un lote según la política de la cola y, si expulsan al que estaba en atención, actualiza su fila en la tabla."""
+
+        queue = self.queue
+        past_service = queue.get_current_service()
+        try: front_client = queue.get(1)
+        except IndexError: front_client = None
+        queue.enqueue_many(queue_clients)
+        self.profiler.count('enqueues', len(queue_clients))
+        if queue.get_current_service() != past_service and front_client is not None:
+            table_data = self.table_data
+            client_row = self.expel_table_line(front_client)
+            table_data.loc[client_row.name] = client_row
+            self.sync_row(client_row.name)
+            self.new_table_line(front_client, client_row['T. Llegada'])
+            table_data.iloc[-1, table_data.columns.get_loc('Estado')] = 'Esperando'
+            self.sync_row(table_data.index[-1])
+
+    def sync_row(self, label) -> None:
+        """Actualiza los índices de la tabla con la fila indicada después de modificarla."""
+
+        with self.profiler.phase('table.index'):
+            self.table_index.set_row(label, tuple(self.table_data.loc[label]))
+
+    def new_table_line(self, queue_client: logic.Queue_Client, arrival_time: int = None) -> None:
+        """Crea una nueva línea en la tabla con la información del cliente y el tiempo de llegada indicado."""
+
+        with self.profiler.phase('table.new_line'):
+            self.table_data.loc[self.next_row] = (
+                str(queue_client.get_id()),                              # Id
+                'Esperando',                                             # Estado
+                self.time + 1 if arrival_time is None else arrival_time, # Tiempo de llegada
+                queue_client.get_priority(),                             # Prioridad
+                queue_client.get_number_of_requests(),                   # Número de solicitudes.
+                None,
+                None,
+                None,
+                None
+            ) + self.deadline_cells(queue_client)
+        self.sync_row(self.next_row)
+        self.next_row += 1
+        self.profiler.count('rows')
+
+    def new_table_lines(self, queue_clients: list[logic.Queue_Client]) -> None:
+        """Crea las líneas de los clientes nuevos en la tabla con una sola concatenación y las agrega juntas a los índices.
+        table_data se reemplaza, así que la vista debe leerla de la sesión."""
+
+        with self.profiler.phase('table.new_lines'):
+            labels = range(self.next_row, self.next_row + len(queue_clients))
+            rows = [
+                (str(queue_client.get_id()), 'Esperando', self.time + 1, queue_client.get_priority(), queue_client.get_number_of_requests(), None, None, None, None)
+                + self.deadline_cells(queue_client)
+                for queue_client in queue_clients
+            ]
+            self.table_data = pandas.concat([self.table_data, pandas.DataFrame(rows, index=labels, columns=self.table_data.columns, dtype=object)])
+
+        with self.profiler.phase('table.index'):
+            self.table_index.add_rows(zip(labels, rows))
+        self.next_row += len(rows)
+        self.profiler.count('rows', len(rows))
+
+    def deadline_cells(self, queue_client: logic.Queue_Client) -> tuple:
+        """Devuelve las celdas de DEADLINE_COLUMNS de una fila nueva, o ninguna sin params.ENABLE_DEADLINES."""
+
+        return (queue_client.get_deadline(), None) if params.ENABLE_DEADLINES else ()
+
+    def spill_table(self) -> None:
+        """Mueve al historial las filas más antiguas de procesos terminados cuando la tabla excede params.HISTORY_ROWS."""
+
+        table_data = self.table_data
+        excess = len(table_data) - params.HISTORY_ROWS
+        if excess < params.HISTORY_SPILL_BATCH:
+            return
+
+        # Sólo las filas de procesos cuya última fila está terminada, pues expel_table_line usa las demás.
+        finished = table_data.groupby('Proceso')['Estado'].transform('last') == 'Terminado'
+        labels = table_data.index[finished][:excess]
+        for row in table_data.loc[labels].itertuples(index=False):
+            self.history_log.add_client(tuple(row))
+
+        table_data.drop(labels, inplace=True)
+        for label in labels:
+            self.table_index.remove_row(label)
+        self.history_log.flush()
+
+    def expel_table_line(self, queue_client: logic.Queue_Client) -> pandas.Series:
+        """Devuelve una fila con la infomarción calculada tras la expulsión de un proceso."""
+
+        table_data = self.table_data
+        with self.profiler.phase('table.expel'):
+            # Obtener todas las filas del proceso.
+            client_rows = table_data[table_data['Proceso'] == queue_client.get_id()].iloc
+
+            # Agregar el tiempo final en la última.
+            client_rows[-1, table_data.columns.get_loc('T. Final')] = self.time + 1
+
+            # Agregar el tiempo de retorno en la última.
+            client_rows[-1, table_data.columns.get_loc('T. Retorno')] =\
+                client_rows[-1]['T. Final'] - client_rows[-1]['T. Llegada']
+
+            # Para calcular el tiempo de espera se inicia con el tiempo de retorno actual.
+            client_rows[-1, table_data.columns.get_loc('T. Espera')] = client_rows[-1]['T. Retorno']
+            # Se le resta la ráfaga ejecutada de cada fila del proceso.
+            for client_row in client_rows:
+                # Sólo se restan los que tienen el mismo tiempo de llegada.
+                if client_row['T. Llegada'] != client_rows[-1]['T. Llegada']:
+                    continue
+
+                client_rows[-1, table_data.columns.get_loc('T. Espera')] -=\
+                    client_row['T. Final'] - client_row['T. Comienzo']
+
+            # Cambiar estado a expulsado.
+            client_rows[-1, table_data.columns.get_loc('Estado')] = 'Expulsado'
+
+            return client_rows[-1]
+
+    def block_client(self, queue_client: logic.Queue_Client, duration: int) -> None:
+        """Saca al cliente de la cola y lo bloquea durante el número de ticks indicado."""
+
+        table_data = self.table_data
+        index = table_data[table_data['Proceso'] == queue_client.get_id()].iloc[-1].name
+        if queue_client is self.queue.get(1) and self.queue.get_current_service() > 0:
+            client_row = self.expel_table_line(queue_client)
+            table_data.loc[client_row.name] = client_row
+            self.sync_row(client_row.name)
+            self.new_table_line(queue_client, client_row['T. Llegada'])
+            index = table_data.iloc[-1].name
+
+        self.queue.remove(queue_client)
+        # Los clientes de lotes grandes que no se han atendido aún no tienen carril, y sin él su bloqueo no se dibuja.
+        if self.grant is not None and str(queue_client.get_id()) not in self.grant.tags:
+            self.grant.add_tag(str(queue_client.get_id()))
+        table_data.loc[index, 'Estado'] = 'Bloqueado'
+        self.sync_row(index)
+        self.registry.set_state(queue_client.get_id(), logic.Client_Registry.BLOCKED)
+        self.blocked[queue_client.get_id()] = (queue_client, self.block_wheel.schedule(queue_client, duration))
+
+    def unblock_client(self, queue_client: logic.Queue_Client) -> None:
+        """Regresa a la cola un cliente bloqueado según la política de la cola."""
+
+        del self.blocked[queue_client.get_id()]
+        self.registry.set_state(queue_client.get_id(), logic.Client_Registry.ACTIVE)
+        table_data = self.table_data
+        index = table_data[table_data['Proceso'] == queue_client.get_id()].iloc[-1].name
+        table_data.loc[index, 'Estado'] = 'Esperando'
+        self.sync_row(index)
+        self.enqueue_clients([queue_client])
+
+# Método de la sesión que aplica cada acción del diario.
+ACTIONS = {
+    'automatic': Session.set_automatic,
+    'add': Session.add_client,
+    'bulk': Session.add_bulk,
+    'ingest': Session.ingest,
+    'block': Session.toggle_block
+}
+
+def replay(path: str, history_directory: str, profiler: instrument.Profiler = None) -> tuple[Session, dict]:
+    """Reproduce un diario sin pantalla tan rápido como lo permite la lógica.
+    Devuelve la sesión al final y el cierre del diario, o None si la sesión original no terminó.
+    path: Archivo del diario.
+    history_directory: Carpeta para el historial de la reproducción.
+    profiler: Perfilador de las fases, por ejemplo para repetir una investigación de rendimiento."""
+
+    header, actions, end = read_journal(path)
+    # Los parámetros de la sesión original, aunque params.py haya cambiado desde entonces.
+    for name, value in header['params'].items():
+        setattr(params, name, value)
+
+    session = Session(header['seed'], profiler=profiler, history_directory=history_directory)
+    for time, action, *args in actions:
+        while session.time < time:
+            session.tick()
+        ACTIONS[action](session, *args)
+
+    if end is not None:
+        while session.time < end['end']:
+            session.tick()
+
+    session.close()
+    return session, end
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('journal', help='Diario escrito por la interfaz gráfica en params.JOURNAL_DIRECTORY.')
+    parser.add_argument('--history', help='Carpeta para el historial de la reproducción. Por defecto una temporal.')
+    parser.add_argument('--profile', help='Archivo de trazas del perfilador de la reproducción.')
+    parser.add_argument('--output', help='Archivo CSV con la table_data final.')
+    args = parser.parse_args()
+
+    profiler = instrument.Profiler(args.profile is not None)
+    with tempfile.TemporaryDirectory() as directory:
+        start = clock.perf_counter()
+        session, end = replay(args.journal, args.history or directory, profiler)
+        elapsed = clock.perf_counter() - start
+
+    print(f'{session.time} ticks en {elapsed:.2f} s ({session.time / elapsed:.0f} ticks/s) · {len(session.table_data)} filas en la tabla')
+    if end is None:
+        print('El diario no tiene cierre: la sesión original no terminó, no hay resumen con que comparar')
+    elif end['digest'] == session.digest():
+        print('table_data idéntica a la de la sesión original')
+    else:
+        print('table_data distinta de la de la sesión original')
+
+    if args.profile:
+        profiler.dump(args.profile)
+    if args.output:
+        session.table_data.to_csv(args.output)
@@ -0,0 +1,283 @@
+"""Simulación sin interfaz gráfica de una cola de cajero."""
+
+import math, random
+import logic, instrument, stats, history
+from collections import deque
+
+POLICIES = ('FIFO', 'Priority', 'SRTF')
+# Políticas por plazo, con y sin expulsión. Sólo las simula Simulation; offline no las planifica.
+DEADLINE_POLICIES = ('EDF', 'EDF-NP')
+
+# Distribuciones de ráfaga disponibles. Todas tienen media cercana a 8 solicitudes,
+# igual que random.randint(1, 15) que usa la interfaz gráfica.
+BURST_DISTRIBUTIONS = {
+    'uniform': lambda rng: rng.randint(1, 15),
+    'exponential': lambda rng: 1 + int(rng.expovariate(1 / 7.5)),
+    'bimodal': lambda rng: rng.randint(1, 4) if rng.random() < 0.8 else rng.randint(20, 40),
+}
+BURST_MEAN = 8
+
+# Columnas de los clientes terminados en el historial.
+RESULT_COLUMNS = ('id', 'arrival', 'burst', 'priority', 'start', 'final')
+
+def create_queue(policy: str, capacity: int, skip_late: bool = False) -> logic.FIFO_Server_Queue:
+    """Crea la cola de servidor correspondiente a la política indicada.
+    policy: Una de las políticas en POLICIES o DEADLINE_POLICIES.
+    capacity: Número de solicitudes que el cajero puede atender por turno.
+    skip_late: En las políticas por plazo, atender al final a los clientes que ya no terminan a tiempo.
+
+    Un cliente que sólo terminaría un tick después de su plazo ya es tardío (se comprueba con python -m doctest simulation.py):
+
+    >>> clients = [logic.Queue_Client(id, 3, 1, None, deadline) for id, deadline in (('A', 3), ('B', 7), ('C', 7))]
+    >>> collector = stats.Stats_Collector()
+    >>> Simulation(create_queue('EDF', 0, skip_late=True), clients, collector=collector).run()
+    >>> collector.misses
+    1
+    """
+
+    if policy == 'FIFO':
+        return logic.FIFO_Server_Queue(capacity)
+    if policy == 'Priority':
+        return logic.Priority_Server_Queue(capacity)
+    if policy == 'SRTF':
+        return logic.SRTF_Server_Queue(capacity)
+    if policy in DEADLINE_POLICIES:
+        return logic.EDF_Server_Queue(capacity, policy == 'EDF', skip_late)
+
+    raise ValueError(policy)
+
+def generate_clients(n_clients: int, load: float, distribution: str = 'uniform', priorities: bool = False, seed: int = None, slack: float = None) -> list[logic.Queue_Client]:
+    """Genera clientes con llegadas de Poisson y ráfagas según la distribución indicada.
+    n_clients: Número de clientes a generar.
+    load: Factor de carga, es decir, la tasa de llegadas por la ráfaga media.
+    distribution: Nombre de una distribución en BURST_DISTRIBUTIONS.
+    priorities: Si es verdadero, cada cliente recibe una prioridad entre 1 y 5.
+    seed: Semilla para el generador aleatorio.
+    slack: Si se indica, cada cliente recibe como plazo su llegada más slack veces su ráfaga, redondeado hacia arriba.
+           No usa números aleatorios, así que los clientes son los mismos con o sin plazo."""
+
+    if load <= 0:
+        raise ValueError
+
+    rng = random.Random(seed)
+    burst = BURST_DISTRIBUTIONS[distribution]
+    rate = load / BURST_MEAN
+
+    clients = []
+    instant = 0.0
+    for i in range(n_clients):
+        instant += rng.expovariate(rate)
+        n_requests = burst(rng)
+        arrival = 1 + int(instant)
+        clients.append(logic.Queue_Client(
+            i,
+            n_requests,
+            arrival,
+            rng.randint(1, 5) if priorities else None,
+            arrival + math.ceil(slack * n_requests) if slack is not None else None
+        ))
+
+    return clients
+
+def percentile(values: list, q: float) -> float:
+    """Devuelve el percentil q (entre 0 y 100) de los valores, interpolando linealmente.
+    values: Valores ordenados de menor a mayor."""
+
+    if not values:
+        return None
+
+    position = (len(values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+def summarize(results: list[dict]) -> dict:
+    """Devuelve la media y los percentiles 95 y 99 del tiempo de espera y de retorno.
+    results: Resultados por cliente, como los devuelve Simulation.results."""
+
+    summary = {'clients': len(results)}
+    for key, name in (('waiting', 'wait'), ('turnaround', 'turnaround')):
+        values = sorted(result[key] for result in results)
+        summary[f'mean_{name}'] = sum(values) / len(values) if values else None
+        summary[f'p95_{name}'] = percentile(values, 95)
+        summary[f'p99_{name}'] = percentile(values, 99)
+
+    return summary
+
+class Simulation:
+    """Avanza una cola de servidor tick por tick sin necesidad de Pygame."""
+
+    def __init__(self, queue: logic.FIFO_Server_Queue, clients: list[logic.Queue_Client] = (), profiler: instrument.Profiler = None, collector: stats.Stats_Collector = None, history_log: history.History = None) -> None:
+        """queue: Cola de servidor a simular.
+        clients: Clientes que llegarán durante la simulación según su tiempo de llegada.
+        profiler: Perfilador para medir las fases de cada tick. Por defecto, ninguno.
+        collector: Recolector de estadísticas en línea. Por defecto, ninguno.
+        history_log: Historial en disco con columnas RESULT_COLUMNS. Si se indica, los clientes terminados
+                     y las secciones de ejecución se guardan ahí en lugar de en memoria."""
+
+        self.queue = queue
+        self.time = 0
+        self.profiler = profiler if profiler is not None else instrument.DISABLED
+        self.collector = collector
+        self.history_log = history_log
+        # Cliente atendido en el tick anterior si no terminó.
+        self.last_client: logic.Queue_Client = None
+        self.pending = deque(sorted(clients, key=logic.Queue_Client.get_arrival_time))
+        # Ids de los clientes por llegar, para que has_client no recorra pending.
+        self.pending_ids = {client.get_id() for client in self.pending}
+
+        # Por cliente: [llegada, ráfaga, prioridad, comienzo, final].
+        self.records: dict[str, list] = {}
+        # Secciones de ejecución: [id, inicio, fin).
+        self.slices: list[list] = []
+
+    def add_client(self, client: logic.Queue_Client) -> None:
+        """Agrega un cliente a la cola en el tiempo actual, por lo que llega en el siguiente tick.
+        client: Cliente a agregar."""
+
+        self.queue.set_time(self.time + 1)
+        self.queue.enqueue(client)
+        self.profiler.count('enqueues')
+        self.records[client.get_id()] = [
+            self.time + 1,
+            client.get_number_of_requests(),
+            client.get_priority(),
+            None,
+            None
+        ]
+
+    def add_clients(self, clients: list[logic.Queue_Client]) -> None:
+        """Agrega varios clientes a la cola en el tiempo actual con una sola inserción por lotes.
+        Queda igual que llamar add_client con cada uno, en orden.
+        clients: Clientes a agregar."""
+
+        self.queue.set_time(self.time + 1)
+        self.queue.enqueue_many(clients)
+        self.profiler.count('enqueues', len(clients))
+        for client in clients:
+            self.records[client.get_id()] = [
+                self.time + 1,
+                client.get_number_of_requests(),
+                client.get_priority(),
+                None,
+                None
+            ]
+
+    def migrate_in(self, client: logic.Queue_Client, arrival: int, burst: int, start: int) -> None:
+        """Agrega a la cola un cliente que viene de otra simulación, conservando sus tiempos.
+        client: Cliente con sus solicitudes restantes.
+        arrival: Tick de llegada original.
+        burst: Ráfaga original.
+        start: Tick de su primera atención o None."""
+
+        self.queue.set_time(self.time + 1)
+        self.queue.enqueue(client)
+        self.profiler.count('enqueues')
+        self.records[client.get_id()] = [arrival, burst, client.get_priority(), start, None]
+
+    def migrate_out(self, n_clients: int) -> list[tuple]:
+        """Saca de la cola hasta n_clients clientes en espera, empezando por el final, para otra simulación.
+        Nunca saca al cliente en atención. Devuelve tuplas (cliente, llegada, ráfaga, comienzo)."""
+
+        migrated = []
+        for client in self.queue.remove_last(n_clients):
+            arrival, burst, _, start, _ = self.records.pop(client.get_id())
+            migrated.append((client, arrival, burst, start))
+
+        return migrated
+
+    def step(self) -> logic.Queue_Client:
+        """Avanza un tick de la simulación.
+        Devuelve el cliente que terminó en este tick o None."""
+
+        with self.profiler.phase('admit'):
+            admitted = []
+            while self.pending and self.pending[0].get_arrival_time() <= self.time + 1:
+                admitted.append(self.pending.popleft())
+                self.pending_ids.discard(admitted[-1].get_id())
+            if admitted:
+                self.add_clients(admitted)
+
+        self.time += 1
+        self.profiler.count('ticks')
+        if self.collector is not None:
+            self.collector.observe(self.time, max(0, self.queue.get_size() - 2), self.queue.get_size() > 1)
+
+        if self.queue.get_size() <= 1:
+            return None
+
+        client = self.queue.get(1)
+        if self.last_client is not None and client is not self.last_client:
+            self.profiler.count('preemptions')
+
+        record = self.records[client.get_id()]
+        if record[3] is None:
+            record[3] = self.time
+
+        # Unir la sección con la anterior si es el mismo cliente.
+        if self.history_log is not None:
+            self.history_log.add_tick(client.get_id(), self.time)
+        elif self.slices and self.slices[-1][0] == client.get_id() and self.slices[-1][2] == self.time:
+            self.slices[-1][2] += 1
+        else:
+            self.slices.append([client.get_id(), self.time, self.time + 1])
+
+        with self.profiler.phase('dequeue'):
+            done = self.queue.dequeue()
+
+        if done is not None:
+            record[4] = self.time + 1
+            self.last_client = None
+            if self.collector is not None:
+                arrival, burst, _, start, final = record
+                self.collector.add_client(final - arrival - burst, final - arrival, start - arrival)
+                if client.get_deadline() is not None:
+                    self.collector.add_deadline(final - client.get_deadline())
+            if self.history_log is not None:
+                self.history_log.add_client((client.get_id(), *self.records.pop(client.get_id())))
+        else:
+            self.last_client = client
+
+        return done
+
+    def has_client(self, id_client) -> bool:
+        """Verdadero si el id es de un cliente por llegar, en la cola o terminado con su registro aún en memoria.
+        Un cliente nuevo con ese id sobrescribiría su registro."""
+
+        return id_client in self.records or id_client in self.pending_ids
+
+    def is_finished(self) -> bool:
+        """Verdadero si no hay clientes en la cola ni por llegar."""
+
+        return not self.pending and self.queue.get_size() <= 1
+
+    def run(self, max_ticks: int = None) -> None:
+        """Avanza la simulación hasta atender a todos los clientes.
+        max_ticks: Número máximo de ticks a avanzar."""
+
+        ticks = 0
+        while not self.is_finished() and (max_ticks is None or ticks < max_ticks):
+            self.step()
+            ticks += 1
+
+    def results(self) -> list[dict]:
+        """Devuelve los tiempos de cada cliente terminado que sigue en memoria."""
+
+        results = []
+        for id_client, (arrival, burst, priority, start, final) in self.records.items():
+            if final is None:
+                continue
+
+            results.append({
+                'id': id_client,
+                'arrival': arrival,
+                'burst': burst,
+                'priority': priority,
+                'start': start,
+                'final': final,
+                'turnaround': final - arrival,
+                'waiting': final - arrival - burst,
+                'response': start - arrival
+            })
+
+        return results
@@ -0,0 +1,383 @@
+"""Estadísticas en línea de la simulación con memoria constante."""
+
+import array, math
+from statistics import NormalDist
+
+def t_quantile(p: float, df: int) -> float:
+    """Devuelve el cuantil p de la distribución t de Student con df grados de libertad.
+    Es exacto para 1 y 2 grados de libertad y usa la expansión de Cornish-Fisher para los demás,
+    con error menor a 0.01 para p = 0.975 desde 3 grados de libertad y para p = 0.995 desde 5."""
+
+    if df < 1 or not 0 < p < 1:
+        raise ValueError
+
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+
+    z = NormalDist().inv_cdf(p)
+    return (
+        z
+      + (z**3 + z) / (4 * df)
+      + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+      + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * df**3)
+      + (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / (92160 * df**4)
+    )
+
+def confidence_interval(stat: 'Running_Stat', confidence: float = 0.95) -> float:
+    """Devuelve la mitad del ancho del intervalo de confianza t para la media de las observaciones,
+    que se suponen independientes, o None si hay menos de dos."""
+
+    variance = stat.variance()
+    if variance is None:
+        return None
+
+    return t_quantile((1 + confidence) / 2, stat.count - 1) * math.sqrt(variance / stat.count)
+
+class P2_Quantile:
+    """Estima un cuantil en línea con el algoritmo P² de Jain y Chlamtac, usando cinco marcadores."""
+
+    def __init__(self, q: float) -> None:
+        """q: Cuantil a estimar, entre 0 y 1."""
+
+        if not 0 < q < 1:
+            raise ValueError
+
+        self.q = q
+        self.heights: list[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self.increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, x: float) -> None:
+        """Agrega una observación al estimador."""
+
+        heights = self.heights
+        if len(heights) < 5:
+            heights.append(x)
+            heights.sort()
+            return
+
+        # Encontrar la celda de la observación y actualizar los extremos.
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+
+        positions = self.positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Ajustar los marcadores intermedios con interpolación parabólica o lineal.
+        for i in range(1, 4):
+            d = self.desired[i] - positions[i]
+            if     d >= 1 and positions[i + 1] - positions[i] > 1\
+                or d <= -1 and positions[i - 1] - positions[i] < -1:
+                d = 1 if d > 0 else -1
+                height = heights[i] + d / (positions[i + 1] - positions[i - 1]) * (
+                    (positions[i] - positions[i - 1] + d) * (heights[i + 1] - heights[i]) / (positions[i + 1] - positions[i])
+                  + (positions[i + 1] - positions[i] - d) * (heights[i] - heights[i - 1]) / (positions[i] - positions[i - 1])
+                )
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + d * (heights[i + d] - heights[i]) / (positions[i + d] - positions[i])
+
+                heights[i] = height
+                positions[i] += d
+
+    def value(self) -> float:
+        """Devuelve el cuantil estimado o None si no hay observaciones."""
+
+        if not self.heights:
+            return None
+
+        if len(self.heights) < 5:
+            position = (len(self.heights) - 1) * self.q
+            low = int(position)
+            high = min(low + 1, len(self.heights) - 1)
+            return self.heights[low] + (self.heights[high] - self.heights[low]) * (position - low)
+
+        return self.heights[2]
+
+class Running_Stat:
+    """Lleva el conteo, media, varianza, mínimo, máximo y cuantiles de una serie en línea."""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.quantiles = {q: P2_Quantile(q) for q in Running_Stat.QUANTILES}
+
+    def add(self, x: float) -> None:
+        """Agrega una observación con el método de Welford."""
+
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+
+        for estimator in self.quantiles.values():
+            estimator.add(x)
+
+    def variance(self) -> float:
+        """Devuelve la varianza muestral o None si hay menos de dos observaciones."""
+
+        if self.count < 2:
+            return None
+
+        return self.m2 / (self.count - 1)
+
+    def quantile(self, q: float) -> float:
+        """Devuelve el cuantil estimado, que debe estar en QUANTILES."""
+
+        return self.quantiles[q].value()
+
+    def summary(self) -> dict:
+        """Devuelve todas las estadísticas en un diccionario."""
+
+        variance = self.variance()
+        return {
+            'count': self.count,
+            'mean': self.mean if self.count else None,
+            'variance': variance,
+            'std': math.sqrt(variance) if variance is not None else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99)
+        }
+
+class Time_Average:
+    """Promedio ponderado por tiempo de una magnitud que cambia en instantes discretos."""
+
+    def __init__(self) -> None:
+        self.start = None
+        self.last_time = None
+        self.last_value = 0.0
+        self.area = 0.0
+
+    def observe(self, time: float, value: float) -> None:
+        """Registra que la magnitud vale value a partir del instante indicado."""
+
+        if self.last_time is None:
+            self.start = time
+        else:
+            self.area += self.last_value * (time - self.last_time)
+
+        self.last_time = time
+        self.last_value = value
+
+    def value(self) -> float:
+        """Devuelve el promedio hasta la última observación o None si no hay suficientes."""
+
+        if self.last_time is None or self.last_time == self.start:
+            return None
+
+        return self.area / (self.last_time - self.start)
+
+def lttb(points: list[tuple], threshold: int) -> list[tuple]:
+    """Reduce una serie a threshold puntos con Largest-Triangle-Three-Buckets, que conserva la forma visual:
+    deja el primer y el último punto y, de cada cubeta intermedia, el que forma el triángulo de mayor área
+    con el punto elegido antes y el promedio de la cubeta siguiente.
+    points: Pares (x, y) ordenados por x.
+    threshold: Número de puntos a devolver."""
+
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Promedio de la cubeta siguiente, o el último punto para la última cubeta.
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        average_x = sum(point[0] for point in points[next_start:next_end]) / (next_end - next_start)
+        average_y = sum(point[1] for point in points[next_start:next_end]) / (next_end - next_start)
+
+        a_x, a_y = points[a]
+        best_area = -1
+        for j in range(int(i * every) + 1, next_start):
+            x, y = points[j]
+            area = abs((a_x - average_x) * (y - a_y) - (a_x - x) * (average_y - a_y))
+            if area > best_area:
+                best_area = area
+                a = j
+
+        sampled.append(points[a])
+
+    sampled.append(points[-1])
+    return sampled
+
+class Tick_Series:
+    """Valores por tick de varias métricas en buffers circulares de flotantes de 32 bits.
+    Además de los ticks guarda niveles con la media de bloques de FACTOR**j ticks, actualizados al registrar,
+    así que reducir toda la historia a n puntos lee a lo más unos OVERSAMPLE * n bloques sin importar cuántos ticks haya."""
+
+    FACTOR = 4
+    # Bloques leídos por punto pedido, para que LTTB tenga de dónde escoger.
+    OVERSAMPLE = 4
+
+    def __init__(self, names: tuple[str, ...], capacity: int) -> None:
+        """names: Nombre de cada métrica.
+        capacity: Número de ticks que se conservan."""
+
+        self.names = tuple(names)
+        self.capacity = capacity
+        self.count = 0
+        self.first_time = None
+        self.last = [None] * len(self.names)
+        # Por nivel: [ticks por bloque, bloques guardados, buffer circular por métrica, suma del bloque en curso por métrica].
+        self.levels: list[list] = []
+        size = 1
+        while size <= capacity:
+            blocks = capacity // size
+            self.levels.append([size, blocks, [array.array('f', bytes(4 * blocks)) for _ in self.names], [0.0] * len(self.names)])
+            size *= Tick_Series.FACTOR
+
+    def record(self, time: int, *values: float) -> None:
+        """Registra los valores de cada métrica en el tick indicado. Los ticks deben ser consecutivos."""
+
+        if self.first_time is None:
+            self.first_time = time
+
+        count = self.count + 1
+        self.last = list(values)
+        for size, blocks, buffers, sums in self.levels:
+            if size == 1:
+                position = self.count % blocks
+                for buffer, value in zip(buffers, values):
+                    buffer[position] = value
+                continue
+
+            for i, value in enumerate(values):
+                sums[i] += value
+
+            if count % size == 0:
+                position = (count // size - 1) % blocks
+                for i, buffer in enumerate(buffers):
+                    buffer[position] = sums[i] / size
+                    sums[i] = 0.0
+
+        self.count = count
+
+    def points(self, name: str, n_points: int, span: int = None) -> list[tuple]:
+        """Devuelve hasta n_points pares (tick, valor) de la métrica reducidos con lttb.
+        Lee el nivel más fino que tenga a lo más OVERSAMPLE * n_points bloques en el rango; el bloque en curso
+        se incluye con el promedio de sus ticks para que el último punto esté al día.
+        name: Nombre de la métrica.
+        n_points: Número máximo de puntos.
+        span: Número de ticks recientes a incluir. Por defecto, todos los que se conservan."""
+
+        metric = self.names.index(name)
+        span = min(self.count, self.capacity) if span is None else min(span, self.count, self.capacity)
+        if span == 0:
+            return []
+
+        for size, blocks, buffers, sums in self.levels:
+            if span // size <= n_points * Tick_Series.OVERSAMPLE:
+                break
+
+        buffer = buffers[metric]
+        complete = self.count // size
+        points = [
+            (self.first_time + k * size + (size - 1) / 2, buffer[k % blocks])
+            for k in range(max((self.count - span) // size, complete - blocks), complete)
+        ]
+
+        partial = self.count % size
+        if partial:
+            points.append((self.first_time + complete * size + (partial - 1) / 2, sums[metric] / partial))
+
+        return lttb(points, n_points)
+
+class Stats_Collector:
+    """Recolecta las estadísticas de los clientes terminados y del estado de la cola."""
+
+    def __init__(self) -> None:
+        self.waiting = Running_Stat()
+        self.turnaround = Running_Stat()
+        self.response = Running_Stat()
+        self.queue_length = Time_Average()
+        self.utilization = Time_Average()
+        # Retraso, final menos plazo, de los clientes terminados con plazo, y cuántos terminaron después de él.
+        self.lateness = Running_Stat()
+        self.misses = 0
+
+    def add_client(self, waiting: float, turnaround: float, response: float) -> None:
+        """Registra los tiempos de un cliente que terminó.
+        waiting: Tiempo de espera.
+        turnaround: Tiempo de retorno.
+        response: Tiempo desde la llegada hasta la primera atención."""
+
+        self.waiting.add(waiting)
+        self.turnaround.add(turnaround)
+        self.response.add(response)
+
+    def add_deadline(self, lateness: float) -> None:
+        """Registra el retraso de un cliente con plazo que terminó.
+        lateness: Tiempo final menos plazo. Es positivo si el plazo se venció."""
+
+        self.lateness.add(lateness)
+        if lateness > 0:
+            self.misses += 1
+
+    def observe(self, time: float, queue_length: int, busy: bool) -> None:
+        """Registra el estado de la cola a partir del instante indicado.
+        time: Instante de la observación.
+        queue_length: Número de clientes esperando.
+        busy: Verdadero si el cajero está atendiendo."""
+
+        self.queue_length.observe(time, queue_length)
+        self.utilization.observe(time, 1 if busy else 0)
+
+    def summary(self) -> dict:
+        """Devuelve todas las estadísticas en un diccionario."""
+
+        return {
+            'waiting': self.waiting.summary(),
+            'turnaround': self.turnaround.summary(),
+            'response': self.response.summary(),
+            'queue_length': self.queue_length.value(),
+            'utilization': self.utilization.value(),
+            'lateness': self.lateness.summary(),
+            'misses': self.misses,
+            'miss_rate': self.misses / self.lateness.count if self.lateness.count else None
+        }
+
+    def __str__(self) -> str:
+        def number(value: float) -> str:
+            return '-' if value is None else f'{value:.1f}'
+
+        waiting = self.waiting
+        turnaround = self.turnaround
+        utilization = self.utilization.value()
+        text = (
+            f'Espera {number(waiting.mean if waiting.count else None)}/{number(waiting.quantile(0.95))}/{number(waiting.quantile(0.99))}'
+            f' · Retorno {number(turnaround.mean if turnaround.count else None)}/{number(turnaround.quantile(0.95))}/{number(turnaround.quantile(0.99))}'
+            f' · Cola {number(self.queue_length.value())}'
+            f' · Uso {"-" if utilization is None else f"{utilization:.0%}"}'
+        )
+        if self.lateness.count:
+            text += f' · Vencidos {self.misses / self.lateness.count:.1%} · Retraso {number(self.lateness.mean)}/{number(self.lateness.max)}'
+
+        return text
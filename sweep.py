@@ -0,0 +1,147 @@
+"""Barrido de parámetros en paralelo sobre configuraciones del planificador."""
+
+import argparse, csv, hashlib, itertools, json, os, random
+import simulation
+from concurrent.futures import ProcessPoolExecutor
+
+COLUMNS = ('hash', 'policy', 'quantum', 'load', 'distribution', 'n_clients', 'seed', 'clients',
+           'mean_wait', 'p95_wait', 'p99_wait', 'mean_turnaround', 'p95_turnaround', 'p99_turnaround')
+
+def grid(policies: list[str], quanta: list[int], loads: list[float], distributions: list[str], n_clients: int, seed: int = 0) -> list[dict]:
+    """Devuelve todas las combinaciones de los valores indicados como configuraciones.
+    policies: Políticas de la cola de servidor.
+    quanta: Capacidades del cajero por turno. 0 atiende hasta terminar.
+    loads: Factores de carga.
+    distributions: Distribuciones de ráfaga.
+    n_clients: Número de clientes por simulación.
+    seed: Semilla de los clientes de cada simulación."""
+
+    return [
+        {'policy': policy, 'quantum': quantum, 'load': load, 'distribution': distribution, 'n_clients': n_clients, 'seed': seed}
+        for policy, quantum, load, distribution in itertools.product(policies, quanta, loads, distributions)
+    ]
+
+def latin_hypercube(n_points: int, policies: list[str], quanta: tuple[int, int], loads: tuple[float, float], distributions: list[str], n_clients: int, seed: int = 0) -> list[dict]:
+    """Devuelve configuraciones muestreadas por hipercubo latino.
+    Cada dimensión se divide en n_points estratos y cada estrato se usa exactamente una vez.
+    n_points: Número de configuraciones.
+    policies: Políticas de la cola de servidor.
+    quanta: Capacidad mínima y máxima del cajero por turno.
+    loads: Factor de carga mínimo y máximo.
+    distributions: Distribuciones de ráfaga.
+    n_clients: Número de clientes por simulación.
+    seed: Semilla del muestreo y de los clientes de cada simulación."""
+
+    rng = random.Random(seed)
+
+    def strata() -> list[float]:
+        """Devuelve un valor aleatorio en [0, 1) por estrato, en orden aleatorio."""
+
+        values = [(i + rng.random()) / n_points for i in range(n_points)]
+        rng.shuffle(values)
+        return values
+
+    configs = []
+    for u_policy, u_quantum, u_load, u_distribution in zip(strata(), strata(), strata(), strata()):
+        configs.append({
+            'policy': policies[int(u_policy * len(policies))],
+            'quantum': quanta[0] + int(u_quantum * (quanta[1] - quanta[0] + 1)),
+            'load': round(loads[0] + u_load * (loads[1] - loads[0]), 4),
+            'distribution': distributions[int(u_distribution * len(distributions))],
+            'n_clients': n_clients,
+            'seed': seed
+        })
+
+    return configs
+
+def config_hash(config: dict) -> str:
+    """Devuelve un identificador estable de la configuración."""
+
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+def run_point(config: dict) -> dict:
+    """Simula una configuración y devuelve su fila de resultados.
+    FIFO con capacidad 0 usa el camino rápido de fastpath si NumPy está instalado; el resultado es el mismo."""
+
+    clients = simulation.generate_clients(
+        config['n_clients'],
+        config['load'],
+        config['distribution'],
+        config['policy'] == 'Priority',
+        config['seed']
+    )
+
+    if config['policy'] == 'FIFO' and config['quantum'] == 0:
+        try:
+            import fastpath
+        except ImportError:
+            pass
+        else:
+            return {'hash': config_hash(config), **config, **simulation.summarize(fastpath.results(clients))}
+
+    sim = simulation.Simulation(simulation.create_queue(config['policy'], config['quantum']), clients)
+    sim.run()
+
+    return {'hash': config_hash(config), **config, **simulation.summarize(sim.results())}
+
+def sweep(configs: list[dict], cache_dir: str = None, workers: int = None, chunksize: int = 1) -> list[dict]:
+    """Simula las configuraciones en un grupo de procesos y devuelve sus filas de resultados.
+    Las configuraciones con resultado en la caché no se vuelven a simular.
+    configs: Configuraciones a simular.
+    cache_dir: Carpeta con un archivo JSON por configuración terminada. Si es None, no se usa caché.
+    workers: Número de procesos. Por defecto, el número de núcleos.
+    chunksize: Número de configuraciones enviadas a la vez a cada proceso."""
+
+    rows = {}
+    pending = []
+    for config in configs:
+        path = os.path.join(cache_dir, f'{config_hash(config)}.json') if cache_dir else None
+        if path and os.path.exists(path):
+            with open(path) as file:
+                rows[config_hash(config)] = json.load(file)
+        else:
+            pending.append(config)
+
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(workers) as executor:
+        for row in executor.map(run_point, pending, chunksize=chunksize):
+            rows[row['hash']] = row
+            if cache_dir:
+                with open(os.path.join(cache_dir, f'{row["hash"]}.json'), 'w') as file:
+                    json.dump(row, file)
+
+    return [rows[config_hash(config)] for config in configs]
+
+def write_table(rows: list[dict], path: str) -> None:
+    """Escribe las filas de resultados como CSV, una fila por configuración."""
+
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mode', choices=('grid', 'lhs'), default='grid')
+    parser.add_argument('--policies', nargs='+', choices=simulation.POLICIES, default=list(simulation.POLICIES))
+    parser.add_argument('--quanta', nargs='+', type=int, default=[0, 2, 5], help='Valores en grid; mínimo y máximo en lhs.')
+    parser.add_argument('--loads', nargs='+', type=float, default=[0.5, 0.8, 0.95], help='Valores en grid; mínimo y máximo en lhs.')
+    parser.add_argument('--distributions', nargs='+', choices=tuple(simulation.BURST_DISTRIBUTIONS), default=list(simulation.BURST_DISTRIBUTIONS))
+    parser.add_argument('--points', type=int, default=50, help='Número de configuraciones en lhs.')
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=4)
+    parser.add_argument('--cache', default='.sweep_cache')
+    parser.add_argument('--output', default='sweep.csv')
+    args = parser.parse_args()
+
+    if args.mode == 'grid':
+        configs = grid(args.policies, args.quanta, args.loads, args.distributions, args.clients, args.seed)
+    else:
+        configs = latin_hypercube(args.points, args.policies, (min(args.quanta), max(args.quanta)),
+                                  (min(args.loads), max(args.loads)), args.distributions, args.clients, args.seed)
+
+    write_table(sweep(configs, args.cache, args.workers, args.chunksize), args.output)
@@ -0,0 +1,252 @@
+"""Vista de terminal con curses para seguir una simulación sin pantalla, por ejemplo por SSH."""
+
+import argparse, curses, itertools, locale, random, time
+from collections import deque
+import params, simulation, stats
+
+# Filas del diagrama de Gantt y de clientes terminados que se muestran.
+GANTT_LANES = 8
+FINISHED_ROWS = 50
+# Ancho de cada columna de la tabla y del nombre de cada carril.
+CELL_WIDTH = 10
+LABEL_WIDTH = 8
+
+TABLE_COLUMNS = ('Proceso', 'Estado', 'Llegada', 'Prioridad', 'Ráfaga', 'Restante', 'Comienzo', 'Final', 'Retorno', 'Espera')
+
+class Recent_History:
+    """Historial acotado en memoria con la interfaz de history.History que usa simulation.Simulation:
+    el cliente atendido en cada uno de los últimos ticks y las filas de los últimos clientes terminados."""
+
+    def __init__(self, ticks: int, rows: int) -> None:
+        """ticks: Número de ticks recordados.
+        rows: Número de clientes terminados recordados."""
+
+        # (tick, id) del cliente atendido en cada tick.
+        self.ticks: deque[tuple] = deque(maxlen=ticks)
+        # (id, llegada, ráfaga, prioridad, comienzo, final), el más reciente al final.
+        self.clients: deque[tuple] = deque(maxlen=rows)
+
+    def add_tick(self, id_client: str, time: int) -> None:
+        self.ticks.append((time, id_client))
+
+    def add_client(self, row: tuple) -> None:
+        self.clients.append(row)
+
+class Terminal_View:
+    """Dibuja el estado de una simulación.Simulation en una ventana de curses.
+    Sólo se escriben las líneas que cambiaron desde el último dibujo y curses envía a la terminal
+    únicamente las celdas distintas, así que refrescar cuesta poco aunque la cola sea grande."""
+
+    def __init__(self, screen, sim: simulation.Simulation, recent: Recent_History, collector: stats.Stats_Collector, title: str) -> None:
+        """screen: Ventana principal de curses.
+        sim: Simulación a mostrar, creada con recent como historial.
+        recent: Historial acotado de la simulación.
+        collector: Recolector de estadísticas de la simulación.
+        title: Texto al inicio del encabezado."""
+
+        self.screen = screen
+        self.sim = sim
+        self.recent = recent
+        self.collector = collector
+        self.title = title
+        # Texto escrito en cada fila de la pantalla.
+        self.lines: dict[int, str] = {}
+
+    def reset(self) -> None:
+        """Olvida lo dibujado para volver a escribir todo, por ejemplo al cambiar el tamaño de la terminal."""
+
+        self.lines.clear()
+        self.screen.clear()
+
+    def put(self, y: int, text: str, attribute: int = 0) -> None:
+        """Escribe una fila completa si su texto cambió."""
+
+        height, width = self.screen.getmaxyx()
+        if y >= height:
+            return
+
+        # La última columna de la última fila no se puede escribir sin mover el cursor fuera de la ventana.
+        text = text[:width - 1].ljust(width - 1)
+        if self.lines.get(y) == text:
+            return
+
+        self.lines[y] = text
+        self.screen.addstr(y, 0, text, attribute)
+
+    def gantt(self, width: int) -> list[str]:
+        """Devuelve las líneas del diagrama de Gantt con los últimos ticks que caben en el ancho indicado."""
+
+        ticks = width - LABEL_WIDTH
+        end = self.sim.time + 1
+        start = max(1, end - ticks)
+
+        served = {}
+        lanes = []
+        for time, id_client in self.recent.ticks:
+            if time >= start:
+                served[time] = id_client
+                if id_client not in lanes:
+                    lanes.append(id_client)
+
+        # Completar los carriles con los siguientes clientes en la cola.
+        for client in itertools.islice(self.sim.queue, 1, None):
+            if len(lanes) >= GANTT_LANES:
+                break
+            if client.get_id() not in lanes:
+                lanes.append(client.get_id())
+
+        finished = {row[0]: row for row in self.recent.clients}
+        lines = [' ' * LABEL_WIDTH + ''.join('|' if time % 10 == 0 else ' ' for time in range(start, end))]
+        for id_client in lanes[-GANTT_LANES:]:
+            record = self.sim.records.get(id_client)
+            if record is not None:
+                arrival, final = record[0], end
+            elif id_client in finished:
+                arrival, final = finished[id_client][1], finished[id_client][5]
+            else:
+                # Terminó hace más de FINISHED_ROWS clientes: sólo se marcan sus ticks de atención.
+                arrival = final = start
+            cells = []
+            for time in range(start, end):
+                if served.get(time) == id_client:
+                    cells.append('#')
+                elif arrival <= time < final:
+                    cells.append('-')
+                else:
+                    cells.append(' ')
+            lines.append(str(id_client)[:LABEL_WIDTH - 1].ljust(LABEL_WIDTH) + ''.join(cells))
+
+        return lines
+
+    def table_rows(self, n_rows: int) -> list[str]:
+        """Devuelve las filas de la tabla: los clientes en la cola y después los terminados más recientes."""
+
+        def row(values) -> str:
+            return ''.join(('-' if value is None else str(value))[:CELL_WIDTH - 1].ljust(CELL_WIDTH) for value in values)
+
+        rows = [row(TABLE_COLUMNS)]
+        front = self.sim.queue.get(1) if self.sim.queue.get_size() > 1 else None
+        for client in itertools.islice(self.sim.queue, 1, n_rows):
+            arrival, burst, priority, start, _ = self.sim.records[client.get_id()]
+            state = 'En Ejecución' if client is front and start is not None else 'Esperando'
+            rows.append(row((client.get_id(), state, arrival, priority, burst, client.get_number_of_requests(), start, None, None, None)))
+
+        for id_client, arrival, burst, priority, start, final in reversed(self.recent.clients):
+            if len(rows) >= n_rows:
+                break
+            rows.append(row((id_client, 'Terminado', arrival, priority, burst, 0, start, final, final - arrival, final - arrival - burst)))
+
+        return rows
+
+    def draw(self, status: str) -> None:
+        """Dibuja el estado actual de la simulación.
+        status: Texto de estado al final del encabezado, como la velocidad."""
+
+        height, width = self.screen.getmaxyx()
+        sim = self.sim
+        waiting = max(0, sim.queue.get_size() - 2)
+
+        lines = [
+            (f'{self.title} · Tiempo {sim.time} · En espera {waiting} · {status}', curses.A_BOLD),
+            (str(self.collector), 0),
+            ('', 0)
+        ]
+        lines += [(line, 0) for line in self.gantt(width - 1)]
+
+        queue_text = ' '.join(
+            f'{client.get_id()}({client.get_number_of_requests()})'
+            for client in itertools.islice(sim.queue, 1, width // 3)
+        )
+        lines += [('', 0), (f'Cola: {queue_text}', 0), ('', 0)]
+
+        table = self.table_rows(max(1, height - len(lines)))
+        lines += [(table[0], curses.A_UNDERLINE)] + [(line, 0) for line in table[1:]]
+
+        for y, (line, attribute) in enumerate(lines):
+            self.put(y, line, attribute)
+        for y in range(len(lines), height):
+            self.put(y, '')
+
+        self.screen.noutrefresh()
+        curses.doupdate()
+
+def run(screen, args) -> None:
+    """Avanza la simulación al ritmo indicado y redibuja cada args.refresh segundos.
+    Teclas: q sale, espacio pausa, + y - cambian la velocidad."""
+
+    curses.curs_set(0)
+    screen.nodelay(True)
+
+    recent = Recent_History(1000, FINISHED_ROWS)
+    slack = args.slack if args.policy in simulation.DEADLINE_POLICIES else None
+    collector = stats.Stats_Collector()
+    sim = simulation.Simulation(
+        simulation.create_queue(args.policy, args.quantum, args.skip_late),
+        simulation.generate_clients(args.clients, args.load, 'uniform', args.policy == 'Priority', args.seed, slack) if args.clients else (),
+        collector=collector,
+        history_log=recent
+    )
+    view = Terminal_View(screen, sim, recent, collector, f'ATMQueue · {args.policy}')
+
+    server = None
+    if args.ingest:
+        import ingest
+        server = ingest.Ingest_Server(params.INGEST_ADDRESS, params.INGEST_CAPACITY)
+        server.start()
+        # Prioridades de las llegadas que no traen una, independientes de los clientes generados.
+        rng = random.Random(args.seed)
+
+    ticks_per_second = args.ticks_per_second
+    paused = False
+    next_tick = next_draw = time.monotonic()
+
+    while True:
+        key = screen.getch()
+        if key == ord('q'):
+            return
+        if key == ord(' '):
+            paused = not paused
+        elif key == ord('+'):
+            ticks_per_second *= 2
+        elif key == ord('-'):
+            ticks_per_second /= 2
+        elif key == curses.KEY_RESIZE:
+            view.reset()
+
+        now = time.monotonic()
+        if not paused:
+            # Avanzar los ticks que tocan hasta ahora, sin pasar del siguiente dibujo.
+            while next_tick <= now and time.monotonic() < next_draw + args.refresh:
+                if server is not None:
+                    server.admit(sim, args.policy, rng, params.INGEST_MAX_PER_TICK, slack)
+
+                sim.step()
+                next_tick += 1 / ticks_per_second
+        else:
+            next_tick = now
+
+        if now >= next_draw:
+            received = f' · Recibidos {server.received} · Repetidos {server.duplicates}' if server is not None else ''
+            view.draw(f'{ticks_per_second:g} ticks/s{" · En pausa" if paused else ""}{received} · [q] salir [espacio] pausa [+/-] velocidad')
+            next_draw = now + args.refresh
+
+        # Dormir hasta el siguiente tick o dibujo.
+        time.sleep(max(0, min(next_draw, next_tick if not paused else next_draw) - time.monotonic()))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--policy', choices=simulation.POLICIES + simulation.DEADLINE_POLICIES, default='SRTF')
+    parser.add_argument('--quantum', type=int, default=params.SERVER_CAPACITY)
+    parser.add_argument('--clients', type=int, default=10000, help='Clientes generados. 0 para sólo recibir por el socket.')
+    parser.add_argument('--load', type=float, default=0.9)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--slack', type=float, default=params.DEADLINE_SLACK, help='Con EDF, plazo de cada cliente en veces su ráfaga.')
+    parser.add_argument('--skip-late', action='store_true', help='Con EDF, atender al final a los clientes que ya no terminan a tiempo.')
+    parser.add_argument('--ticks-per-second', type=float, default=1000 / params.AUTOMATIC_RESPOND_TIME)
+    parser.add_argument('--refresh', type=float, default=params.TUI_REFRESH_TIME, help='Segundos entre dibujos.')
+    parser.add_argument('--ingest', action='store_true', help='Recibir clientes por el socket de params.INGEST_ADDRESS.')
+    args = parser.parse_args()
+
+    # Para que curses escriba acentos con la codificación de la terminal.
+    locale.setlocale(locale.LC_ALL, '')
+    curses.wrapper(run, args)
@@ -0,0 +1,165 @@
+"""Búsqueda de la capacidad por turno del cajero con división sucesiva o Hyperband."""
+
+import argparse, json, math, random, time
+from concurrent.futures import ProcessPoolExecutor
+import offline, simulation
+
+# Métricas de simulation.summarize que se pueden minimizar.
+METRICS = ('mean_wait', 'p95_wait', 'p99_wait', 'mean_turnaround', 'p95_turnaround', 'p99_turnaround')
+
+def space(policies: list[str], quanta: tuple[int, int]) -> list[tuple[str, int]]:
+    """Devuelve los candidatos (política, capacidad) de la búsqueda.
+    policies: Políticas de la cola de servidor.
+    quanta: Capacidad mínima y máxima por turno. 0 atiende hasta terminar."""
+
+    return [(policy, quantum) for policy in policies for quantum in range(quanta[0], quanta[1] + 1)]
+
+def evaluate(candidate: tuple[str, int], workload: dict, n_clients: int) -> float:
+    """Devuelve la métrica del candidato con los primeros n_clients clientes de la carga.
+    Todos los candidatos reciben los mismos clientes, y los presupuestos menores son prefijos del mayor,
+    pues simulation.generate_clients los genera en orden con la misma semilla.
+    candidate: (política, capacidad).
+    workload: Carga, distribución, semilla y métrica.
+    n_clients: Número de clientes simulados, que es el presupuesto de la evaluación."""
+
+    policy, quantum = candidate
+    # Las prioridades se generan siempre para que todas las políticas reciban los mismos números aleatorios;
+    # sólo Priority las usa.
+    clients = simulation.generate_clients(n_clients, workload['load'], workload['distribution'], True, workload['seed'])
+    return simulation.summarize(offline.Batch_Schedule(policy, clients, quantum).results())[workload['metric']]
+
+class Tuner:
+    """Evalúa candidatos por rondas en un grupo de procesos y guarda cada evaluación,
+    para no repetir un candidato con el mismo presupuesto en distintos grupos de Hyperband."""
+
+    def __init__(self, workload: dict, workers: int = 0) -> None:
+        """workload: Carga, distribución, semilla y métrica, como para evaluate.
+        workers: Número de procesos para las evaluaciones de cada ronda. 0 para no crear procesos."""
+
+        self.workload = workload
+        self.pool = ProcessPoolExecutor(workers) if workers > 0 else None
+        # Métrica por (candidato, presupuesto).
+        self.results: dict[tuple, float] = {}
+        # Evaluaciones en orden: (grupo, ronda, candidato, presupuesto, métrica).
+        self.log: list[tuple] = []
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def run_rung(self, candidates: list[tuple], n_clients: int, bracket: int, rung: int) -> list[float]:
+        """Evalúa los candidatos con el presupuesto indicado y devuelve sus métricas en el mismo orden."""
+
+        pending = [candidate for candidate in candidates if (candidate, n_clients) not in self.results]
+        workloads = [self.workload] * len(pending)
+        budgets = [n_clients] * len(pending)
+        values = self.pool.map(evaluate, pending, workloads, budgets) if self.pool is not None else map(evaluate, pending, workloads, budgets)
+        for candidate, value in zip(pending, values):
+            self.results[candidate, n_clients] = value
+
+        for candidate in candidates:
+            self.log.append((bracket, rung, candidate, n_clients, self.results[candidate, n_clients]))
+        return [self.results[candidate, n_clients] for candidate in candidates]
+
+    def successive_halving(self, candidates: list[tuple], min_clients: int, max_clients: int, eta: int = 3, bracket: int = 0) -> tuple[tuple, float]:
+        """Evalúa todos los candidatos con min_clients y conserva la mejor 1/eta parte en cada ronda,
+        multiplicando el presupuesto por eta, hasta evaluar a los que quedan con max_clients.
+        Devuelve el mejor candidato y su métrica con el presupuesto completo."""
+
+        n_clients = min_clients
+        rung = 0
+        while True:
+            values = self.run_rung(candidates, n_clients, bracket, rung)
+            ranked = [candidate for _, candidate in sorted(zip(values, candidates), key=lambda pair: pair[0])]
+            if n_clients >= max_clients:
+                return ranked[0], self.results[ranked[0], n_clients]
+
+            candidates = ranked[:max(1, len(candidates) // eta)]
+            # Los últimos candidatos se evalúan directamente con el presupuesto completo.
+            n_clients = max_clients if len(candidates) == 1 else min(max_clients, n_clients * eta)
+            rung += 1
+
+    def hyperband(self, candidates: list[tuple], min_clients: int, max_clients: int, eta: int = 3, seed: int = 0) -> tuple[tuple, float]:
+        """Repite la división sucesiva con distintos compromisos entre número de candidatos y presupuesto inicial,
+        desde muchos candidatos con min_clients hasta pocos con max_clients, muestreados sin reemplazo.
+        Devuelve el mejor candidato con el presupuesto completo y su métrica."""
+
+        rng = random.Random(seed)
+        s_max = max(0, int(math.log(max_clients / min_clients, eta) + 1e-9))
+        best = None
+        for s in range(s_max, -1, -1):
+            n_candidates = min(len(candidates), math.ceil((s_max + 1) / (s + 1) * eta**s))
+            sample = rng.sample(candidates, n_candidates)
+            candidate, value = self.successive_halving(sample, max(min_clients, max_clients // eta**s), max_clients, eta, s_max - s)
+            if best is None or value < best[1]:
+                best = (candidate, value)
+
+        return best
+
+def tune(candidates: list[tuple], workload: dict, min_clients: int, max_clients: int, eta: int = 3, method: str = 'halving', seed: int = 0, workers: int = 0) -> dict:
+    """Busca el candidato que minimiza la métrica de la carga y devuelve el mejor y todas las evaluaciones.
+    candidates: Candidatos (política, capacidad), por ejemplo de space.
+    workload: Carga, distribución, semilla y métrica, como para evaluate.
+    min_clients: Presupuesto de la primera ronda.
+    max_clients: Presupuesto completo.
+    eta: Factor de reducción de candidatos y de aumento de presupuesto por ronda.
+    method: 'halving' o 'hyperband'.
+    seed: Semilla del muestreo de Hyperband.
+    workers: Número de procesos. 0 para no crear procesos."""
+
+    if not candidates:
+        raise ValueError('No hay candidatos que evaluar.')
+
+    tuner = Tuner(workload, workers)
+    try:
+        if method == 'halving':
+            (policy, quantum), value = tuner.successive_halving(candidates, min_clients, max_clients, eta)
+        else:
+            (policy, quantum), value = tuner.hyperband(candidates, min_clients, max_clients, eta, seed)
+    finally:
+        tuner.close()
+
+    return {
+        **workload,
+        'policy': policy,
+        'quantum': quantum,
+        'value': value,
+        'evaluations': len(tuner.results),
+        'simulated_clients': sum(n_clients for _, n_clients in tuner.results),
+        'log': [
+            {'bracket': bracket, 'rung': rung, 'policy': policy, 'quantum': quantum, 'clients': n_clients, 'value': value}
+            for bracket, rung, (policy, quantum), n_clients, value in tuner.log
+        ]
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--method', choices=('halving', 'hyperband'), default='halving')
+    parser.add_argument('--policies', nargs='+', choices=simulation.POLICIES, default=['FIFO'], help='Políticas a buscar junto con la capacidad.')
+    parser.add_argument('--quanta', nargs=2, type=int, default=[0, 30], help='Capacidad mínima y máxima por turno. 0 atiende hasta terminar.')
+    parser.add_argument('--metric', choices=METRICS, default='p95_wait')
+    parser.add_argument('--load', type=float, default=0.9)
+    parser.add_argument('--distribution', choices=tuple(simulation.BURST_DISTRIBUTIONS), default='bimodal')
+    parser.add_argument('--min-clients', type=int, default=1000, help='Clientes de la primera ronda.')
+    parser.add_argument('--max-clients', type=int, default=100000, help='Clientes de la evaluación completa.')
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--output', help='Archivo JSON con todas las evaluaciones.')
+    args = parser.parse_args()
+    if not 0 <= args.quanta[0] <= args.quanta[1]:
+        parser.error('--quanta requiere 0 <= MIN <= MAX')
+
+    workload = {'load': args.load, 'distribution': args.distribution, 'seed': args.seed, 'metric': args.metric}
+    candidates = space(args.policies, tuple(args.quanta))
+    start = time.perf_counter()
+    result = tune(candidates, workload, args.min_clients, args.max_clients, args.eta, args.method, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(f'{len(candidates)} candidatos · {result["evaluations"]} evaluaciones · {result["simulated_clients"]} clientes simulados en {elapsed:.1f} s'
+          f' ({result["simulated_clients"] / (len(candidates) * args.max_clients):.1%} de una búsqueda exhaustiva)')
+    print(f'Mejor: {result["policy"]} con capacidad {result["quantum"]} · {args.metric} {result["value"]:.3f}')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(result, file, indent=2)
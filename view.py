@@ -1,8 +1,210 @@
 """Representaciones gráficas para la simulación gráfica de una cola de cajero."""
 
-import pygame, math, pandas, numpy
-import logic, params
-from typing import Callable
+import abc, pygame
+import logic, params, instrument, stats
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, TYPE_CHECKING
+
+# Pandas sólo se necesita para las anotaciones; importarlo aquí retrasaría la ventana.
+if TYPE_CHECKING:
+    import pandas
+
+@lru_cache
+def get_font(font_name: str = None, font_size: int = None) -> pygame.font.Font:
+    """Devuelve la fuente del sistema indicada. Cada fuente se busca y se crea una sola vez.
+    font_name: Nombre de una fuente en el sistema. Por defecto, Arial.
+    font_size: Tamaño de la fuente. Por defecto, 10."""
+
+    return pygame.font.SysFont(font_name if font_name else 'Arial', font_size if font_size else 10)
+
+@lru_cache(maxsize=params.TEXT_CACHE_SIZE)
+def render_text(font: pygame.font.Font, text: str, color: str) -> pygame.Surface:
+    """Devuelve el texto dibujado con la fuente y color indicados. Los textos recientes se dibujan una sola vez
+    y conservan la misma superficie, así que el lienzo también reutiliza su versión convertida."""
+
+    return font.render(text, True, color)
+
+class Canvas(abc.ABC):
+    """Lienzo sobre el que dibujan los componentes. Cada backend guarda una versión lista para dibujar
+    de cada superficie: las superficies de texto por identidad, en un caché acotado, y las de los
+    componentes que cambian poco por ranura, que se vuelve a subir sólo cuando la superficie es otra."""
+
+    name = None
+
+    def __init__(self) -> None:
+        # Ranura -> (superficie, imagen) e id(superficie) -> (superficie, imagen), el menos usado primero.
+        self.slots: dict = {}
+        self.cache: OrderedDict[int, tuple] = OrderedDict()
+
+    def image(self, surface: pygame.Surface, slot=None):
+        """Devuelve la versión lista para dibujar de la superficie, creándola sólo si no está guardada.
+        surface: Superficie a dibujar.
+        slot: Llave de la ranura de la superficie. None para guardarla en el caché de textos."""
+
+        if slot is not None:
+            cached = self.slots.get(slot)
+            if cached is None or cached[0] is not surface:
+                cached = self.slots[slot] = (surface, self.upload(surface))
+            return cached[1]
+
+        # Se guarda la superficie junto a su imagen para que su id no se reutilice mientras esté en el caché.
+        cached = self.cache.get(id(surface))
+        if cached is not None and cached[0] is surface:
+            self.cache.move_to_end(id(surface))
+            return cached[1]
+
+        cached = self.cache[id(surface)] = (surface, self.upload(surface))
+        if len(self.cache) > params.CANVAS_CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return cached[1]
+
+    def blit(self, surface: pygame.Surface, pos: tuple[float, float], area: pygame.Rect = None, slot=None) -> None:
+        """Dibuja la superficie, o la parte area de ella, con su esquina superior izquierda en pos.
+        slot: Llave de la ranura de la superficie, como en image."""
+
+        # Las texturas no pueden medir 0, como las superficies vacías del diagrama de Grant al inicio.
+        if surface.get_width() == 0 or surface.get_height() == 0:
+            return
+
+        self.draw_image(self.image(surface, slot), pos, area)
+
+    @abc.abstractmethod
+    def upload(self, surface: pygame.Surface):
+        """Devuelve la versión lista para dibujar de la superficie."""
+
+    @abc.abstractmethod
+    def draw_image(self, image, pos: tuple[float, float], area: pygame.Rect = None) -> None:
+        """Dibuja una imagen devuelta por upload, o la parte area de ella, con su esquina superior izquierda en pos."""
+
+    @abc.abstractmethod
+    def fill(self, color: str) -> None:
+        """Llena todo el lienzo con el color indicado."""
+
+    @abc.abstractmethod
+    def rect(self, color: str, rect: pygame.Rect, width: int = 0) -> None:
+        """Dibuja un rectángulo relleno o, si width es mayor a 0, su contorno hacia adentro como pygame.draw.rect."""
+
+    @abc.abstractmethod
+    def present(self) -> None:
+        """Muestra en la ventana lo dibujado en el cuadro."""
+
+class Software_Canvas(Canvas):
+    """Lienzo sobre la superficie de la ventana de pygame.display. Las superficies se convierten una vez
+    al formato de la pantalla para que cada blit no tenga que convertir pixeles."""
+
+    name = 'software'
+
+    def __init__(self, screen: pygame.Surface) -> None:
+        """screen: Superficie de la ventana devuelta por pygame.display.set_mode."""
+
+        super().__init__()
+        self.screen = screen
+
+    def upload(self, surface: pygame.Surface) -> pygame.Surface:
+        return surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+
+    def draw_image(self, image: pygame.Surface, pos: tuple[float, float], area: pygame.Rect = None) -> None:
+        self.screen.blit(image, pos, area)
+
+    def fill(self, color: str) -> None:
+        self.screen.fill(color)
+
+    def rect(self, color: str, rect: pygame.Rect, width: int = 0) -> None:
+        pygame.draw.rect(self.screen, color, rect, width)
+
+    def present(self) -> None:
+        pygame.display.update()
+
+class Renderer_Canvas(Canvas):
+    """Lienzo sobre un Renderer de SDL2. Las superficies se suben una vez como texturas y cada cuadro
+    sólo las compone, en la GPU si hay una o con el renderizador por software de SDL si no."""
+
+    name = 'renderer'
+
+    def __init__(self, renderer) -> None:
+        """renderer: pygame._sdl2.video.Renderer de la ventana."""
+
+        super().__init__()
+        self.renderer = renderer
+
+    def upload(self, surface: pygame.Surface):
+        from pygame._sdl2 import video
+        return video.Texture.from_surface(self.renderer, surface)
+
+    def draw_image(self, image, pos: tuple[float, float], area: pygame.Rect = None) -> None:
+        bounds = pygame.Rect(0, 0, image.width, image.height)
+        if area is None:
+            source = bounds
+        else:
+            # SDL recorta el origen a la textura pero no el destino, así que se recortan ambos aquí.
+            area = pygame.Rect(area)
+            source = area.clip(bounds)
+            pos = (pos[0] + source.x - area.x, pos[1] + source.y - area.y)
+
+        if source.width > 0 and source.height > 0:
+            image.draw(source, pygame.Rect(pos, source.size))
+
+    def fill(self, color: str) -> None:
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.clear()
+
+    def rect(self, color: str, rect: pygame.Rect, width: int = 0) -> None:
+        self.renderer.draw_color = pygame.Color(color)
+        rect = pygame.Rect(rect)
+        if width <= 0 or 2 * width >= min(rect.width, rect.height):
+            self.renderer.fill_rect(rect)
+            return
+
+        self.renderer.fill_rect((rect.x, rect.y, rect.width, width))
+        self.renderer.fill_rect((rect.x, rect.bottom - width, rect.width, width))
+        self.renderer.fill_rect((rect.x, rect.y + width, width, rect.height - 2 * width))
+        self.renderer.fill_rect((rect.right - width, rect.y + width, width, rect.height - 2 * width))
+
+    def present(self) -> None:
+        self.renderer.present()
+
+def open_renderer(caption: str) -> Renderer_Canvas:
+    """Abre la ventana con un Renderer de SDL2, acelerado si es posible y si no por software.
+    Lanza ImportError o RuntimeError, la base de pygame.error y del error de pygame._sdl2, si no es posible."""
+
+    from pygame._sdl2 import video
+    window = video.Window(caption, (params.SCREEN_WIDTH, params.SCREEN_HEIGHT))
+    try:
+        renderer = video.Renderer(window, accelerated=1)
+    except RuntimeError:
+        try:
+            renderer = video.Renderer(window, accelerated=0)
+        except RuntimeError:
+            window.destroy()
+            raise
+
+    return Renderer_Canvas(renderer)
+
+def open_window(caption: str, backend: str = None) -> Canvas:
+    """Inicializa sólo los módulos de Pygame que se usan, abre la ventana y la muestra en blanco de inmediato.
+    caption: Título de la ventana.
+    backend: 'renderer' o 'software'. Por defecto, params.RENDER_BACKEND.
+    Si el Renderer de SDL2 no está disponible se usa la superficie de pygame.display."""
+
+    pygame.display.init()
+    pygame.font.init()
+
+    canvas = None
+    if (backend or params.RENDER_BACKEND) == 'renderer':
+        try:
+            canvas = open_renderer(caption)
+        except (ImportError, RuntimeError):
+            canvas = None
+
+    if canvas is None:
+        screen = pygame.display.set_mode((params.SCREEN_WIDTH, params.SCREEN_HEIGHT))
+        pygame.display.set_caption(caption)
+        canvas = Software_Canvas(screen)
+
+    canvas.fill('White')
+    canvas.present()
+    return canvas
 
 class Button:
     """Representa un botón que puede ser oprimido y ejecutar una acción."""
@@ -22,10 +224,7 @@ class Button:
         self.rect = pygame.Rect(x, y, width, height)
         self.outline = outline
         self.tag = tag
-        self.font = pygame.font.SysFont(
-            font_name if font_name else 'Arial',
-            font_size if font_size else 10
-        )
+        self.font = get_font(font_name, font_size)
         self.action = action
 
         self.active = True
@@ -66,9 +265,9 @@ class Button:
         else:
             self.pressed = False
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def draw(self, canvas: Canvas) -> None:
         """Dibuja el botón correspondientemente.
-        surface: Superficie sobre la cual dibjar el botón."""
+        canvas: Lienzo sobre el cual dibjar el botón."""
 
         if not self.active:
             outline_color = self.outline_color_inactive
@@ -83,11 +282,11 @@ class Button:
             box_color = self.box_color_hover if self.hover else self.box_color_idle
             font_color = self.font_color_hover if self.hover else self.font_color_idle
 
-        tag_surface = self.font.render(self.tag, True, font_color)
+        tag_surface = render_text(self.font, self.tag, font_color)
 
-        pygame.draw.rect(surface, box_color, self.rect)
-        pygame.draw.rect(surface, outline_color, self.rect, self.outline)
-        surface.blit(
+        canvas.rect(box_color, self.rect)
+        canvas.rect(outline_color, self.rect, self.outline)
+        canvas.blit(
             tag_surface,
             (
                 self.rect.centerx - tag_surface.get_width()/2,
@@ -110,10 +309,7 @@ class Textbox:
 
         self.rect = pygame.Rect(x, y, width, height)
         self.outline = outline
-        self.font = pygame.font.SysFont(
-            font_name if font_name else 'Arial',
-            font_size if font_size else 10
-        )
+        self.font = get_font(font_name, font_size)
 
         self.text = ''
         self.active = False
@@ -156,9 +352,9 @@ class Textbox:
 
         return self.text
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def draw(self, canvas: Canvas) -> None:
         """Dibuja la caja de texto correspondientemente.
-        surface: Superficie sobre la cual dibujar la caja de texto."""
+        canvas: Lienzo sobre el cual dibujar la caja de texto."""
 
         if not self.active:
             outline_color = self.outline_color_inactive
@@ -169,11 +365,11 @@ class Textbox:
             box_color = self.box_color_active
             font_color = self.font_color_active
 
-        text_surface = self.font.render(self.text + ('_' if self.active else ''), True, font_color)
+        text_surface = render_text(self.font, self.text + ('_' if self.active else ''), font_color)
 
-        pygame.draw.rect(surface, box_color, self.rect)
-        pygame.draw.rect(surface, outline_color, self.rect, self.outline)
-        surface.blit(
+        canvas.rect(box_color, self.rect)
+        canvas.rect(outline_color, self.rect, self.outline)
+        canvas.blit(
             text_surface,
             (
                 self.rect.x + self.padding,
@@ -190,7 +386,7 @@ class Textbox:
 class Table:
     """Clase contenedora que imprime DataFrames en Pygame."""
 
-    def __init__(self, df: pandas.DataFrame, x: int, y: int, cell_widht: int, cell_height: int, rows: int, cols: int, outline: int, font_name: str = None, font_size: int = None):
+    def __init__(self, df: 'pandas.DataFrame', x: int, y: int, cell_widht: int, cell_height: int, rows: int, cols: int, outline: int, font_name: str = None, font_size: int = None, index: logic.Table_Index = None, max_rows: int = None):
         """Construye la tabla con las propiedades indicadas.
         df: El data frame contenido a mostrar.
         x: Posición en x de la esquina superior izquierda de la tabla.
@@ -201,16 +397,24 @@ class Table:
         cols: Número de columnas.
         outline: Grosor de línea.
         font_name: Nombre de una fuente en el sistema para el texto de la tabla.
-        font_size: Tamaño de la fuente para el texto de la tabla."""
+        font_size: Tamaño de la fuente para el texto de la tabla.
+        index: Índices de las filas de df. Si se indica, la tabla se puede ordenar y filtrar con click.
+        max_rows: Número máximo de filas a mostrar cuando hay índices."""
 
         self.df = df
+        self.index = index
+        self.max_rows = max_rows
+        # Columna por la cual ordenar, si es de mayor a menor y estado a mostrar. None para no ordenar o filtrar.
+        self.sort_column: str = None
+        self.descending = False
+        self.state_filter: str = None
         self.pos = pygame.math.Vector2(x, y)
         self.default_cell_width = cell_widht
         self.default_cell_height = cell_height
         self.col_widths = {}
         self.row_heights = {}
         self.outline = outline
-        self.font = pygame.font.SysFont(font_name if font_name else 'Arial', font_size if font_size else 10)
+        self.font = get_font(font_name, font_size)
 
     def set_width(self, width: int, col: int) -> None:
         """Modifica el ancho de una columna.
@@ -226,9 +430,54 @@ class Table:
 
         self.row_heights[row] = height
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def click(self, pos: tuple[int, int], button: int) -> None:
+        """Ordena o filtra la tabla si se hizo click en el encabezado.
+        Con el botón izquierdo ordena por la columna: de menor a mayor, de mayor a menor y sin ordenar.
+        Con el derecho sobre la columna de estado cambia el estado a mostrar.
+        pos: Posición del click.
+        button: Botón del ratón."""
+
+        if self.index is None:
+            return
+
+        step = self.default_cell_width - self.outline
+        col_index = int((pos[0] - self.pos[0]) // step)
+        if    not 0 <= col_index < len(self.index.columns)\
+           or not self.pos[1] <= pos[1] < self.pos[1] + self.default_cell_height:
+            return
+
+        column = self.index.columns[col_index]
+        if button == pygame.BUTTON_LEFT:
+            if self.sort_column != column:
+                self.sort_column = column
+                self.descending = False
+            elif not self.descending:
+                self.descending = True
+            else:
+                self.sort_column = None
+
+        elif button == pygame.BUTTON_RIGHT and col_index == self.index.state_position:
+            states = [None] + sorted(state for state, count in self.index.counts.items() if count and state is not None)
+            position = states.index(self.state_filter) if self.state_filter in states else 0
+            self.state_filter = states[(position + 1) % len(states)]
+
+    def header(self, column: str) -> str:
+        """Devuelve el texto del encabezado de la columna con su orden y filtro."""
+
+        if self.index is None:
+            return str(column)
+
+        text = str(column)
+        if column == self.index.columns[self.index.state_position] and self.state_filter is not None:
+            text = f'{self.state_filter} ({self.index.count(self.state_filter)})'
+        if column == self.sort_column:
+            text += ' v' if self.descending else ' ^'
+
+        return text
+
+    def draw(self, canvas: Canvas) -> None:
         """Dibuja la tabla correspondientemente.
-        surface: Superficie sobre la que se debe dibujar la tabla."""
+        canvas: Lienzo sobre el que se debe dibujar la tabla."""
 
         y_pos = self.pos[1]
         x_pos = self.pos[0]
@@ -239,9 +488,9 @@ class Table:
 
             rect = pygame.Rect(x_pos, y_pos, col_width, row_height)
             x_pos += rect.width - self.outline
-            pygame.draw.rect(surface, 'Black', rect, self.outline)
-            text_surface = self.font.render(str(column), True, 'Black')
-            surface.blit(
+            canvas.rect('Black', rect, self.outline)
+            text_surface = render_text(self.font, self.header(column), 'Black')
+            canvas.blit(
                 text_surface,
                 (
                     rect.centerx - text_surface.get_width() / 2,
@@ -251,7 +500,13 @@ class Table:
 
         y_pos += row_height - self.outline
 
-        for row_index, (_, row) in enumerate(self.df.iterrows()):
+        # Con índices sólo se leen las filas visibles, ya ordenadas y filtradas.
+        if self.index is not None:
+            rows = self.index.top(self.max_rows or len(self.index), self.sort_column, self.descending, self.state_filter)
+        else:
+            rows = (row for _, row in self.df.iterrows())
+
+        for row_index, row in enumerate(rows):
             x_pos = self.pos[0]
             try:
                 row_height = self.row_heights[row_index]
@@ -266,10 +521,10 @@ class Table:
 
                 rect = pygame.Rect(x_pos, y_pos, col_width, row_height)
                 x_pos += rect.width - self.outline
-                pygame.draw.rect(surface, 'Black', rect, self.outline)
-                text_surface = self.font.render(str(value), True, 'Black')
+                canvas.rect('Black', rect, self.outline)
                 if value is not None:
-                    surface.blit(
+                    text_surface = render_text(self.font, str(value), 'Black')
+                    canvas.blit(
                         text_surface,
                         (
                             rect.centerx - text_surface.get_width() / 2,
@@ -293,14 +548,14 @@ class Tag:
 
         self.pos = pygame.math.Vector2(x, y)
         self.tag = tag
-        self.font = pygame.font.SysFont(font_name if font_name else 'Arial', font_size if font_size else 10)
+        self.font = get_font(font_name, font_size)
         self.font_color = font_color
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def draw(self, canvas: Canvas) -> None:
         """Dibuja la etiqueta correspondientemente.
-        surface: Superficie sobre la que se imprimirá la etiqueta."""
+        canvas: Lienzo sobre el que se imprimirá la etiqueta."""
 
-        surface.blit(self.font.render(self.tag, True, self.font_color), self.pos)
+        canvas.blit(render_text(self.font, self.tag, self.font_color), self.pos)
 
 class Grant:
     """Clase para la impresión de un diagrama de Grant."""
@@ -315,7 +570,7 @@ class Grant:
         font_size: Tamaño de la fuente para usar en el diagrama."""
 
         self.rect = pygame.Rect(x, y, width, height)
-        self.font = pygame.font.SysFont(font_name if font_name else 'Arial', font_size if font_size else 10)
+        self.font = get_font(font_name, font_size)
         self.tags: list[str] = []
         self.tags_rects: list[pygame.Rect] = []
         self.tags_surface = pygame.Surface((0,0))
@@ -378,42 +633,84 @@ class Grant:
         index = self.tags.index(tag)
         self.tags_active[index] = False
 
-    def add_line(self, current_tag: str = None, blocked_tag: str = None) -> None:
+        if self.tags_active.count(False) > params.HISTORY_INACTIVE_LANES:
+            self.compact()
+
+    def compact(self) -> None:
+        """Elimina las etiquetas inactivas más antiguas y sus líneas para que el diagrama no crezca sin límite.
+        Conserva las últimas params.HISTORY_INACTIVE_LANES etiquetas inactivas."""
+
+        inactive = [i for i, active in enumerate(self.tags_active) if not active]
+        dropped = set(inactive[:len(inactive) - params.HISTORY_INACTIVE_LANES])
+        kept = [i for i in range(len(self.tags)) if i not in dropped]
+
+        # Volver a acomodar las etiquetas conservadas una debajo de otra.
+        tags_rects = []
+        height = 0
+        width = 0
+        for i in kept:
+            tag_rect = self.tags_rects[i].copy()
+            tag_rect.top = height + self.padding
+            tags_rects.append(tag_rect)
+            height = tag_rect.bottom
+            width = max(width, tag_rect.right + self.padding)
+
+        tags_surface = pygame.Surface((width, height))
+        tags_surface.fill('White')
+        lines_surface = pygame.Surface((self.lines_surface.get_width(), height))
+        lines_surface.fill('White')
+        for i, tag_rect in zip(kept, tags_rects):
+            old_rect = self.tags_rects[i]
+            tags_surface.blit(self.tags_surface, tag_rect, old_rect)
+            lines_surface.blit(
+                self.lines_surface,
+                (0, tag_rect.top),
+                pygame.Rect(0, old_rect.top, self.lines_surface.get_width(), old_rect.height)
+            )
+
+        self.tags = [self.tags[i] for i in kept]
+        self.tags_active = [self.tags_active[i] for i in kept]
+        self.tags_rects = tags_rects
+        self.tags_surface = tags_surface
+        self.lines_surface = lines_surface
+
+    def add_line(self, current_tag: str = None, blocked_tags=()) -> None:
         """Añade una nueva sección al diagrama con línea gruesa para la etiqueta indicada.
-        tag: Etiqueta a la cual dar línea gruesa."""
+        current_tag: Etiqueta a la cual dar línea gruesa.
+        blocked_tags: Conjunto de etiquetas de clientes bloqueados, cuyas líneas se pintan de rojo.
+                      Sólo se pintan las que tienen carril, así que al bloquear se debe agregar su etiqueta."""
 
         if current_tag is not None:
             current_index = self.tags.index(current_tag)
         else:
             current_index = -1
 
-        if blocked_tag is not None:
-            blocked_index = self.tags.index(blocked_tag)
-        else:
-            blocked_index = -1
+        # Sólo se conservan las últimas params.HISTORY_TICKS columnas; las anteriores se recorren fuera.
+        width = min(self.lines_surface.get_width() + params.GRANT_TIME_WIDTH, params.HISTORY_TICKS * params.GRANT_TIME_WIDTH)
+        new_x = width - params.GRANT_TIME_WIDTH
 
         lines_surface = pygame.Surface(
             (
-                self.lines_surface.get_width() + params.GRANT_TIME_WIDTH,
+                width,
                 self.lines_surface.get_height()
             )
         )
         lines_surface.fill('White')
-        lines_surface.blit(self.lines_surface, (0, 0))
+        lines_surface.blit(self.lines_surface, (new_x - self.lines_surface.get_width(), 0))
 
         number_text_surface = self.font.render(str(self.current_time), True, 'Black')
         number_text_surface = pygame.transform.scale_by(number_text_surface, 2/3)
         numbers_surface = pygame.Surface(
             (
-                self.numbers_surface.get_width() + params.GRANT_TIME_WIDTH,
+                width,
                 max(self.numbers_surface.get_height(), number_text_surface.get_height())
             )
         )
         numbers_surface.fill('White')
-        numbers_surface.blit(self.numbers_surface, (0, 0))
+        numbers_surface.blit(self.numbers_surface, (new_x - self.numbers_surface.get_width(), 0))
         numbers_surface.blit(number_text_surface,
             (
-                self.numbers_surface.get_width(),
+                new_x,
                 numbers_surface.get_height() / 2 - number_text_surface.get_height() / 2
             )
         )
@@ -425,7 +722,7 @@ class Grant:
                 continue
 
             line_rect = pygame.Rect(
-                self.lines_surface.get_width(),
+                new_x,
                 tag_rect.top,
                 params.GRANT_TIME_WIDTH,
                 tag_rect.height
@@ -436,7 +733,7 @@ class Grant:
                     tag_rect.height / (1 if i == current_index else 5)
                 )
             )
-            line_surface.fill('Red' if i in (current_index, blocked_index) else 'Black')
+            line_surface.fill('Red' if i == current_index or self.tags[i] in blocked_tags else 'Black')
 
             lines_surface.blit(
                 line_surface,
@@ -448,35 +745,150 @@ class Grant:
 
         self.lines_surface = lines_surface
 
-    def draw(self, surface: pygame.Surface) -> None:
-        """Dibuja el diagrama correspondientemente.
-        surface: Superificie en la cual dibujar el diagrama."""
+    def draw(self, canvas: Canvas) -> None:
+        """Dibuja el diagrama correspondientemente. Sus superficies sólo cambian al agregar líneas o etiquetas,
+        así que el lienzo las guarda en ranuras y no las vuelve a convertir o subir en cada cuadro.
+        canvas: Lienzo en el cual dibujar el diagrama."""
 
-        surface.blit(self.numbers_surface, (self.rect.x + self.tags_surface.get_width() + self.padding, self.rect.y),
+        canvas.blit(self.numbers_surface, (self.rect.x + self.tags_surface.get_width() + self.padding, self.rect.y),
             (
                 max(0, self.numbers_surface.get_width() - self.rect.width + self.tags_surface.get_width() + self.padding),
                 0,
                 min(self.numbers_surface.get_width(), self.rect.width - self.tags_surface.get_width() - self.padding),
                 self.numbers_surface.get_height()
-            )
+            ),
+            (self, 'numbers')
         )
 
-        surface.blit(self.tags_surface, (self.rect.x + self.padding, self.rect.y + self.numbers_surface.get_height()),
+        canvas.blit(self.tags_surface, (self.rect.x + self.padding, self.rect.y + self.numbers_surface.get_height()),
             pygame.Rect(
                 max(0, self.tags_surface.get_width() - self.rect.width + self.padding),
                 max(0, self.tags_surface.get_height() - self.rect.height + self.numbers_surface.get_height()),
                 min(self.tags_surface.get_width(), self.rect.width - self.padding),
                 min(self.tags_surface.get_height(), self.rect.height - self.numbers_surface.get_height())
-            )
+            ),
+            (self, 'tags')
         )
 
-        surface.blit(self.lines_surface, (self.rect.x + self.tags_surface.get_width() + self.padding, self.rect.y + self.numbers_surface.get_height()),
+        canvas.blit(self.lines_surface, (self.rect.x + self.tags_surface.get_width() + self.padding, self.rect.y + self.numbers_surface.get_height()),
             pygame.Rect(
                 max(0, self.lines_surface.get_width() - self.rect.width + self.tags_surface.get_width() + self.padding),
                 max(0, self.lines_surface.get_height() - self.rect.height + self.numbers_surface.get_height()),
                 min(self.lines_surface.get_width(), self.rect.width - self.tags_surface.get_width() - self.padding),
                 min(self.lines_surface.get_height(), self.rect.height - self.numbers_surface.get_height())
-            )
+            ),
+            (self, 'lines')
         )
 
-        pygame.draw.rect(surface, 'Black', self.rect, 2)
+        canvas.rect('Black', self.rect, 2)
+
+class Profile_Overlay:
+    """Clase que imprime el desglose del tiempo del último cuadro según un perfilador."""
+
+    def __init__(self, x: int, y: int, profiler: instrument.Profiler, font_name: str, font_size: int) -> None:
+        """Construye el desglose con la información correspondiente.
+        x: Posición en x de la esquina superior izquierda del desglose.
+        y: Posición en y de la esquina superior izquierda del desglose.
+        profiler: Perfilador del cual obtener los tiempos.
+        font_name: Nombre de una fuente en el sistema para escribir el desglose.
+        font_size: Tamaño de la fuente para escribir el desglose."""
+
+        self.pos = pygame.math.Vector2(x, y)
+        self.profiler = profiler
+        self.font = get_font(font_name, font_size)
+
+    def draw(self, canvas: Canvas) -> None:
+        """Dibuja el desglose correspondientemente.
+        canvas: Lienzo sobre el que se imprimirá el desglose."""
+
+        lines = [f'Cuadro: {self.profiler.last_frame_time * 1000:.2f} ms']
+        for name, seconds in sorted(self.profiler.last_frame.items(), key=lambda item: -item[1]):
+            lines.append(f'{name}: {seconds * 1000:.2f} ms')
+        for name, value in self.profiler.counters.items():
+            lines.append(f'{name}: {value}')
+
+        y_pos = self.pos[1]
+        for line in lines:
+            text_surface = render_text(self.font, line, 'Blue')
+            canvas.blit(text_surface, (self.pos[0], y_pos))
+            y_pos += text_surface.get_height()
+
+class Series_Chart:
+    """Gráfica de métricas por tick de un stats.Tick_Series, una al lado de otra, con su valor actual y máximo.
+    Cada curva se reduce a params.CHART_POINTS puntos, así que dibujarla cuesta lo mismo con cien ticks que con
+    un millón, y la imagen sólo se vuelve a dibujar cuando se registra un tick nuevo."""
+
+    def __init__(self, x: int, y: int, width: int, height: int, series: stats.Tick_Series, panels: list[tuple], font_name: str, font_size: int) -> None:
+        """Construye la gráfica con la información indicada.
+        x: Posición en x de la esquina superior izquierda de la gráfica.
+        y: Posición en y de la esquina superior izquierda de la gráfica.
+        width: Ancho de la gráfica.
+        height: Alto de la gráfica.
+        series: Serie con las métricas a mostrar.
+        panels: Por cada métrica, una tupla (nombre en la serie, título, formato del valor, máximo fijo o None para el de la curva).
+        font_name: Nombre de una fuente en el sistema para los títulos.
+        font_size: Tamaño de la fuente para los títulos."""
+
+        self.rect = pygame.Rect(x, y, width, height)
+        self.series = series
+        self.panels = panels
+        self.font = get_font(font_name, font_size)
+        self.surface: pygame.Surface = None
+        # Número de ticks de la serie cuando se dibujó la imagen.
+        self.drawn_count = None
+
+        self.padding = params.GRANT_PADDING
+
+    def redraw(self) -> None:
+        """Vuelve a dibujar la imagen de la gráfica con los datos actuales de la serie."""
+
+        surface = pygame.Surface(self.rect.size)
+        surface.fill('White')
+        panel_width = self.rect.width // len(self.panels)
+
+        for i, (name, title, value_format, top) in enumerate(self.panels):
+            panel = pygame.Rect(i * panel_width, 0, panel_width, self.rect.height)
+            points = self.series.points(name, params.CHART_POINTS)
+            current = self.series.last[self.series.names.index(name)]
+            peak = max((value for _, value in points), default=0)
+            if top is None:
+                top = peak
+
+            tag_surface = render_text(
+                self.font,
+                f'{title}: {"-" if current is None else value_format.format(current)} · máx {value_format.format(peak)}',
+                'Black'
+            )
+            surface.blit(tag_surface, (panel.x + self.padding, self.padding))
+
+            plot = pygame.Rect(
+                panel.x + self.padding,
+                tag_surface.get_height() + 2 * self.padding,
+                panel.width - 2 * self.padding,
+                panel.height - tag_surface.get_height() - 3 * self.padding
+            )
+            pygame.draw.rect(surface, 'Grey', plot, 1)
+
+            if len(points) >= 2:
+                first, last = points[0][0], points[-1][0]
+                lines = [
+                    (
+                        plot.x + (x - first) * (plot.width - 1) / max(1, last - first),
+                        plot.bottom - 1 - min(value, top) * (plot.height - 1) / (top or 1)
+                    )
+                    for x, value in points
+                ]
+                pygame.draw.lines(surface, 'Blue', False, lines)
+
+        self.surface = surface
+        self.drawn_count = self.series.count
+
+    def draw(self, canvas: Canvas) -> None:
+        """Dibuja la gráfica correspondientemente.
+        canvas: Lienzo en el cual dibujar la gráfica."""
+
+        if self.drawn_count != self.series.count:
+            self.redraw()
+
+        canvas.blit(self.surface, self.rect.topleft, None, (self, 'chart'))
+        canvas.rect('Black', self.rect, 2)